@@ -0,0 +1,281 @@
+# ahester57
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from binary_knapsack import bitpacking
+from binary_knapsack.crossover_method.majority_voting import MajorityVoting
+from binary_knapsack.crossover_method.p_uniform import PUniform
+from binary_knapsack.crossover_method.single_point import SinglePoint
+from binary_knapsack.ga import GA
+from binary_knapsack.mutation_method.bitwise import BitwiseMutation
+from binary_knapsack.mutation_method.sparse import SparseBitwiseMutation
+from binary_knapsack.penalty_method.absolute import AbsolutePenalty
+from binary_knapsack.penalty_method.dynamic import DynamicPenalty
+from binary_knapsack.penalty_method.logarithmic import LogarithmicPenalty
+from binary_knapsack.population_matrix import PopulationMatrix
+from binary_knapsack.selection_mechanism.proportional import Proportional, StochasticUniversal
+from binary_knapsack.selection_mechanism.ranking import LinearRanking
+from binary_knapsack.selection_mechanism.tournament import DeterministicTournament, StochasticTournament
+from binary_knapsack.selection_mechanism.truncation import Truncation
+from binary_knapsack.test_problem.knapsack import BinaryKnapsack
+from binary_knapsack.test_problem.solver import solve
+
+
+POP_SIZES = (30, 1000, 100000)
+DIMS = (20, 256)
+CROSSOVER_METHODS = (SinglePoint, PUniform, MajorityVoting)
+SELECTION_MECHANISMS = (Proportional, StochasticUniversal, LinearRanking, DeterministicTournament, StochasticTournament, Truncation)
+PENALTY_METHODS = (AbsolutePenalty, LogarithmicPenalty, DynamicPenalty)
+MUTATION_METHODS = (BitwiseMutation, SparseBitwiseMutation)
+
+# Generations per GA.simulate benchmark.
+SIMULATE_T_MAX = 5
+# The object path holds one Chromosome per individual; larger populations only run as matrices.
+OBJECT_PATH_MAX_POP = 10000
+
+
+def _defaults(Method) -> dict:
+    """The default value of each of a method's parameters, as the menu would offer them."""
+    return {k: v[1] for k, v in Method.parameters().items()}
+
+
+def _problem(dims:int) -> BinaryKnapsack:
+    """A knapsack with room for roughly a third of the items, so penalties see both feasible and infeasible solutions."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return BinaryKnapsack(dims=dims, capacity=2.0 * dims)
+
+
+def _measure(run, setup, repeat:int) -> tuple[float, int, object]:
+    """Time a benchmark, then measure its peak memory in one extra, traced call.
+
+    Args:
+        run (callable): The code under test. Receives the result of setup.
+        setup (callable): Prepares fresh inputs for one call. Not timed.
+        repeat (int): The number of timed calls.
+
+    Returns:
+        tuple[float, int, object]: (the fastest wall-time in seconds, peak bytes allocated during a call, what the last timed call returned)
+    """
+    best = np.inf
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        output = run(args)
+        best = min(best, time.perf_counter() - start)
+    args = setup()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        run(args)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return best, peak, output
+
+
+def _cases(pop_size:int, dims:int, problem:BinaryKnapsack, random:np.random.Generator):
+    """Generate the benchmarks of one grid point.
+
+    Yields:
+        tuple: (benchmark, name, run, setup, work) where work is the number of individuals processed per call.
+    """
+    solns = random.integers(0, 2, size=(pop_size, dims), dtype=np.uint8)
+    fitness = random.uniform(1, 10, size=pop_size)
+    costs = random.uniform(0, 2 * problem.capacity, size=pop_size)
+
+    yield ('evaluate', 'try_with_bitstring',
+        lambda s: [problem.try_with_bitstring(soln) for soln in s], lambda: solns, pop_size)
+    yield ('evaluate', 'try_with_bitstrings',
+        problem.try_with_bitstrings, lambda: solns, pop_size)
+    packed = bitpacking.pack(solns)
+    yield ('evaluate', 'try_with_packed_bitstrings',
+        problem.try_with_packed_bitstrings, lambda: packed, pop_size)
+
+    for Method in CROSSOVER_METHODS:
+        instance = Method(random, **_defaults(Method))
+        yield ('crossover', Method.__name__,
+            lambda s, instance=instance: instance.crossover_matrix(s, fitness), lambda: solns, pop_size)
+
+    for Mechanism in SELECTION_MECHANISMS:
+        yield ('selection', Mechanism.__name__,
+            lambda f, Mechanism=Mechanism: Mechanism(random, f, None, True, **_defaults(Mechanism)).next_population(),
+            lambda: fitness, pop_size)
+
+    for Method in PENALTY_METHODS:
+        instance = Method(problem.constraints, **_defaults(Method))
+        yield ('penalty', Method.__name__,
+            lambda fc, instance=instance: instance.penalize_arrays(*fc, t=1), lambda: (fitness.copy(), costs), pop_size)
+
+    for Method in MUTATION_METHODS:
+        instance = Method(random, 0.05, **_defaults(Method))
+        yield ('mutation', Method.__name__,
+            instance.mutate_matrix, lambda: PopulationMatrix(solns.copy()), pop_size)
+
+    modes = {'matrix': {'use_matrix': True}, 'packed': {'packed': True}}
+    if pop_size <= OBJECT_PATH_MAX_POP:
+        modes = {'object': {}, **modes}
+    for mode, kwargs in modes.items():
+        def setup(kwargs=kwargs) -> GA:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return GA(
+                    pop_size=pop_size,
+                    t_max=SIMULATE_T_MAX,
+                    rand_seed=1,
+                    problem_instance=problem,
+                    Penalty_Method=LogarithmicPenalty,
+                    penalty_parameters=_defaults(LogarithmicPenalty),
+                    **kwargs
+                )
+        def simulate(ga:GA) -> np.float64:
+            with contextlib.redirect_stdout(io.StringIO()):
+                asyncio.run(ga.simulate())
+            # a penalized, infeasible best-of-run has no optimality gap
+            return ga.best_of_run_record.fitness_score if ga.best_of_run_is_feasible else None
+        yield ('simulate', mode, simulate, setup, pop_size * (SIMULATE_T_MAX + 1))
+
+
+def run_benchmarks(
+    pop_sizes:tuple[int]=POP_SIZES,
+    dims:tuple[int]=DIMS,
+    repeat:int=3,
+    only:tuple[str]=None,
+    seed:int=1
+) -> dict:
+    """Time every benchmark over the grid of population sizes and dimensions.
+
+    Args:
+        pop_sizes (tuple of int, optional): The population sizes. Each must be even. Default POP_SIZES.
+        dims (tuple of int, optional): The number of items. Default DIMS.
+        repeat (int, optional): Timed calls per benchmark. The fastest is kept. Default 3.
+        only (tuple of str, optional): Run only these benchmarks, e.g., ('crossover', 'selection'). Default all.
+        seed (int, optional): Seed for the random inputs. Default 1.
+
+    Returns:
+        dict: {'meta': {...}, 'results': [{benchmark, name, pop_size, dims, seconds, throughput, peak_bytes}, ...]}
+            Simulate results add the optimality_gap of the best-of-run.
+    """
+    assert repeat > 0
+    assert all(pop_size > 0 and pop_size % 2 == 0 for pop_size in pop_sizes)
+    results = []
+    for n in dims:
+        problem = _problem(n)
+        for pop_size in pop_sizes:
+            random = np.random.default_rng(seed)
+            for benchmark, name, run, setup, work in _cases(pop_size, n, problem, random):
+                if only and benchmark not in only:
+                    continue
+                seconds, peak_bytes, output = _measure(run, setup, repeat)
+                results.append({
+                    'benchmark': benchmark,
+                    'name': name,
+                    'pop_size': pop_size,
+                    'dims': n,
+                    'seconds': seconds,
+                    'throughput': work / seconds,
+                    'peak_bytes': peak_bytes
+                })
+                if benchmark == 'simulate':
+                    # the best-of-run's relative distance from the optimum; solved once per dims
+                    results[-1]['optimality_gap'] = None if output is None else solve(problem).gap(output)
+                print(f'{benchmark:<10} {name:<28} pop_size={pop_size:<7} dims={n:<5} '
+                    f'{work / seconds:>14.1f}/s {peak_bytes:>12} B', file=sys.stderr)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'repeat': repeat,
+            'seed': seed
+        },
+        'results': results
+    }
+
+
+def compare(baseline:dict, candidate:dict, threshold:float=0.1) -> tuple[str, int]:
+    """Compare two benchmark results, case by case.
+
+    A case regresses when its throughput drops, or its peak memory grows, by more than threshold.
+
+    Args:
+        baseline (dict): The earlier results of run_benchmarks.
+        candidate (dict): The later results of run_benchmarks.
+        threshold (float, optional): The tolerated relative change. Default 0.1.
+
+    Returns:
+        tuple[str, int]: (A table of relative changes, The number of regressions)
+    """
+    def key(r): return (r['benchmark'], r['name'], r['pop_size'], r['dims'])
+    before = {key(r): r for r in baseline['results']}
+    lines = [f'{"Benchmark":<10} {"Name":<28} {"Pop":>7} {"Dims":>5} {"Throughput":>11} {"Peak":>9}']
+    regressions = 0
+    for r in candidate['results']:
+        old = before.get(key(r))
+        if old is None:
+            continue
+        speed = r['throughput'] / old['throughput'] - 1
+        memory = r['peak_bytes'] / old['peak_bytes'] - 1 if old['peak_bytes'] > 0 else 0.0
+        regressed = speed < -threshold or memory > threshold
+        regressions += regressed
+        lines.append(f'{r["benchmark"]:<10} {r["name"]:<28} {r["pop_size"]:>7} {r["dims"]:>5} '
+            f'{speed:>+11.1%} {memory:>+9.1%}' + ('  REGRESSION' if regressed else ''))
+    return '\n'.join(lines), regressions
+
+
+def main(argv:list[str]=None) -> int:
+    """Run the benchmarks, or compare two result files.
+
+    Args:
+        argv (list of str, optional): The command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit status. 1 if comparing found a regression.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m binary_knapsack.bench',
+        description='Benchmark the GA hot paths over a grid of population sizes and dimensions.'
+    )
+    parser.add_argument('--pop-sizes', type=int, nargs='+', default=POP_SIZES)
+    parser.add_argument('--dims', type=int, nargs='+', default=DIMS)
+    parser.add_argument('--repeat', type=int, default=3, help='timed calls per benchmark; the fastest is kept')
+    parser.add_argument('--only', nargs='+', choices=('evaluate', 'crossover', 'selection', 'penalty', 'mutation', 'simulate'))
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('-o', '--output', help='write the JSON results here instead of stdout')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CANDIDATE'),
+        help='compare two result files instead of running; exits 1 on regression')
+    parser.add_argument('--threshold', type=float, default=0.1, help='tolerated relative change when comparing')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            candidate = json.load(f)
+        table, regressions = compare(baseline, candidate, args.threshold)
+        print(table)
+        print(f'{regressions} regression(s) beyond {args.threshold:.0%}')
+        return 1 if regressions > 0 else 0
+
+    results = run_benchmarks(tuple(args.pop_sizes), tuple(args.dims), args.repeat, args.only, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
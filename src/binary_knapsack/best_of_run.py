@@ -0,0 +1,69 @@
+# ahester57
+
+import numpy as np
+
+from typing import NamedTuple
+
+from binary_knapsack.chromosome import Chromosome
+
+
+class BestOfRun(NamedTuple):
+    """A lightweight snapshot of the best individual found so far.
+
+    Attributes:
+        bitstring (bytes): The packed bitstring, most significant bit first. See np.packbits.
+        num_items (int): The number of items to choose from.
+        fitness_score (np.float64): The fitness score.
+        fitness_cost (np.float64): The fitness cost.
+        generation (int): The generation the individual was found.
+    """
+    bitstring: bytes
+    num_items: int
+    fitness_score: np.float64
+    fitness_cost: np.float64
+    generation: int
+
+    @classmethod
+    def from_bitstring(cls,
+        bitstring:np.ndarray[np.uint8],
+        fitness_score:np.float64,
+        fitness_cost:np.float64,
+        generation:int
+    ) -> 'BestOfRun':
+        """Snapshot an individual from its unpacked bitstring.
+
+        Args:
+            bitstring (np.ndarray of uint8): The bitstring representation of the alleles.
+            fitness_score (np.float64): The fitness score.
+            fitness_cost (np.float64): The fitness cost.
+            generation (int): The current generation.
+
+        Returns:
+            BestOfRun: The snapshot.
+        """
+        return cls(np.packbits(bitstring).tobytes(), len(bitstring), fitness_score, fitness_cost, int(generation))
+
+    def chromosome(self) -> Chromosome:
+        """Create a Chromosome object from this snapshot.
+
+        Returns:
+            Chromosome: A copy of the individual.
+        """
+        c = Chromosome(None, self.num_items)
+        c.bitstring = np.unpackbits(np.frombuffer(self.bitstring, dtype=np.uint8), count=self.num_items)
+        c.fitness_score = self.fitness_score
+        c.fitness_cost = self.fitness_cost
+        return c
+
+
+class TargetHit(NamedTuple):
+    """When a run's best-of-run first reached its target fitness.
+
+    Attributes:
+        generation (int): The generation the target was reached.
+        evaluations (int): The number of individuals evaluated by then.
+        seconds (float): The wall-time since the run started simulating, in this process.
+    """
+    generation: int
+    evaluations: int
+    seconds: float
@@ -0,0 +1,83 @@
+# ahester57
+
+import numpy as np
+
+
+WORD_BYTES = 8
+
+
+def packed_width(num_items:int) -> int:
+    """The number of bytes in one packed bitstring, padded to whole uint64 words.
+
+    Args:
+        num_items (int): The number of items to choose from.
+
+    Returns:
+        int: Bytes per packed row.
+    """
+    return WORD_BYTES * -(-int(num_items) // (8 * WORD_BYTES))
+
+
+def pack(bitstrings:np.ndarray[np.uint8]) -> np.ndarray[np.uint8]:
+    """Pack a (pop_size x dims) matrix of alleles into a (pop_size x packed_width) matrix of bytes.
+
+    Alleles are packed most significant bit first, i.e., item i lives in bit 7 - i % 8 of byte i // 8.
+    The padding bits past the last item are always zero.
+
+    Args:
+        bitstrings (np.ndarray of uint8 or bool): The alleles, one per byte.
+
+    Returns:
+        np.ndarray of uint8: The packed rows.
+    """
+    assert bitstrings.ndim == 2
+    packed = np.packbits(bitstrings, axis=1)
+    width = packed_width(bitstrings.shape[1])
+    if packed.shape[1] == width:
+        return packed
+    return np.pad(packed, ((0, 0), (0, width - packed.shape[1])))
+
+
+def unpack(packed:np.ndarray[np.uint8], num_items:int) -> np.ndarray[np.uint8]:
+    """Unpack a matrix of packed bytes into one allele per byte.
+
+    Args:
+        packed (np.ndarray of uint8): The packed rows.
+        num_items (int): The number of items to choose from.
+
+    Returns:
+        np.ndarray of uint8: The (pop_size x num_items) alleles.
+    """
+    return np.unpackbits(packed, axis=-1, count=int(num_items))
+
+
+def words(packed:np.ndarray[np.uint8]) -> np.ndarray[np.uint64]:
+    """View packed rows as uint64 words for word-level XOR/mask operations.
+
+    Args:
+        packed (np.ndarray of uint8): C-contiguous packed rows from pack().
+
+    Returns:
+        np.ndarray of uint64: A view of the same memory.
+    """
+    return packed.view(np.uint64)
+
+
+def tail_masks(cut_points:np.ndarray[np.signedinteger], num_items:int) -> np.ndarray[np.uint8]:
+    """Build packed masks selecting every locus at or after each cut-point.
+
+    Args:
+        cut_points (np.ndarray of int): One cut-point per mask. In range [1, num_items).
+        num_items (int): The number of items to choose from.
+
+    Returns:
+        np.ndarray of uint8: (len(cut_points) x packed_width) packed masks.
+    """
+    cut_points = np.asarray(cut_points)[:, np.newaxis]
+    byte_index = np.arange(packed_width(num_items))
+    cut_byte = cut_points // 8
+    partial = np.right_shift(0xFF, cut_points % 8)
+    return np.where(
+        byte_index > cut_byte, 0xFF,
+        np.where(byte_index == cut_byte, partial, 0)
+    ).astype(np.uint8)
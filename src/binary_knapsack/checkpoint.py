@@ -0,0 +1,125 @@
+# ahester57
+
+import numpy as np
+import os
+import pickle
+
+from binary_knapsack.chromosome import Chromosome
+from binary_knapsack.packed_population_matrix import PackedPopulationMatrix
+from binary_knapsack.population import Population
+from binary_knapsack.population_matrix import PopulationMatrix
+
+
+# Bumped whenever the layout of a checkpoint changes.
+CHECKPOINT_VERSION = 1
+
+
+def write_checkpoint(path:str, arrays:dict[str, np.ndarray], state:dict) -> None:
+    """Atomically replace the checkpoint at path.
+
+    The checkpoint is written to a temporary file beside path, synced, then renamed over path,
+    so a process killed mid-write leaves the previous checkpoint intact.
+
+    Args:
+        path (str): The checkpoint file.
+        arrays (dict): {'name': np.ndarray} stored as is.
+        state (dict): Anything else. Pickled.
+    """
+    blob = pickle.dumps({'version': CHECKPOINT_VERSION, **state}, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, state=np.frombuffer(blob, dtype=np.uint8), **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint(path:str) -> tuple[dict[str, np.ndarray], dict]:
+    """Read a checkpoint written by write_checkpoint. Only read checkpoints you trust; the state is pickled.
+
+    Args:
+        path (str): The checkpoint file.
+
+    Returns:
+        tuple[dict, dict]: (The arrays, The state)
+    """
+    with np.load(path) as npz:
+        arrays = {name: npz[name] for name in npz.files}
+    state = pickle.loads(arrays.pop('state').tobytes())
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f'{path}: checkpoint version {state.get("version")}, expected {CHECKPOINT_VERSION}')
+    return arrays, state
+
+
+def population_arrays(population:Population | PopulationMatrix) -> dict[str, np.ndarray]:
+    """The arrays needed to rebuild a population. Bitstrings are stored bit-packed.
+
+    Args:
+        population (Population or PopulationMatrix): An evaluated population.
+
+    Returns:
+        dict: {'packed', 'fitness_scores', 'fitness_costs', 'objective_scores'}, and 'delta_depths' for a PopulationMatrix.
+    """
+    if type(population) is PackedPopulationMatrix:
+        packed = population.packed
+    elif isinstance(population, PopulationMatrix):
+        packed = np.packbits(population.bitstrings, axis=1)
+    else:
+        packed = np.packbits(np.stack([c.bitstring for c in population.members]), axis=1)
+    if isinstance(population, PopulationMatrix):
+        return {
+            'packed': packed,
+            'fitness_scores': population.fitness_scores,
+            'fitness_costs': population.fitness_costs,
+            'objective_scores': population.objective_scores,
+            'delta_depths': population.delta_depths
+        }
+    return {
+        'packed': packed,
+        'fitness_scores': np.array([c.fitness_score for c in population.members], dtype=np.float64),
+        'fitness_costs': np.array([c.fitness_cost for c in population.members], dtype=np.float64),
+        'objective_scores': np.array([c.objective_score for c in population.members], dtype=np.float64)
+    }
+
+
+def restore_population(arrays:dict[str, np.ndarray], num_items:int, use_matrix:bool, packed:bool) -> Population | PopulationMatrix:
+    """Rebuild a population from population_arrays.
+
+    Args:
+        arrays (dict): {'packed', 'fitness_scores', 'fitness_costs', 'objective_scores'}, optionally 'delta_depths'.
+        num_items (int): The number of items to choose from.
+        use_matrix (bool): Rebuild a PopulationMatrix rather than Chromosome objects.
+        packed (bool): Rebuild a PackedPopulationMatrix.
+
+    Returns:
+        Population or PopulationMatrix: The evaluated population.
+    """
+    if packed:
+        return PackedPopulationMatrix(
+            arrays['packed'],
+            num_items,
+            arrays['fitness_scores'],
+            arrays['fitness_costs'],
+            arrays['objective_scores'],
+            arrays.get('delta_depths')
+        )
+    bitstrings = np.unpackbits(arrays['packed'], axis=1, count=num_items)
+    if use_matrix:
+        return PopulationMatrix(
+            bitstrings,
+            arrays['fitness_scores'],
+            arrays['fitness_costs'],
+            arrays['objective_scores'],
+            arrays.get('delta_depths')
+        )
+    members = []
+    for bitstring, fitness_score, fitness_cost, objective_score in zip(
+        bitstrings, arrays['fitness_scores'], arrays['fitness_costs'], arrays['objective_scores']
+    ):
+        c = Chromosome(None, num_items)
+        c.bitstring = bitstring
+        c.fitness_score = fitness_score
+        c.objective_score = objective_score
+        c.fitness_cost = fitness_cost
+        members.append(c)
+    return Population(members)
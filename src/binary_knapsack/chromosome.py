@@ -8,11 +8,14 @@ from binary_knapsack.test_problem.problem import TestProblem
 class Chromosome:
     """Depicts one solution in the population. Adapted for the 0/1 Knapsack problem.
 
+    Clones share their bitstring array (copy-on-write). Assign a new array to bitstring; never modify it in place.
+
     Attributes:
         num_items (int): The number of items to choose from.
         bitstring (np.ndarray of uint8): The bitstring representation of the alleles.
         fitness_score (float): The fitness score.
-        fitness_cost (float): The fitness cost.
+        objective_score (float): The fitness score before penalization.
+        fitness_cost (float or np.ndarray of float64): The fitness cost. One per constraint for multi-constraint problems.
     """
     def __init__(self, random:np.random.Generator, num_items:int) -> None:
         """Depicts one individual in the population.
@@ -21,9 +24,10 @@ class Chromosome:
             random (np.random.Generator): The random number generator.
             num_items (int): The number of items to choose from.
         """
-        assert num_items > 0 and num_items <= 256
+        assert num_items > 0
         self.num_items = num_items
         self.fitness_score = None
+        self.objective_score = None
         self.fitness_cost = None
         if random is not None:
             self.bitstring = random.integers(2, size=self.num_items, dtype=np.uint8)
@@ -43,18 +47,38 @@ class Chromosome:
         if self.is_evaluated:
             # no need to re-evaluate if bitstring has not changed
             return
-        self.fitness_score, self.fitness_cost = problem_instance.try_with_bitstring(self.bitstring)
+        if problem_instance.supports_batch:
+            fitness_scores, fitness_costs = problem_instance.try_with_bitstrings(self.bitstring[np.newaxis])
+            self.fitness_score, self.fitness_cost = fitness_scores[0], fitness_costs[0]
+        else:
+            self.fitness_score, self.fitness_cost = problem_instance.try_with_bitstring(self.bitstring)
+        self.objective_score = self.fitness_score
         return self.fitness_score
 
+    def clone(self) -> 'Chromosome':
+        """Copy this chromosome without copying its bitstring array.
+
+        Returns:
+            Chromosome: A new individual sharing this bitstring, fitness and objective scores and fitness cost.
+        """
+        c = Chromosome.__new__(Chromosome)
+        c.num_items = self.num_items
+        c._bitstring = self._bitstring
+        c._fitness_score = self._fitness_score
+        c._objective_score = self._objective_score
+        c._fitness_cost = self._fitness_cost
+        return c
+
     @property
     def bitstring(self) -> np.ndarray[np.uint8]:
         return self._bitstring
 
     @bitstring.setter
     def bitstring(self, value:np.ndarray[np.uint8]) -> None:
-        """bitstring update trigger clears fitness score."""
+        """bitstring update trigger clears fitness and objective scores."""
         assert value is not None and type(value) is np.ndarray and len(value) == self.num_items
         self.fitness_score = None
+        self.objective_score = None
         self._bitstring = value
 
     @property
@@ -67,12 +91,21 @@ class Chromosome:
         self._fitness_score = value
 
     @property
-    def fitness_cost(self) -> np.float64:
+    def objective_score(self) -> np.float64:
+        return self._objective_score
+
+    @objective_score.setter
+    def objective_score(self, value:np.float64) -> None:
+        assert value is None or type(value) is np.float64
+        self._objective_score = value
+
+    @property
+    def fitness_cost(self) -> np.float64 | np.ndarray[np.float64]:
         return self._fitness_cost
 
     @fitness_cost.setter
-    def fitness_cost(self, value:np.float64) -> None:
-        assert value is None or type(value) is np.float64
+    def fitness_cost(self, value:np.float64 | np.ndarray[np.float64]) -> None:
+        assert value is None or type(value) in (np.float64, np.ndarray)
         self._fitness_cost = value
 
     @property
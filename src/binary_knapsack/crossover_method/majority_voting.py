@@ -13,11 +13,13 @@ class MajorityVoting(CrossoverMethod):
         random (np.random.Generator): The random number generator.
         p_c (float): Probability of crossover. In range [0, 1].
         num_parents (int): Number of parents contributing to each child.
+        compat (bool): (False)[batched kernels]; (True)[reference per-child loops].
     """
     def __init__(self,
         random:np.random.Generator,
         p_c:float,
-        num_parents:int=4
+        num_parents:int=4,
+        compat:bool=False
     ) -> None:
         """Initialize the parameters for multi-parent majority-voting crossover.
 
@@ -25,8 +27,9 @@ class MajorityVoting(CrossoverMethod):
             random (np.random.Generator): The random number generator.
             p_c (float): Probability of crossover. In range [0, 1].
             num_parents (int): Number of parents contributing to each child.
+            compat (bool, optional): Use the reference per-child loops for crossover_matrix. Defaults to False.
         """
-        super().__init__(random, p_c)
+        super().__init__(random, p_c, compat)
         assert num_parents > 0
         self.num_parents = num_parents
 
@@ -61,6 +64,57 @@ class MajorityVoting(CrossoverMethod):
                 next_gen.append(population[i])
         return next_gen
 
+    def _crossover_matrix_batched(self,
+        parents:np.ndarray[np.uint8],
+        fitness_scores:np.ndarray[np.float64]=None
+    ) -> np.ndarray[np.uint8]:
+        """Perform multi-parent majority-voting crossover for every child at once.
+
+        Sums the gathered parent rows and compares the votes against the majority threshold.
+        Consumes the random number generator exactly as the per-child loop does.
+
+        Args:
+            parents (np.ndarray of uint8): The (pop_size x dims) population matrix to act upon.
+            fitness_scores (np.ndarray of float64, optional): Ignored for majority-voting crossover.
+
+        Returns:
+            np.ndarray of uint8: A new (pop_size x dims) population matrix after a round of majority-voting crossover.
+        """
+        offspring = parents.copy()
+        pop_size = len(parents)
+        randomness = self.random.uniform(0, 1, size=pop_size)
+        parent_indices = self.random.integers(0, pop_size, size=(pop_size, self.num_parents))
+        children = np.flatnonzero(randomness < self.p_c)
+        votes = np.zeros((len(children), parents.shape[1]), dtype=np.min_scalar_type(self.num_parents))
+        for k in range(self.num_parents):
+            votes += parents[parent_indices[children, k]]
+        offspring[children] = votes > (float)(self.num_parents / 2)
+        return offspring
+
+    def _crossover_matrix_pairwise(self,
+        parents:np.ndarray[np.uint8],
+        fitness_scores:np.ndarray[np.float64]=None
+    ) -> np.ndarray[np.uint8]:
+        """Perform multi-parent majority-voting crossover one child at a time. The reference for the batched kernel.
+
+        Args:
+            parents (np.ndarray of uint8): The (pop_size x dims) population matrix to act upon.
+            fitness_scores (np.ndarray of float64, optional): Ignored for majority-voting crossover.
+
+        Returns:
+            np.ndarray of uint8: A new (pop_size x dims) population matrix after a round of majority-voting crossover.
+        """
+        offspring = parents.copy()
+        pop_size = len(parents)
+        randomness = self.random.uniform(0, 1, size=pop_size)
+        for i in range(pop_size):
+            parent_indices = self.random.integers(0, pop_size, size=self.num_parents)
+            if randomness[i] < self.p_c:
+                # crossover, the child takes the allele held by a majority of its parents
+                votes = np.sum(parents[parent_indices], axis=0)
+                offspring[i] = votes > (float)(self.num_parents / 2)
+        return offspring
+
     @staticmethod
     def parameters() -> dict[str, tuple]:
         return {
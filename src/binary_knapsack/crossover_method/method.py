@@ -2,6 +2,7 @@
 
 import numpy as np
 
+from binary_knapsack import bitpacking
 from binary_knapsack.chromosome import Chromosome
 
 
@@ -11,21 +12,26 @@ class CrossoverMethod:
     Attributes:
         random (np.random.Generator): The random number generator.
         p_c (float): Probability of crossover. In range [0, 1].
+        compat (bool): (False)[batched kernels]; (True)[reference per-pair loops].
     """
     def __init__(self,
         random:np.random.Generator,
-        p_c:float=0.65
+        p_c:float=0.65,
+        compat:bool=False
     ) -> None:
         """Initialize the parameters for crossover.
 
         Args:
             random (np.random.Generator): The random number generator.
             p_c (float, optional): Probability of crossover. In range [0, 1]. Defaults to 0.65.
+            compat (bool, optional): Use the reference per-pair loops for crossover_matrix. Defaults to False.
         """
         assert type(random) is np.random.Generator
         assert p_c >= 0 and p_c <= 1
+        assert compat in (False, True)
         self.random = random
         self.p_c = p_c
+        self.compat = compat
 
     def crossover(self, population:list[Chromosome]) -> list[Chromosome]:
         """Perform on the population using self.p_c as probability of occurrence.
@@ -38,6 +44,56 @@ class CrossoverMethod:
         """
         raise NotImplementedError
 
+    def crossover_matrix(self,
+        parents:np.ndarray[np.uint8],
+        fitness_scores:np.ndarray[np.float64]=None
+    ) -> np.ndarray[np.uint8]:
+        """Perform on a population matrix using self.p_c as probability of occurrence.
+
+        Args:
+            parents (np.ndarray of uint8): The (pop_size x dims) population matrix to act upon.
+            fitness_scores (np.ndarray of float64, optional): The parents' fitness scores. Aligned by row.
+
+        Returns:
+            np.ndarray of uint8: A new (pop_size x dims) population matrix after a round of crossover.
+        """
+        if self.compat:
+            return self._crossover_matrix_pairwise(parents, fitness_scores)
+        return self._crossover_matrix_batched(parents, fitness_scores)
+
+    def _crossover_matrix_batched(self,
+        parents:np.ndarray[np.uint8],
+        fitness_scores:np.ndarray[np.float64]=None
+    ) -> np.ndarray[np.uint8]:
+        """Produce the whole offspring matrix at once."""
+        raise NotImplementedError
+
+    def _crossover_matrix_pairwise(self,
+        parents:np.ndarray[np.uint8],
+        fitness_scores:np.ndarray[np.float64]=None
+    ) -> np.ndarray[np.uint8]:
+        """Produce the offspring matrix one set of parents at a time. The reference for the batched kernel."""
+        raise NotImplementedError
+
+    def crossover_packed(self,
+        parents:np.ndarray[np.uint8],
+        num_items:int,
+        fitness_scores:np.ndarray[np.float64]=None
+    ) -> np.ndarray[np.uint8]:
+        """Perform on a bit-packed population matrix using self.p_c as probability of occurrence.
+
+        Unpacks, performs crossover_matrix, then re-packs. Methods expressible as masks should override this.
+
+        Args:
+            parents (np.ndarray of uint8): The packed population matrix to act upon. See bitpacking.pack().
+            num_items (int): The number of items to choose from.
+            fitness_scores (np.ndarray of float64, optional): The parents' fitness scores. Aligned by row.
+
+        Returns:
+            np.ndarray of uint8: A new packed population matrix after a round of crossover.
+        """
+        return bitpacking.pack(self.crossover_matrix(bitpacking.unpack(parents, num_items), fitness_scores))
+
     @staticmethod
     def parameters() -> dict[str, tuple]:
         """{'param_name': tuple('description', default_value)}"""
@@ -2,6 +2,7 @@
 
 import numpy as np
 
+from binary_knapsack import bitpacking
 from binary_knapsack.chromosome import Chromosome
 from binary_knapsack.crossover_method.method import CrossoverMethod
 
@@ -13,11 +14,13 @@ class PUniform(CrossoverMethod):
         random (np.random.Generator): The random number generator.
         p_c (float): Probability of crossover. In range [0, 1].
         p (float): Probability of parent 1 donating its allele (independent for each locus).
+        compat (bool): (False)[batched kernels]; (True)[reference per-pair loops].
     """
     def __init__(self,
         random:np.random.Generator,
         p_c:float,
-        p:float=0.5
+        p:float=0.5,
+        compat:bool=False
     ) -> None:
         """Initialize the parameters for p-uniform crossover.
 
@@ -25,8 +28,9 @@ class PUniform(CrossoverMethod):
             random (np.random.Generator): The random number generator.
             p_c (float): Probability of crossover. In range [0, 1].
             p (float): Probability of parent 1 donating its allele (independent for each locus).
+            compat (bool, optional): Use the reference per-pair loops for crossover_matrix. Defaults to False.
         """
-        super().__init__(random, p_c)
+        super().__init__(random, p_c, compat)
         assert p >= 0 and p <= 1
         self.p = p
 
@@ -70,6 +74,98 @@ class PUniform(CrossoverMethod):
             next_gen.append(p2)
         return next_gen
 
+    def _crossover_matrix_batched(self,
+        parents:np.ndarray[np.uint8],
+        fitness_scores:np.ndarray[np.float64]=None
+    ) -> np.ndarray[np.uint8]:
+        """Perform p-uniform crossover on every pair at once using a donor mask.
+
+        Consumes the random number generator exactly as the per-pair loop does.
+
+        Args:
+            parents (np.ndarray of uint8): The (pop_size x dims) population matrix to act upon.
+            fitness_scores (np.ndarray of float64): The parents' fitness scores. Aligned by row.
+
+        Returns:
+            np.ndarray of uint8: A new (pop_size x dims) population matrix after a round of p-uniform crossover.
+        """
+        assert fitness_scores is not None
+        offspring = parents.copy()
+        pop_size, num_items = parents.shape
+        randomness = self.random.uniform(0, 1, size=int(pop_size/2))
+        pairs = 2 * np.flatnonzero(randomness < self.p_c)
+        donors = self.random.uniform(0, 1, size=(len(pairs), int(num_items))) < self.p
+        second_is_better = (fitness_scores[pairs + 1] > fitness_scores[pairs])[:, np.newaxis]
+        first, second = parents[pairs], parents[pairs + 1]
+        better = np.where(second_is_better, second, first)
+        worse = np.where(second_is_better, first, second)
+        offspring[pairs] = np.where(donors, better, worse)
+        offspring[pairs + 1] = np.where(donors, worse, better)
+        return offspring
+
+    def _crossover_matrix_pairwise(self,
+        parents:np.ndarray[np.uint8],
+        fitness_scores:np.ndarray[np.float64]=None
+    ) -> np.ndarray[np.uint8]:
+        """Perform p-uniform crossover one pair at a time. The reference for the batched kernel.
+
+        Args:
+            parents (np.ndarray of uint8): The (pop_size x dims) population matrix to act upon.
+            fitness_scores (np.ndarray of float64): The parents' fitness scores. Aligned by row.
+
+        Returns:
+            np.ndarray of uint8: A new (pop_size x dims) population matrix after a round of p-uniform crossover.
+        """
+        assert fitness_scores is not None
+        offspring = parents.copy()
+        pop_size, num_items = parents.shape
+        randomness = self.random.uniform(0, 1, size=int(pop_size/2))
+        for i in np.arange(0, pop_size, step=2):
+            if randomness[int(i/2)] < self.p_c:
+                # crossover, the better parent donates with probability p
+                better, worse = parents[i], parents[i+1]
+                if fitness_scores[i+1] > fitness_scores[i]:
+                    better, worse = worse, better
+                donor = self.random.uniform(0, 1, size=int(num_items)) < self.p
+                offspring[i] = np.where(donor, better, worse)
+                offspring[i+1] = np.where(donor, worse, better)
+        return offspring
+
+    def crossover_packed(self,
+        parents:np.ndarray[np.uint8],
+        num_items:int,
+        fitness_scores:np.ndarray[np.float64]=None
+    ) -> np.ndarray[np.uint8]:
+        """Perform p-uniform crossover on a bit-packed population matrix using self.p_c as probability of occurrence.
+
+        Consumes the random number generator exactly as crossover_matrix does.
+
+        Args:
+            parents (np.ndarray of uint8): The packed population matrix to act upon. See bitpacking.pack().
+            num_items (int): The number of items to choose from.
+            fitness_scores (np.ndarray of float64): The parents' fitness scores. Aligned by row.
+
+        Returns:
+            np.ndarray of uint8: A new packed population matrix after a round of p-uniform crossover.
+        """
+        assert fitness_scores is not None
+        offspring = parents.copy()
+        pop_size = len(parents)
+        randomness = self.random.uniform(0, 1, size=int(pop_size/2))
+        pairs = 2 * np.flatnonzero(randomness < self.p_c)
+        donors = self.random.uniform(0, 1, size=(len(pairs), int(num_items))) < self.p
+        second_is_better = (fitness_scores[pairs + 1] > fitness_scores[pairs])[:, np.newaxis]
+        first = bitpacking.words(parents[pairs])
+        second = bitpacking.words(parents[pairs + 1])
+        better = np.where(second_is_better, second, first)
+        worse = np.where(second_is_better, first, second)
+        # flip exactly the donor bits where the parents differ
+        swap = (better ^ worse) & bitpacking.words(bitpacking.pack(donors))
+        offspring_words = bitpacking.words(offspring)
+        offspring_words[pairs] = worse ^ swap
+        offspring_words[pairs + 1] = better ^ swap
+        return offspring
+
     @staticmethod
     def parameters() -> dict[str, tuple]:
         return {
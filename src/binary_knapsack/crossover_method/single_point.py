@@ -2,6 +2,7 @@
 
 import numpy as np
 
+from binary_knapsack import bitpacking
 from binary_knapsack.chromosome import Chromosome
 from binary_knapsack.crossover_method.method import CrossoverMethod
 
@@ -12,18 +13,21 @@ class SinglePoint(CrossoverMethod):
     Attributes:
         random (np.random.Generator): The random number generator.
         p_c (float): Probability of crossover. In range [0, 1].
+        compat (bool): (False)[batched kernels]; (True)[reference per-pair loops].
     """
     def __init__(self,
         random:np.random.Generator,
-        p_c:float
+        p_c:float,
+        compat:bool=False
     ) -> None:
         """Initialize the parameters for single cut-point crossover.
 
         Args:
             random (np.random.Generator): The random number generator.
             p_c (float): Probability of crossover. In range [0, 1].
+            compat (bool, optional): Use the reference per-pair loops for crossover_matrix. Defaults to False.
         """
-        super().__init__(random, p_c)
+        super().__init__(random, p_c, compat)
 
     def crossover(self, population:list[Chromosome]) -> list[Chromosome]:
         """Perform single cut-point crossover on the population using self.p_c as probability of occurrence.
@@ -53,6 +57,88 @@ class SinglePoint(CrossoverMethod):
             next_gen.append(p2)
         return next_gen
 
+    def _crossover_matrix_batched(self,
+        parents:np.ndarray[np.uint8],
+        fitness_scores:np.ndarray[np.float64]=None
+    ) -> np.ndarray[np.uint8]:
+        """Perform single cut-point crossover on every pair at once using cut-point masks.
+
+        Consumes the random number generator exactly as the per-pair loop does.
+
+        Args:
+            parents (np.ndarray of uint8): The (pop_size x dims) population matrix to act upon.
+            fitness_scores (np.ndarray of float64, optional): Ignored for single cut-point crossover.
+
+        Returns:
+            np.ndarray of uint8: A new (pop_size x dims) population matrix after a round of single cut-point crossover.
+        """
+        offspring = parents.copy()
+        pop_size, num_items = parents.shape
+        randomness = self.random.uniform(0, 1, size=int(pop_size/2))
+        pairs = 2 * np.flatnonzero(randomness < self.p_c)
+        cut_points = self.random.integers(1, num_items, size=len(pairs))
+        # tails[k, j] is True at and after the k-th pair's cut-point
+        tails = np.arange(num_items) >= cut_points[:, np.newaxis]
+        first, second = parents[pairs], parents[pairs + 1]
+        offspring[pairs] = np.where(tails, second, first)
+        offspring[pairs + 1] = np.where(tails, first, second)
+        return offspring
+
+    def _crossover_matrix_pairwise(self,
+        parents:np.ndarray[np.uint8],
+        fitness_scores:np.ndarray[np.float64]=None
+    ) -> np.ndarray[np.uint8]:
+        """Perform single cut-point crossover one pair at a time. The reference for the batched kernel.
+
+        Args:
+            parents (np.ndarray of uint8): The (pop_size x dims) population matrix to act upon.
+            fitness_scores (np.ndarray of float64, optional): Ignored for single cut-point crossover.
+
+        Returns:
+            np.ndarray of uint8: A new (pop_size x dims) population matrix after a round of single cut-point crossover.
+        """
+        offspring = parents.copy()
+        pop_size, num_items = parents.shape
+        randomness = self.random.uniform(0, 1, size=int(pop_size/2))
+        for i in np.arange(0, pop_size, step=2):
+            if randomness[int(i/2)] < self.p_c:
+                # crossover, swap the tails of both rows
+                cut_point = self.random.integers(1, num_items)
+                offspring[i, cut_point:] = parents[i+1, cut_point:]
+                offspring[i+1, cut_point:] = parents[i, cut_point:]
+        return offspring
+
+    def crossover_packed(self,
+        parents:np.ndarray[np.uint8],
+        num_items:int,
+        fitness_scores:np.ndarray[np.float64]=None
+    ) -> np.ndarray[np.uint8]:
+        """Perform single cut-point crossover on a bit-packed population matrix using self.p_c as probability of occurrence.
+
+        Consumes the random number generator exactly as crossover_matrix does.
+
+        Args:
+            parents (np.ndarray of uint8): The packed population matrix to act upon. See bitpacking.pack().
+            num_items (int): The number of items to choose from.
+            fitness_scores (np.ndarray of float64, optional): Ignored for single cut-point crossover.
+
+        Returns:
+            np.ndarray of uint8: A new packed population matrix after a round of single cut-point crossover.
+        """
+        offspring = parents.copy()
+        pop_size = len(parents)
+        randomness = self.random.uniform(0, 1, size=int(pop_size/2))
+        pairs = 2 * np.flatnonzero(randomness < self.p_c)
+        cut_points = self.random.integers(1, num_items, size=len(pairs))
+        first = bitpacking.words(parents[pairs])
+        second = bitpacking.words(parents[pairs + 1])
+        # swap the tails: flip exactly the tail bits where the parents differ
+        swap = (first ^ second) & bitpacking.words(bitpacking.tail_masks(cut_points, num_items))
+        offspring_words = bitpacking.words(offspring)
+        offspring_words[pairs] = first ^ swap
+        offspring_words[pairs + 1] = second ^ swap
+        return offspring
+
     @staticmethod
     def parameters() -> dict[str, tuple]:
         return {'p_c': ('Enter Probability of Crossover', 0.65)}
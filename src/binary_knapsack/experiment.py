@@ -0,0 +1,346 @@
+# ahester57
+
+import argparse
+import contextlib
+import json
+import sys
+import time
+import tomllib
+
+import numpy as np
+
+from binary_knapsack.crossover_method.majority_voting import MajorityVoting
+from binary_knapsack.crossover_method.p_uniform import PUniform
+from binary_knapsack.crossover_method.single_point import SinglePoint
+from binary_knapsack.mutation_method.bitwise import BitwiseMutation
+from binary_knapsack.mutation_method.sparse import SparseBitwiseMutation
+from binary_knapsack.penalty_method.absolute import AbsolutePenalty
+from binary_knapsack.penalty_method.dynamic import DynamicPenalty
+from binary_knapsack.penalty_method.logarithmic import LogarithmicPenalty
+from binary_knapsack.repair_method.greedy import GreedyRepair
+from binary_knapsack.runner import MultiRunExecutor
+from binary_knapsack.selection_mechanism.proportional import Proportional, StochasticUniversal
+from binary_knapsack.selection_mechanism.ranking import LinearRanking
+from binary_knapsack.selection_mechanism.tournament import DeterministicTournament, StochasticTournament
+from binary_knapsack.selection_mechanism.truncation import Truncation
+from binary_knapsack.test_problem.file_knapsack import FileKnapsack
+from binary_knapsack.test_problem.knapsack import BinaryKnapsack
+from binary_knapsack.test_problem.multidimensional_knapsack import MultiDimensionalKnapsack
+from binary_knapsack.test_problem.problem import TestProblem
+from binary_knapsack.test_problem.solver import feasible_objectives, quality_summary, solve
+
+
+# {section: {class name: class}}. The first class of each section is the default, as in GA.
+SECTIONS = {
+    'problem': {c.__name__: c for c in (BinaryKnapsack, FileKnapsack, MultiDimensionalKnapsack)},
+    'selection': {c.__name__: c for c in (
+        Proportional, StochasticUniversal, LinearRanking, DeterministicTournament, StochasticTournament, Truncation
+    )},
+    'crossover': {c.__name__: c for c in (SinglePoint, PUniform, MajorityVoting)},
+    'penalty': {c.__name__: c for c in (AbsolutePenalty, LogarithmicPenalty, DynamicPenalty)},
+    'mutation': {c.__name__: c for c in (BitwiseMutation, SparseBitwiseMutation)},
+}
+
+# Sections which may be left out, as in GA. Resolved like SECTIONS only when given.
+OPTIONAL_SECTIONS = {
+    'repair': {c.__name__: c for c in (GreedyRepair,)},
+}
+
+# The [ga] options of a spec, with their defaults. Passed to GA as keyword arguments.
+GA_OPTIONS = {
+    'pop_size': 30,
+    'p_m': 0.05,
+    't_max': 50,
+    'maximize': True,
+    'use_matrix': True,
+    'packed': False,
+    'evaluation_workers': 0,
+    'fitness_cache_size': 0,
+    'delta_evaluation': False
+}
+
+TOP_LEVEL_KEYS = ('label', 'num_runs', 'entropy', 'target_quality', 'ga', *SECTIONS, *OPTIONAL_SECTIONS)
+
+
+def read_spec_file(path:str) -> dict:
+    """Parse a JSON or TOML spec file as is.
+
+    Args:
+        path (str): The spec file. TOML if it ends in '.toml', else JSON.
+
+    Returns:
+        dict: The parsed file.
+    """
+    if path.endswith('.toml'):
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_specs(path:str) -> list[dict]:
+    """Read the experiments of a JSON or TOML spec file.
+
+    Top-level keys are shared by every experiment. Each entry of the optional 'experiments' list
+    overrides them: a section naming the same class (or none) is merged key by key; a section
+    naming another class replaces the shared one.
+
+    Args:
+        path (str): The spec file. TOML if it ends in '.toml', else JSON.
+
+    Returns:
+        list of dict: The raw spec of each experiment, in file order.
+    """
+    spec = read_spec_file(path)
+    experiments = spec.pop('experiments', [{}])
+    if len(experiments) == 0:
+        raise ValueError(f'{path}: empty experiments list')
+    return [_merge(spec, experiment) for experiment in experiments]
+
+
+def resolve(spec:dict) -> dict:
+    """Validate a raw experiment spec and fill in every default.
+
+    The result has the same layout as the input, so it may be written out and run again as is.
+
+    Args:
+        spec (dict): The raw spec of one experiment.
+
+    Returns:
+        dict: The complete spec.
+    """
+    unknown = set(spec) - set(TOP_LEVEL_KEYS)
+    if unknown:
+        raise ValueError(f'unknown keys {sorted(unknown)}; expected some of {TOP_LEVEL_KEYS}')
+    resolved = {
+        'label': str(spec.get('label', '')),
+        'num_runs': int(spec.get('num_runs', 30)),
+        'entropy': spec.get('entropy'),
+        'target_quality': spec.get('target_quality'),
+        'ga': _coerce('ga', GA_OPTIONS, spec.get('ga', {}))
+    }
+    if resolved['num_runs'] <= 0:
+        raise ValueError(f'num_runs must be positive, not {resolved["num_runs"]}')
+    if resolved['entropy'] is not None and (type(resolved['entropy']) is not int or resolved['entropy'] < 0):
+        raise ValueError(f'entropy must be a non-negative integer, not {resolved["entropy"]!r}')
+    if resolved['target_quality'] is not None:
+        if type(resolved['target_quality']) not in (int, float) or not 0 < resolved['target_quality'] <= 1:
+            raise ValueError(f'target_quality must be a fraction in (0, 1], not {resolved["target_quality"]!r}')
+        if not resolved['ga']['maximize']:
+            raise ValueError('target_quality is a fraction of the optimal profit; it needs maximize')
+        resolved['target_quality'] = float(resolved['target_quality'])
+    given_optional = {section: classes for section, classes in OPTIONAL_SECTIONS.items() if section in spec}
+    for section, classes in {**SECTIONS, **given_optional}.items():
+        given = dict(spec.get(section, {}))
+        name = given.pop('class', next(iter(classes)))
+        if name not in classes:
+            raise ValueError(f'unknown {section} class {name!r}; expected one of {tuple(classes)}')
+        defaults = {k: v[1] for k, v in classes[name].parameters().items()}
+        resolved[section] = {'class': name, **_coerce(f'{section} {name}', defaults, given)}
+    return resolved
+
+
+def build_problem(spec:dict) -> TestProblem:
+    """Construct the problem instance of a resolved spec. Its printout goes to stderr.
+
+    Args:
+        spec (dict): The resolved spec of one experiment.
+
+    Returns:
+        TestProblem: The problem instance.
+    """
+    # problem instances print themselves; keep stdout for the caller
+    with contextlib.redirect_stdout(sys.stderr):
+        return _instantiate(spec, 'problem')
+
+
+def ga_options(spec:dict, problem_instance:TestProblem=None) -> dict:
+    """Translate a resolved spec into keyword arguments for GA, excluding rand_seed.
+
+    Args:
+        spec (dict): The resolved spec of one experiment.
+        problem_instance (TestProblem, optional): Shared by experiments on the same problem. Built from the spec if not given.
+
+    Returns:
+        dict: The GA options.
+    """
+    if problem_instance is None:
+        problem_instance = build_problem(spec)
+    return {
+        **spec['ga'],
+        'problem_instance': problem_instance,
+        'Select_Mechanism': SECTIONS['selection'][spec['selection']['class']],
+        'selection_parameters': _parameters(spec, 'selection'),
+        'Crossover_Method': SECTIONS['crossover'][spec['crossover']['class']],
+        'crossover_parameters': _parameters(spec, 'crossover'),
+        'Penalty_Method': SECTIONS['penalty'][spec['penalty']['class']],
+        'penalty_parameters': _parameters(spec, 'penalty'),
+        'Mutation_Method': SECTIONS['mutation'][spec['mutation']['class']],
+        'mutation_parameters': _parameters(spec, 'mutation'),
+        'Repair_Method': OPTIONAL_SECTIONS['repair'][spec['repair']['class']] if 'repair' in spec else None,
+        'repair_parameters': _parameters(spec, 'repair') if 'repair' in spec else {}
+    }
+
+
+def run_experiment(spec:dict, max_workers:int=None) -> dict:
+    """Simulate every run of one experiment on a process pool.
+
+    With a target_quality, the problem is first solved for reference (see test_problem.solver). Each run then
+    records its optimality gap and when it reached target_quality of the optimum, and the summary averages them.
+
+    Args:
+        spec (dict): The spec of one experiment. Resolved if it is not already.
+        max_workers (int, optional): The number of worker processes. Defaults to one per CPU, at most num_runs.
+
+    Returns:
+        dict: {'spec': the resolved spec, with the entropy used, 'seconds': wall-time,
+            'runs': one record per run, in order of run_index, 'summary': statistics of the best-of-runs}
+    """
+    spec = resolve(spec)
+    start = time.perf_counter()
+    options = ga_options(spec)
+    reference = None
+    if spec['target_quality'] is not None:
+        reference = solve(options['problem_instance'])
+        options['target_fitness'] = spec['target_quality'] * reference.profit
+    executor = MultiRunExecutor(options, spec['num_runs'], spec['entropy'], max_workers)
+    spec['entropy'] = executor.entropy
+    results = executor.run()
+    runs = [
+        {
+            'run_index': r.run_index,
+            'fitness_score': float(r.best_of_run.fitness_score),
+            # a list for multi-constraint problems
+            'fitness_cost': np.asarray(r.best_of_run.fitness_cost).tolist(),
+            'generation': r.generation,
+            'bitstring': ''.join(map(str, r.best_of_run.bitstring))
+        }
+        for r in results
+    ]
+    if reference is not None:
+        bitstrings = np.stack([r.best_of_run.bitstring for r in results])
+        objectives = feasible_objectives(options['problem_instance'], bitstrings)
+        for run, r, objective in zip(runs, results, objectives):
+            # measured from the objective; an infeasible best-of-run has none
+            run['gap'] = None if np.isnan(objective) else reference.gap(objective)
+            run['target'] = None if r.target_hit is None else r.target_hit._asdict()
+    fitness_scores = np.array([r['fitness_score'] for r in runs])
+    generations = np.array([r['generation'] for r in runs])
+    best = int(np.argmax(fitness_scores) if spec['ga']['maximize'] else np.argmin(fitness_scores))
+    summary = {
+        'best_run_index': runs[best]['run_index'],
+        'best_fitness': runs[best]['fitness_score'],
+        'mean_best_fitness': float(np.mean(fitness_scores)),
+        'std_best_fitness': float(np.std(fitness_scores)),
+        'mean_generation': float(np.mean(generations)),
+        'std_generation': float(np.std(generations))
+    }
+    if reference is not None:
+        summary['reference'] = quality_summary(
+            reference, options['problem_instance'], bitstrings, [r.target_hit for r in results], spec['target_quality']
+        )
+    return {
+        'spec': spec,
+        'seconds': time.perf_counter() - start,
+        'runs': runs,
+        'summary': summary
+    }
+
+
+def _merge(shared:dict, override:dict) -> dict:
+    """Overlay one experiment on the shared keys of a spec file. See load_specs."""
+    merged = dict(shared)
+    for k, v in override.items():
+        base = merged.get(k)
+        if isinstance(base, dict) and isinstance(v, dict) and v.get('class', base.get('class')) == base.get('class'):
+            merged[k] = {**base, **v}
+        else:
+            merged[k] = v
+    return merged
+
+
+def _coerce(section:str, defaults:dict, given:dict) -> dict:
+    """Check given values against their defaults' types, the way the menu prompts for them.
+
+    Args:
+        section (str): Names the section in error messages.
+        defaults (dict): {'param_name': default_value}
+        given (dict): {'param_name': value} from the spec.
+
+    Returns:
+        dict: Every parameter; the given value if any, else the default.
+    """
+    unknown = set(given) - set(defaults)
+    if unknown:
+        raise ValueError(f'unknown {section} parameters {sorted(unknown)}; expected some of {tuple(defaults)}')
+    values = {}
+    for k, default in defaults.items():
+        v = given.get(k, default)
+        if type(default) is bool:
+            if type(v) is not bool:
+                raise ValueError(f'{section} parameter {k!r} must be true or false, not {v!r}')
+        elif type(default) is int:
+            if type(v) is not int:
+                raise ValueError(f'{section} parameter {k!r} must be an integer, not {v!r}')
+        elif type(default) is float:
+            if type(v) not in (int, float):
+                raise ValueError(f'{section} parameter {k!r} must be a number, not {v!r}')
+            v = float(v)
+        values[k] = v
+    return values
+
+
+def _parameters(spec:dict, section:str) -> dict:
+    """The constructor parameters of a resolved section, without its class name."""
+    return {k: v for k, v in spec[section].items() if k != 'class'}
+
+
+def _instantiate(spec:dict, section:str):
+    """Construct the class named by a resolved section with its parameters."""
+    return SECTIONS[section][spec[section]['class']](**_parameters(spec, section))
+
+
+def main(argv:list[str]=None) -> int:
+    """Run every experiment of the given spec files, appending one JSON line per experiment to the output.
+
+    Args:
+        argv (list of str, optional): The command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit status. 1 if any experiment failed.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m binary_knapsack.experiment',
+        description='Run GA experiments from JSON or TOML spec files, without prompting.'
+    )
+    parser.add_argument('specs', nargs='+', help='spec files; TOML if ending in .toml, else JSON')
+    parser.add_argument('-o', '--output', help='append one JSON line per experiment here')
+    parser.add_argument('--max-workers', type=int, help='worker processes per experiment; defaults to one per CPU')
+    parser.add_argument('--check', action='store_true', help='validate the specs and print them resolved, without running')
+    args = parser.parse_args(argv)
+
+    specs = [resolve(spec) for path in args.specs for spec in load_specs(path)]
+    if args.check:
+        for spec in specs:
+            print(json.dumps(spec))
+        return 0
+    if args.output is None:
+        # runs print their progress to stdout, so results need a file of their own
+        parser.error('the following arguments are required: -o/--output')
+
+    failures = 0
+    with open(args.output, 'a') as f:
+        for i, spec in enumerate(specs):
+            print(f'[{i + 1}/{len(specs)}] {spec["label"] or "experiment"}', file=sys.stderr)
+            try:
+                record = run_experiment(spec, args.max_workers)
+            except Exception as e:
+                failures += 1
+                record = {'spec': spec, 'error': f'{type(e).__name__}: {e}'}
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+    return 1 if failures > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+# ahester57
+
+import numpy as np
+
+from collections import OrderedDict
+from typing import NamedTuple
+
+from binary_knapsack.test_problem.problem import TestProblem
+
+
+class CacheInfo(NamedTuple):
+    """Counters of a CachedProblem. Duplicates within one batch count as hits.
+
+    Attributes:
+        hits (int): Solutions answered from the cache.
+        misses (int): Solutions passed on to the wrapped problem.
+        evictions (int): Entries dropped to stay within max_size.
+        size (int): Entries currently cached.
+        max_size (int): The most entries kept.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+
+class CachedProblem(TestProblem):
+    """Memoizes the (fitness_score, fitness_cost) of another TestProblem, keyed by packed bitstring bytes.
+
+    Least recently used entries are evicted once more than max_size solutions are cached.
+    Works on the per-chromosome and batch paths, packed or not. Delta evaluation is passed straight on
+    to the wrapped problem: it costs less than packing a child to look it up, and its result is not cached.
+
+    Attributes:
+        problem_instance (TestProblem): The wrapped problem instance.
+        dims (int): The number of items to choose from.
+        max_size (int): The most entries kept.
+        hits (int): Solutions answered from the cache.
+        misses (int): Solutions passed on to the wrapped problem.
+        evictions (int): Entries dropped to stay within max_size.
+    """
+    def __init__(self, problem_instance:TestProblem, max_size:int=65536) -> None:
+        """Initialize an empty fitness cache.
+
+        Args:
+            problem_instance (TestProblem): The problem instance to wrap.
+            max_size (int, optional): The most entries kept. Default 65536.
+        """
+        assert problem_instance is not None
+        assert max_size > 0
+        super().__init__(problem_instance.dims)
+        self.problem_instance = problem_instance
+        self.max_size = int(max_size)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache = OrderedDict()
+        # packed rows are padded to whole words; keys only hold the bytes covering dims
+        self._key_width = -(-self.dims // 8)
+
+    def try_with_bitstring(self, soln:np.ndarray[np.uint8]) -> tuple:
+        """Evaluate a bit-string solution to the problem, unless it is cached."""
+        key = np.packbits(soln).tobytes()
+        value = self._cache.get(key)
+        if value is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = self.problem_instance.try_with_bitstring(soln)
+        self._store(key, value)
+        return value
+
+    def try_with_bitstrings(self, solns:np.ndarray[np.uint8]) -> tuple[np.ndarray]:
+        """Evaluate a (pop_size x dims) matrix of bit-string solutions, passing on only the uncached ones."""
+        return self._lookup(np.packbits(solns, axis=1), solns, False)
+
+    def try_with_packed_bitstrings(self, packed:np.ndarray[np.uint8]) -> tuple[np.ndarray]:
+        """Evaluate a matrix of bit-packed solutions, passing on only the uncached ones."""
+        return self._lookup(packed[:, :self._key_width], packed, True)
+
+    def try_with_flips(self,
+        fitness_scores:np.ndarray[np.float64],
+        fitness_costs:np.ndarray[np.float64],
+        rows:np.ndarray[np.signedinteger],
+        loci:np.ndarray[np.signedinteger],
+        alleles:np.ndarray[np.uint8]
+    ) -> tuple[np.ndarray]:
+        """Delta-evaluate solutions with the wrapped problem. Neither looked up nor cached."""
+        return self.problem_instance.try_with_flips(fitness_scores, fitness_costs, rows, loci, alleles)
+
+    def cache_info(self) -> CacheInfo:
+        """Report the cache counters.
+
+        Returns:
+            CacheInfo: (hits, misses, evictions, size, max_size)
+        """
+        return CacheInfo(self.hits, self.misses, self.evictions, len(self._cache), self.max_size)
+
+    def close(self) -> None:
+        """Release any resources held by the wrapped problem instance."""
+        self.problem_instance.close()
+
+    def _lookup(self, keys:np.ndarray[np.uint8], solns:np.ndarray[np.uint8], packed:bool) -> tuple[np.ndarray]:
+        """Answer each row from the cache, evaluating the missing ones in one batch.
+
+        Args:
+            keys (np.ndarray of uint8): The (num_rows x key_width) packed keys.
+            solns (np.ndarray of uint8): The (num_rows x width) solutions to pass on.
+            packed (bool): Whether the solutions are bit-packed.
+
+        Returns:
+            tuple[np.ndarray]: (fitness_scores, fitness_costs)
+        """
+        fitness_scores = np.empty(len(keys))
+        fitness_costs = np.empty((len(keys), *self.cost_shape))
+        missing = {}
+        for j, row in enumerate(keys):
+            key = row.tobytes()
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+                fitness_scores[j], fitness_costs[j] = value
+            else:
+                missing.setdefault(key, []).append(j)
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+        if len(missing) == 0:
+            return fitness_scores, fitness_costs
+        first_rows = [rows[0] for rows in missing.values()]
+        if packed:
+            scores, costs = self.problem_instance.try_with_packed_bitstrings(solns[first_rows])
+        elif self.problem_instance.supports_batch:
+            scores, costs = self.problem_instance.try_with_bitstrings(solns[first_rows])
+        else:
+            scores, costs = zip(*(self.problem_instance.try_with_bitstring(solns[j]) for j in first_rows))
+            scores, costs = np.array(scores), np.array(costs)
+        for (key, rows), score, cost in zip(missing.items(), scores, costs):
+            fitness_scores[rows] = score
+            fitness_costs[rows] = cost
+            # vector costs are copied out of the batch result, so entries do not keep it alive
+            self._store(key, (np.float64(score), np.float64(cost) if np.ndim(cost) == 0 else np.array(cost, dtype=np.float64)))
+        return fitness_scores, fitness_costs
+
+    def _store(self, key:bytes, value:tuple) -> None:
+        """Cache a result, evicting the least recently used entry if full.
+
+        Args:
+            key (bytes): The packed bitstring.
+            value (tuple): (fitness_score, fitness_cost)
+        """
+        self._cache[key] = value
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def supports_delta(self) -> bool:
+        return self.problem_instance.supports_delta
+
+    @property
+    def cost_shape(self) -> tuple[int, ...]:
+        return self.problem_instance.cost_shape
+
+    @property
+    def constraints(self) -> dict:
+        """{'chromosome_attribute': max_limit}"""
+        return self.problem_instance.constraints
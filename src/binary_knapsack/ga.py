@@ -1,19 +1,30 @@
 # ahester57
 
 import asyncio
-import copy
 import numpy as np
 import sys
 import time
 
-from collections import deque
+from typing import AsyncIterator
 
+from binary_knapsack.best_of_run import BestOfRun, TargetHit
+from binary_knapsack.checkpoint import population_arrays, read_checkpoint, restore_population, write_checkpoint
 from binary_knapsack.chromosome import Chromosome
+from binary_knapsack.fitness_cache import CachedProblem
+from binary_knapsack.generation_snapshot import GenerationSnapshot
+from binary_knapsack.mutation_method.bitwise import BitwiseMutation
+from binary_knapsack.mutation_method.method import MutationMethod
 from binary_knapsack.penalty_method.absolute import AbsolutePenalty
 from binary_knapsack.penalty_method.method import PenaltyMethod
 from binary_knapsack.population import Population
+from binary_knapsack.population_matrix import PopulationMatrix
+from binary_knapsack.profiling import STAGES, ProfilingHook
+from binary_knapsack.repair_method.method import RepairMethod
+from binary_knapsack.packed_population_matrix import PackedPopulationMatrix
 from binary_knapsack.selection_mechanism.mechanism import SelectionMechanism
 from binary_knapsack.selection_mechanism.proportional import Proportional
+from binary_knapsack.shared_evaluator import SharedMemoryEvaluator
+from binary_knapsack.telemetry import TelemetrySink
 from binary_knapsack.test_problem.knapsack import BinaryKnapsack
 from binary_knapsack.test_problem.problem import TestProblem
 from binary_knapsack.crossover_method.method import CrossoverMethod
@@ -29,20 +40,35 @@ class GA:
         p_m (float): Probability of mutation. In range [0, 1].
         t_max (int): Maximum iterations/generations.
         random (np.random.Generator): The random number generator.
-        population (Population): Collection of current generation's individual chromosomes.
+        population (Population or PopulationMatrix): Collection of current generation's individual chromosomes.
         problem_instance (TestProblem): The configured instance of the "objective function."
         maximize (bool): (False)[minimize]; (True)[maximize].
         Select_Mechanism (SelectionMechanism): The selected selection mechanism.
         selection_parameters (dict): The selected selection mechanism parameters.
         crossover_instance (CrossoverMethod): The configured instance of the chosen method.
         penalty_instance (PenaltyMethod): The configured instance of the chosen method.
+        mutation_instance (MutationMethod): The configured instance of the chosen method.
+        repair_instance (RepairMethod): The configured instance of the chosen method. None if not repairing.
+        use_matrix (bool): (False)[Chromosome objects]; (True)[one contiguous PopulationMatrix].
+        packed (bool): (False)[one byte per allele]; (True)[bit-packed PackedPopulationMatrix].
+        evaluation_workers (int): (0)[evaluate in this process]; (N)[evaluate on N worker processes].
+        fitness_cache_size (int): (0)[no cache]; (N)[remember the fitness of the N most recent bitstrings].
+        delta_evaluation (bool): (False)[evaluate children in full]; (True)[from their parent and the changed loci].
+        profiler (ProfilingHook): Receives the wall-time of each stage. None if not profiling.
+        telemetry (TelemetrySink): Receives a record of every generation. None if not recording.
+        checkpoint_path (str): Where the state of the run is periodically saved. None if not checkpointing.
+        checkpoint_interval (float): The fewest seconds between checkpoints.
+        evaluations (int): The number of individuals evaluated so far.
+        target_fitness (float): The fitness whose first attainment is recorded in target_hit. None if not tracked.
+        target_hit (TargetHit): When the best-of-run first reached target_fitness. None until then.
+        stop_on_convergence (bool): (False)[always run to t_max]; (True)[end the run once the population converges].
     """
     def __init__(
         self,
         pop_size:int=300,
         p_m:float=0.05,
         t_max:int=50,
-        rand_seed:int=None,
+        rand_seed:int | np.random.SeedSequence=None,
         problem_instance:TestProblem=None,
         maximize:bool=True,
         Select_Mechanism:SelectionMechanism=Proportional,
@@ -51,6 +77,21 @@ class GA:
         crossover_parameters:dict={'p_c': 0.65},
         Penalty_Method:PenaltyMethod=AbsolutePenalty,
         penalty_parameters:dict={},
+        Mutation_Method:MutationMethod=BitwiseMutation,
+        mutation_parameters:dict={},
+        Repair_Method:RepairMethod=None,
+        repair_parameters:dict={},
+        use_matrix:bool=False,
+        packed:bool=False,
+        evaluation_workers:int=0,
+        fitness_cache_size:int=0,
+        delta_evaluation:bool=False,
+        profiler:ProfilingHook=None,
+        telemetry:TelemetrySink=None,
+        checkpoint_path:str=None,
+        checkpoint_interval:float=300.0,
+        target_fitness:float=None,
+        stop_on_convergence:bool=True,
     ) -> None:
         """Initialize the parameters for a genetic algorithm.
 
@@ -58,7 +99,7 @@ class GA:
             pop_size (int, optional): Population size. Defaults to 30.
             p_m (float, optional): Probability of mutation. In range [0, 1]. Defaults to 0.05.
             t_max (int, optional): Maximum iterations/generations. Defaults to 50.
-            rand_seed(int, optional): Seed for random number generator.
+            rand_seed(int or np.random.SeedSequence, optional): Seed for random number generator.
             problem_instance (TestProblem): The configured instance of the "objective function."
             maximize (bool, optional): (False)[minimize]; (True)[maximize]. Default True.
             Select_Mechanism (SelectionMechanism): The selected selection mechanism. Default Proportional.
@@ -67,13 +108,63 @@ class GA:
             crossover_parameters (dict, optional): The selected crossover method parameters.
             Penalty_Method (PenaltyMethod): The selected penalty method. Default AbsolutePenalty.
             penalty_parameters (dict, optional): The selected penalty method parameters.
+            Mutation_Method (MutationMethod): The selected mutation method. Default BitwiseMutation.
+            mutation_parameters (dict, optional): The selected mutation method parameters.
+            Repair_Method (RepairMethod, optional): Repairs new individuals before evaluation. Default None, i.e., penalize only.
+            repair_parameters (dict, optional): The selected repair method parameters.
+            use_matrix (bool, optional): Represent the population as one PopulationMatrix. Default False.
+            packed (bool, optional): Represent the population as one bit-packed matrix. Implies use_matrix. Default False.
+            evaluation_workers (int, optional): Evaluate each generation on this many processes, through shared memory. Default 0.
+            fitness_cache_size (int, optional): Remember the fitness of this many recent bitstrings. Default 0.
+            delta_evaluation (bool, optional): Evaluate children from their parent if the problem supports it. Matrix only.
+                Agrees with full evaluation to within rounding, so ties may break differently. Default False.
+            profiler (ProfilingHook, optional): Receives the wall-time of each stage. Default None, i.e., no instrumentation.
+            telemetry (TelemetrySink, optional): Receives a record of every generation. Flushed, not closed, when the run ends. Default None.
+            checkpoint_path (str, optional): Save the state of the run here, at most every checkpoint_interval. Default None. See GA.resume.
+            checkpoint_interval (float, optional): The fewest seconds between checkpoints. Default 300.
+            target_fitness (float, optional): Record when the best-of-run first reaches this fitness. Default None.
+                See test_problem.solver for a reference optimum to derive it from.
+            stop_on_convergence (bool, optional): End the run once the population converges. Default True.
         """
+        # every argument but the observers, so a checkpoint can rebuild this GA
+        self._options = {k: v for k, v in locals().items() if k not in ('self', 'profiler', 'telemetry')}
         assert pop_size > 0 and pop_size % 2 == 0
         assert p_m >= 0 and p_m <= 1
         assert t_max > 0
         assert maximize in (False, True)
+        assert use_matrix in (False, True)
+        assert packed in (False, True)
+        assert evaluation_workers >= 0
+        assert fitness_cache_size >= 0
+        assert delta_evaluation in (False, True)
+        assert checkpoint_interval >= 0
+        assert stop_on_convergence in (False, True)
         assert problem_instance is not None and problem_instance.dims is not None
         self.problem_instance = problem_instance
+        self.evaluation_workers = int(evaluation_workers)
+        self.fitness_cache_size = int(fitness_cache_size)
+        if self.evaluation_workers > 0:
+            self.problem_instance = SharedMemoryEvaluator(self.problem_instance, self.evaluation_workers)
+        if self.fitness_cache_size > 0:
+            # outermost, so cached bitstrings never reach the workers
+            self.problem_instance = CachedProblem(self.problem_instance, self.fitness_cache_size)
+        self._given_problem_instance = problem_instance
+        self.delta_evaluation = delta_evaluation
+        self._parents = None
+        self.evaluations = 0
+        self.profiler = profiler
+        self.telemetry = telemetry
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = float(checkpoint_interval)
+        self._last_checkpoint = time.monotonic()
+        self.target_fitness = None if target_fitness is None else float(target_fitness)
+        self.target_hit : TargetHit = None
+        self.stop_on_convergence = stop_on_convergence
+        self._started = None
+        if self.profiler is not None:
+            # shadow each stage with a timed wrapper; nothing is wrapped when not profiling
+            for stage in STAGES:
+                setattr(self, stage, self._profiled(stage, getattr(self, stage)))
         assert self.problem_instance.dims > 0
         self._bitstring_length = None
         self.pop_size = int(pop_size)
@@ -84,6 +175,8 @@ class GA:
         self.population = None
         self.best_of_run = None
         self.maximize = maximize
+        self.packed = packed
+        self.use_matrix = use_matrix or packed
         self.Select_Mechanism = Select_Mechanism
         self.selection_parameters = selection_parameters
         self.random = None
@@ -96,14 +189,99 @@ class GA:
             self.problem_instance.constraints,
             **penalty_parameters
         )
+        self.mutation_instance : MutationMethod = Mutation_Method(
+            self.random,
+            self.p_m,
+            **mutation_parameters
+        )
+        self.repair_instance : RepairMethod = None
+        if Repair_Method is not None:
+            # the unwrapped problem; repair reads its items rather than evaluating through workers or the cache
+            self.repair_instance = Repair_Method(problem_instance, **repair_parameters)
 
-    async def simulate(self) -> Chromosome:
-        """Simulate the genetic algorithm with configured parameters."""
-        self.initialize_population()
-        self.evaluate_population()
-        deque((self.iterate() for _ in np.arange(self.t_max)), maxlen=0) # execute generator
+    async def simulate(self, yield_every:int=1, timeout:float=None) -> tuple[Chromosome, int]:
+        """Simulate the genetic algorithm with configured parameters.
+
+        Control returns to the event loop every yield_every generations, so many runs may share one loop.
+
+        Args:
+            yield_every (int, optional): Generations between returning control to the event loop. Default 1.
+            timeout (float, optional): Seconds before raising TimeoutError. The best-of-run so far is kept. Default None.
+
+        Returns:
+            tuple[Chromosome, int]: (The best-of-run, The generation it was found)
+        """
+        async with asyncio.timeout(timeout):
+            async for _ in self.generations(yield_every):
+                pass
         return self.best_of_run, self.best_of_run_generation
 
+    async def generations(self, yield_every:int=1, diversity:bool=False) -> AsyncIterator[GenerationSnapshot]:
+        """Simulate the genetic algorithm cooperatively, reporting on the way.
+
+        Every yield_every generations, control returns to the event loop and a snapshot is yielded.
+        The initial population and the final generation are always reported.
+        A GA from GA.resume continues from its checkpoint, reporting the restored generation first.
+        Cancelling the consuming task, or breaking out of the loop, stops the run between generations.
+
+        Args:
+            yield_every (int, optional): Generations between snapshots. Default 1.
+            diversity (bool, optional): Report allele frequencies and mean pairwise Hamming distance. Default False.
+
+        Yields:
+            GenerationSnapshot: The state of the run after a generation.
+        """
+        assert yield_every > 0
+        if self._started is None:
+            self._started = time.perf_counter()
+        try:
+            if self.population is None:
+                self.initialize_population()
+                self.evaluate_population()
+                if self.telemetry is not None:
+                    self.telemetry.record(self)
+            yield self.snapshot(diversity)
+            while self.t < self.t_max:
+                self.iterate()
+                if self.telemetry is not None:
+                    self.telemetry.record(self)
+                if self.checkpoint_path is not None and \
+                    time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+                    self.checkpoint()
+                if self.t % yield_every == 0 or self.t >= self.t_max:
+                    await asyncio.sleep(0)
+                    yield self.snapshot(diversity)
+        finally:
+            if self.telemetry is not None:
+                self.telemetry.flush()
+            self.close()
+
+    def close(self) -> None:
+        """Release the evaluation worker processes, if any. A given problem instance is left open."""
+        if self.problem_instance is not self._given_problem_instance:
+            self.problem_instance.close()
+
+    def snapshot(self, diversity:bool=False) -> GenerationSnapshot:
+        """Report the current generation from the population statistics.
+
+        Args:
+            diversity (bool, optional): Report allele frequencies and mean pairwise Hamming distance. Default False.
+
+        Returns:
+            GenerationSnapshot: The state of the run.
+        """
+        stats = self.population.statistics(diversity)
+        return GenerationSnapshot(
+            self.t,
+            self.best_of_run_record,
+            stats.high_fitness,
+            stats.low_fitness,
+            stats.average_fitness,
+            stats.std_fitness,
+            stats.mean_hamming_distance,
+            stats.allele_frequencies
+        )
+
     def iterate(self) -> None:
         """Perform one iteration of the simulation."""
         self.t = self.t + 1
@@ -115,7 +293,7 @@ class GA:
         self.evaluate_population()
         # if self.t % 10 == 0 or self.t == self.t_max:
             # self.print_stats()
-        if self.population.is_converged:
+        if self.stop_on_convergence and self.population.is_converged:
             print(f'Population Converged at t={self.t}. Terminating')
             self.print_stats()
             self.t = self.t_max
@@ -126,40 +304,132 @@ class GA:
         Track fitness scores using a tuple containing (index, fitness_score).
         """
         try:
-            self.population.evaluate(self.problem_instance)
-            self.penalty_instance.penalize(self.population.members, self.t)
+            if self.use_matrix:
+                evaluated = self.population.evaluate(self.problem_instance, self._parents)
+                self._parents = None
+            else:
+                evaluated = self.population.evaluate(self.problem_instance)
+            self.evaluations += len(evaluated)
+            if self.use_matrix:
+                self.penalty_instance.penalize_matrix(self.population, self.t)
+            else:
+                self.penalty_instance.penalize(self.population.members, self.t)
         except NotImplementedError:
             print('Provided TestProblem not supported.')
             sys.exit(1)
-        if self.maximize:
-            if self.best_of_run is None or self.population.high_score.fitness_score > self.best_of_run.fitness_score:
-                self.best_of_run = copy.deepcopy(self.population.high_score)
+        if self.use_matrix:
+            self._track_best_of_matrix()
         else:
-            if self.best_of_run is None or self.population.low_score.fitness_score < self.best_of_run.fitness_score:
-                self.best_of_run = copy.deepcopy(self.population.low_score)
+            self._track_best_of_population()
+        if self.target_fitness is not None and self.target_hit is None:
+            self._track_target()
+
+    def _track_best_of_population(self) -> None:
+        """Update the best-of-run from a Population of Chromosome objects."""
+        members = self.population.members
+        fitness_scores = np.fromiter((c.fitness_score for c in members), dtype=np.float64, count=len(members))
+        violation = self.penalty_instance.violation(self.penalty_instance.costs(members))
+        j = self._best_index(fitness_scores, violation)
+        if self._improves(fitness_scores[j], violation[j]):
+            self.best_of_run = members[j]
+
+    def _track_best_of_matrix(self) -> None:
+        """Update the best-of-run from a PopulationMatrix. Only snapshots the row upon improvement."""
+        violation = self.penalty_instance.violation(self.penalty_instance.costs(self.population))
+        j = self._best_index(self.population.fitness_scores, violation)
+        if self._improves(self.population.fitness_scores[j], violation[j]):
+            self.best_of_run_record = self.population.snapshot(j, self.t)
+
+    def _best_index(self, fitness_scores:np.ndarray[np.float64], violation:np.ndarray[np.float64]) -> int:
+        """The best individual of this generation: the fittest feasible one, else the least infeasible one.
+
+        Every penalty method leaves a feasible fitness equal to its objective, so feasible individuals
+        compare by objective. Penalized fitness is not compared; it depends on the generation.
 
-    def create_next_population(self) -> Population:
-        """Perform selection, crossover, and mutation on the population.
+        Args:
+            fitness_scores (np.ndarray of float64): The fitness scores of the population.
+            violation (np.ndarray of float64): The total violation of each individual. Zero where feasible.
+
+        Returns:
+            int: The index of the individual.
+        """
+        feasible = np.flatnonzero(violation == 0)
+        if len(feasible) == 0:
+            return int(np.argmin(violation))
+        if self.maximize:
+            return int(feasible[np.argmax(fitness_scores[feasible])])
+        return int(feasible[np.argmin(fitness_scores[feasible])])
+
+    def _improves(self, fitness_score:np.float64, violation:np.float64) -> bool:
+        """Whether an individual beats the best-of-run: feasible beats infeasible,
+        then the better objective if both are feasible, the lesser violation if neither is.
+
+        Args:
+            fitness_score (np.float64): The fitness score of the individual.
+            violation (np.float64): The total violation of the individual.
 
         Returns:
-            Population: The proposed next generation of the population.
+            bool: True if the individual should replace the best-of-run.
         """
-        return Population(self.bitwise_gene_mutation(
-                            self.crossover_method(
-                                self.selection_mechanism())))
+        if self.best_of_run_record is None:
+            return True
+        best_violation = self._best_of_run_violation()
+        if (violation == 0) != (best_violation == 0):
+            return violation == 0
+        if violation > 0:
+            return violation < best_violation
+        if self.maximize:
+            return fitness_score > self.best_of_run_record.fitness_score
+        return fitness_score < self.best_of_run_record.fitness_score
+
+    def _best_of_run_violation(self) -> np.float64:
+        """The total violation of the best-of-run. Zero if it is feasible."""
+        return self.penalty_instance.violation(np.atleast_1d(self.best_of_run_record.fitness_cost)[np.newaxis])[0]
+
+    def _track_target(self) -> None:
+        """Record the first generation the best-of-run reaches target_fitness. Only feasible solutions count."""
+        best = self.best_of_run_record.fitness_score
+        if not self.best_of_run_is_feasible:
+            return
+        if best >= self.target_fitness if self.maximize else best <= self.target_fitness:
+            seconds = 0.0 if self._started is None else time.perf_counter() - self._started
+            self.target_hit = TargetHit(self.t, self.evaluations, seconds)
+
+    def create_next_population(self) -> Population | PopulationMatrix:
+        """Perform selection, crossover, and mutation on the population.
 
-    def selection_mechanism(self) -> list[Chromosome]:
+        Returns:
+            Population or PopulationMatrix: The proposed next generation of the population.
+        """
+        if self.use_matrix:
+            selected = self.selection_mechanism()
+            if self.delta_evaluation:
+                # row j of the offspring descends from row j of the selected; evaluate it from there
+                self._parents = selected
+            return self.repair_method(
+                    self.bitwise_gene_mutation(
+                        self.crossover_method(selected)))
+        return Population(self.repair_method(
+                            self.bitwise_gene_mutation(
+                                self.crossover_method(
+                                    self.selection_mechanism()))))
+
+    def selection_mechanism(self) -> list[Chromosome] | PopulationMatrix:
         """Perform selection on the population.
 
         Returns:
-            list of Chromosome: A new population after a round of selection.
+            list of Chromosome or PopulationMatrix: A new population after a round of selection.
         """
         assert self.population.is_evaluated
         # print('selecting')
         try:
+            if self.use_matrix:
+                population_fitnesses = self.population.fitness_scores
+            else:
+                population_fitnesses = tuple(c.fitness_score for c in self.population.members)
             mechanism : SelectionMechanism = self.Select_Mechanism(
                 self.random,
-                tuple(c.fitness_score for c in self.population.members),
+                population_fitnesses,
                 self.population.sum_of_fitnesses,
                 self.maximize,
                 **self.selection_parameters
@@ -167,49 +437,63 @@ class GA:
         except NotImplementedError:
             print('Provided SelectionMechanism not supported.')
             sys.exit(1)
-        return [copy.deepcopy(self.population.members[i]) for i in mechanism.next_population()]
+        if self.use_matrix:
+            return self.population.gather(mechanism.next_population())
+        return [self.population.members[i].clone() for i in mechanism.next_population()]
 
-    def crossover_method(self, population:list[Chromosome]) -> list[Chromosome]:
+    def crossover_method(self, population:list[Chromosome] | PopulationMatrix) -> list[Chromosome] | PopulationMatrix:
         """Perform on the population using self.p_c as probability of occurrence.
 
         Args:
-            population (list of Chromosome): The population to act upon.
+            population (list of Chromosome or PopulationMatrix): The population to act upon.
 
         Returns:
-            list of Chromosome: A new population after a round of crossover.
+            list of Chromosome or PopulationMatrix: A new population after a round of crossover.
         """
         try:
+            if self.use_matrix:
+                return population.crossover(self.crossover_instance)
             return self.crossover_instance.crossover(population)
         except NotImplementedError:
             print('Provided CrossoverMethod not supported.')
             sys.exit(1)
 
-    def bitwise_gene_mutation(self, population:list[Chromosome]) -> list[Chromosome]:
+    def bitwise_gene_mutation(self, population:list[Chromosome] | PopulationMatrix) -> list[Chromosome] | PopulationMatrix:
         """Perform gene-wise mutation on the population using self.p_m as probability of occurrence.
 
         Args:
-            population (list of Chromosome): The population to act upon.
+            population (list of Chromosome or PopulationMatrix): The population to act upon.
 
         Returns:
-            list of Chromosome: A new population after a round of gene-wise mutation.
+            list of Chromosome or PopulationMatrix: A new population after a round of gene-wise mutation.
         """
         # print('mutating')
-        next_gen = []
-        randomness = self.random.uniform(0, 1, size=self.bitstring_length*self.pop_size)
-        for j, c in enumerate(population):
-            bitstring = c.bitstring
-            mutated = False
-            offset = j * self.bitstring_length
-            for i, a in enumerate(bitstring):
-                if randomness[offset + i] < self.p_m:
-                    # mutation
-                    # print('mutating', i)
-                    bitstring[i] = np.abs(a - 1)
-                    mutated = True
-            if mutated:
-                c.bitstring = bitstring
-            next_gen.append(c)
-        return next_gen
+        try:
+            if self.use_matrix:
+                return self.mutation_instance.mutate_matrix(population)
+            return self.mutation_instance.mutate(population)
+        except NotImplementedError:
+            print('Provided MutationMethod not supported.')
+            sys.exit(1)
+
+    def repair_method(self, population:list[Chromosome] | PopulationMatrix) -> list[Chromosome] | PopulationMatrix:
+        """Repair the individuals not yet evaluated, if a repair method is configured.
+
+        Args:
+            population (list of Chromosome or PopulationMatrix): The population to act upon.
+
+        Returns:
+            list of Chromosome or PopulationMatrix: The same population, repaired.
+        """
+        if self.repair_instance is None:
+            return population
+        try:
+            if self.use_matrix:
+                return self.repair_instance.repair_matrix(population)
+            return self.repair_instance.repair(population)
+        except NotImplementedError:
+            print('Provided RepairMethod not supported.')
+            sys.exit(1)
 
     def initialize_population(self) -> None:
         """Initialize a population for the GA within configured parameters.
@@ -218,26 +502,117 @@ class GA:
         """
         if self.population is not None:
             raise RuntimeError('Population already initialized')
-        self.population = Population(
-            tuple(
-                Chromosome(self.random, self.problem_instance.dims)
-                for _ in np.arange(self.pop_size)
+        if self.packed:
+            self.population = self.repair_method(
+                PackedPopulationMatrix.random(self.random, self.pop_size, self.problem_instance.dims)
             )
+            return
+        if self.use_matrix:
+            self.population = self.repair_method(
+                PopulationMatrix.random(self.random, self.pop_size, self.problem_instance.dims)
+            )
+            return
+        # one draw for the whole population, as the matrix modes make, so every mode starts from the same individuals
+        initial = PopulationMatrix.random(self.random, self.pop_size, self.problem_instance.dims)
+        self.population = Population(self.repair_method(
+            tuple(initial.chromosome(j) for j in range(self.pop_size))
+        ))
+
+    def _profiled(self, stage:str, method):
+        """Wrap a stage so every call reports its wall-time and evaluations to the profiler.
+
+        Args:
+            stage (str): The GA method. One of STAGES.
+            method (callable): The bound method.
+
+        Returns:
+            callable: The timed method.
+        """
+        profiler = self.profiler
+        def timed(*args, **kwargs):
+            evaluations = self.evaluations
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profiler.on_stage(stage, time.perf_counter() - start, self.evaluations - evaluations)
+        return timed
+
+    def checkpoint(self, path:str=None) -> None:
+        """Save the state of the run between generations: the population, t, the best-of-run, any target hit,
+        the telemetry record count and the random state. Buffered telemetry is flushed first.
+
+        Args:
+            path (str, optional): The checkpoint file. Defaults to checkpoint_path.
+        """
+        path = self.checkpoint_path if path is None else path
+        assert path is not None and self.population is not None and self.population.is_evaluated
+        if self.telemetry is not None:
+            # every record up to this generation is on disk before the checkpoint refers to it
+            self.telemetry.flush()
+        write_checkpoint(
+            path,
+            population_arrays(self.population),
+            {
+                'options': self._options,
+                't': self.t,
+                'evaluations': self.evaluations,
+                'best_of_run': self.best_of_run_record,
+                'target_hit': self.target_hit,
+                'telemetry_count': None if self.telemetry is None else self.telemetry.count,
+                'bit_generator': self.random.bit_generator.state
+            }
         )
+        self._last_checkpoint = time.monotonic()
+
+    @classmethod
+    def resume(cls, path:str, **overrides) -> 'GA':
+        """Rebuild a GA from a checkpoint. Simulating it continues exactly where the checkpoint left off.
 
-    def seed_random(self, given_seed:int=None) -> None:
+        Only resume checkpoints you trust; the options are pickled.
+
+        Args:
+            path (str): The checkpoint file.
+            overrides: GA arguments replacing those saved, e.g., profiler, telemetry or evaluation_workers.
+                Arguments which change the search, e.g., pop_size, break the continuation.
+
+        Returns:
+            GA: The GA at the checkpointed generation.
+        """
+        arrays, state = read_checkpoint(path)
+        ga = cls(**{**state['options'], **overrides})
+        ga.random.bit_generator.state = state['bit_generator']
+        ga.t = state['t']
+        ga.evaluations = state['evaluations']
+        ga.best_of_run_record = state['best_of_run']
+        # checkpoints from before target tracking have none
+        ga.target_hit = state.get('target_hit')
+        if ga.telemetry is not None and state.get('telemetry_count') is not None:
+            # records written after the checkpoint are written again as the run continues
+            ga.telemetry.truncate(state['telemetry_count'])
+        ga.population = restore_population(arrays, ga.problem_instance.dims, ga.use_matrix, ga.packed)
+        if not ga.use_matrix:
+            # every member carries its fitness; this only marks the population evaluated
+            ga.population.evaluate(ga.problem_instance)
+        return ga
+
+    def seed_random(self, given_seed:int | np.random.SeedSequence=None) -> None:
         """
         Initialize the random seed using a made-up via hand-waving function.
         
         This can only happen when there is no current random generator.
 
         Args:
-            given_seed (int, optional): Seed for random number generator
+            given_seed (int or np.random.SeedSequence, optional): Seed for random number generator
         """
         if self.random is not None:
             raise RuntimeError('Random already seeded')
         seed = None
-        if given_seed is not None:
+        if type(given_seed) is np.random.SeedSequence:
+            # e.g., one of SeedSequence.spawn() for independent runs
+            seed = f'{given_seed.entropy}:{given_seed.spawn_key}'
+            self.random = np.random.default_rng(given_seed)
+        elif given_seed is not None:
             seed = int(given_seed)
             self.random = np.random.default_rng(seed)
         else:
@@ -251,33 +626,69 @@ class GA:
         print(f'----------- Gen. {self.t} ---------------')
         print(f'High  Fitness: {self.population.high_score}\n')
         print(f'Low   Fitness: {self.population.low_score}\n')
-        print(f'Avg   Fitness: {self.population.average_fitness}\n')
+        stats = self.population.statistics(diversity=True)
+        print(f'Avg   Fitness: {stats.average_fitness} (std. {stats.std_fitness})\n')
+        print(f'Mean Hamming Distance: {stats.mean_hamming_distance}\n')
         print(f'Best-of-Run  : {self.best_of_run} at t={self.best_of_run_generation}')
+        if type(self.problem_instance) is CachedProblem:
+            print(f'Fitness Cache: {self.problem_instance.cache_info()}')
 
     @property
     def best_of_run(self) -> Chromosome:
-        return self._best_of_run[0]
+        """Created on demand from best_of_run_record."""
+        if self.best_of_run_record is None:
+            return None
+        return self.best_of_run_record.chromosome()
+
+    @property
+    def best_of_run_is_feasible(self) -> bool:
+        """Whether the best-of-run satisfies every constraint. If so, its fitness score is its objective.
+
+        The best-of-run is only infeasible if no feasible individual has been found.
+        """
+        if self.best_of_run_record is None:
+            return False
+        return self._best_of_run_violation() == 0
 
     @property
     def best_of_run_generation(self) -> int:
-        return self._best_of_run[1]
+        if self.best_of_run_record is None:
+            return None
+        return self.best_of_run_record.generation
 
     @best_of_run.setter
     def best_of_run(self, value:Chromosome) -> None:
         assert value is None or type(value) is Chromosome
-        self._best_of_run = value, self.t
+        if value is None:
+            self.best_of_run_record = None
+            return
+        self.best_of_run_record = BestOfRun.from_bitstring(
+            value.bitstring,
+            value.fitness_score,
+            value.fitness_cost,
+            self.t
+        )
+
+    @property
+    def best_of_run_record(self) -> BestOfRun:
+        return self._best_of_run_record
+
+    @best_of_run_record.setter
+    def best_of_run_record(self, value:BestOfRun) -> None:
+        assert value is None or type(value) is BestOfRun
+        self._best_of_run_record = value
 
     @property
-    def population(self) -> Population:
+    def population(self) -> Population | PopulationMatrix:
         return self._population
 
     @population.setter
-    def population(self, value:Population) -> None:
-        assert (value is None and self.pop_size is not None) or len(value.members) == self.pop_size
+    def population(self, value:Population | PopulationMatrix) -> None:
+        assert (value is None and self.pop_size is not None) or len(value) == self.pop_size
         self._population = value
 
     @property
-    def bitstring_length(self) -> np.uint8:
+    def bitstring_length(self) -> int:
         """L"""
         if self._bitstring_length is not None:
             return self._bitstring_length
@@ -0,0 +1,30 @@
+# ahester57
+
+import numpy as np
+
+from typing import NamedTuple
+
+from binary_knapsack.best_of_run import BestOfRun
+
+
+class GenerationSnapshot(NamedTuple):
+    """A lightweight report of the run after one generation.
+
+    Attributes:
+        generation (int): The generation reported.
+        best_of_run (BestOfRun): The best individual found so far.
+        high_fitness (np.float64): The highest fitness score of the generation.
+        low_fitness (np.float64): The lowest fitness score of the generation.
+        average_fitness (np.float64): The average fitness score of the generation.
+        std_fitness (np.float64): The standard deviation of the fitness scores of the generation.
+        mean_hamming_distance (np.float64): The mean pairwise Hamming distance. None if diversity was not requested.
+        allele_frequencies (np.ndarray of float64): Per locus, the fraction of 1s. None if diversity was not requested.
+    """
+    generation: int
+    best_of_run: BestOfRun
+    high_fitness: np.float64
+    low_fitness: np.float64
+    average_fitness: np.float64
+    std_fitness: np.float64 = None
+    mean_hamming_distance: np.float64 = None
+    allele_frequencies: np.ndarray = None
@@ -0,0 +1,224 @@
+# ahester57
+
+import asyncio
+import inspect
+import multiprocessing
+import numpy as np
+import queue
+
+from binary_knapsack import bitpacking
+from binary_knapsack.ga import GA
+from binary_knapsack.runner import RunResult
+
+
+TOPOLOGIES = ('ring', 'fully_connected')
+
+
+def _emigrants(ga:GA, num_migrants:int) -> np.ndarray[np.signedinteger]:
+    """The rows of the fittest individuals, best first.
+
+    Args:
+        ga (GA): The island.
+        num_migrants (int): The number of individuals to send.
+
+    Returns:
+        np.ndarray of int: The chosen rows.
+    """
+    order = np.argsort(ga.population.fitness_scores, kind='stable')
+    if ga.maximize:
+        order = order[::-1]
+    return order[:num_migrants]
+
+
+def _immigrate(ga:GA, packed:np.ndarray[np.uint8]) -> None:
+    """Replace the least fit individuals with the given packed immigrants, then evaluate them.
+
+    Args:
+        ga (GA): The island.
+        packed (np.ndarray of uint8): The packed immigrants.
+    """
+    assert len(packed) < len(ga.population)
+    order = np.argsort(ga.population.fitness_scores, kind='stable')
+    if not ga.maximize:
+        order = order[::-1]
+    ga.population.assign_packed(order[:len(packed)], packed)
+    ga.evaluate_population()
+
+
+def _run_island(
+    island:int,
+    options:dict,
+    seed:np.random.SeedSequence,
+    inbox:multiprocessing.Queue,
+    neighbors:list[multiprocessing.Queue],
+    num_sources:int,
+    migration_interval:int,
+    num_migrants:int,
+    results:multiprocessing.Queue
+) -> None:
+    """Evolve one island in its own process, exchanging migrants in step with the other islands.
+
+    Migrants travel as raw packed bytes: (source island, generation, bytes).
+
+    Args:
+        island (int): The index of this island.
+        options (dict): Keyword arguments for this island's GA, excluding rand_seed.
+        seed (np.random.SeedSequence): This island's seed.
+        inbox (multiprocessing.Queue): Where the other islands send migrants to this island.
+        neighbors (list of multiprocessing.Queue): The inboxes this island sends migrants to.
+        num_sources (int): The number of islands sending migrants to this island.
+        migration_interval (int): Generations between migrations.
+        num_migrants (int): The number of individuals sent to each neighbor.
+        results (multiprocessing.Queue): Where this island reports its best-of-run.
+    """
+    ga = GA(**options, rand_seed=seed)
+    width = bitpacking.packed_width(ga.bitstring_length)
+    arrived = {}
+
+    async def evolve():
+        # the GA's own loop, paused at every migration
+        async for snapshot in ga.generations(migration_interval):
+            t = snapshot.generation
+            if t == 0 or t % migration_interval != 0 or t == ga.t_max or num_sources == 0:
+                continue
+            emigrants = ga.population.packed_rows(_emigrants(ga, num_migrants)).tobytes()
+            for neighbor in neighbors:
+                neighbor.put((island, t, emigrants))
+            # a faster source may already have sent its next migration
+            while len(arrived.get(t, ())) < num_sources:
+                source, generation, immigrants = inbox.get()
+                arrived.setdefault(generation, []).append((source, immigrants))
+            immigrants = b''.join(m for _, m in sorted(arrived.pop(t)))
+            _immigrate(ga, np.frombuffer(immigrants, dtype=np.uint8).reshape(-1, width))
+
+    asyncio.run(evolve())
+    results.put((island, ga.best_of_run_record))
+
+
+class IslandModel:
+    """Evolves several GA islands in separate processes, exchanging the fittest individuals periodically.
+
+    Island i is always seeded with the i-th child of SeedSequence(entropy), and migrants are
+    merged in order of source island, so results are reproducible.
+
+    Attributes:
+        island_options (list of dict): Keyword arguments for each island's GA, excluding rand_seed.
+        migration_interval (int): Generations between migrations.
+        num_migrants (int): The number of individuals each island sends to each neighbor.
+        topology (str): 'ring' or 'fully_connected'.
+        entropy (int): Entropy of the root SeedSequence.
+    """
+    def __init__(self,
+        island_options:list[dict],
+        migration_interval:int=10,
+        num_migrants:int=2,
+        topology:str='ring',
+        entropy:int=None
+    ) -> None:
+        """Initialize an island model.
+
+        Every island must share the problem instance, t_max and maximize, but may use its own
+        Select_Mechanism, Crossover_Method, etc. Islands always use a population matrix, and run to t_max
+        even if their population converges, as migration restores diversity and every island must reach each migration.
+
+        Args:
+            island_options (list of dict): Keyword arguments for each island's GA, excluding rand_seed.
+            migration_interval (int, optional): Generations between migrations. Default 10.
+            num_migrants (int, optional): The number of individuals each island sends to each neighbor. Default 2.
+            topology (str, optional): 'ring' or 'fully_connected'. Default 'ring'.
+            entropy (int, optional): Entropy of the root SeedSequence. Drawn from the OS if not given.
+
+        Raises:
+            ValueError: If an island would receive as many immigrants per migration as its population holds.
+        """
+        assert len(island_options) > 0
+        assert all(type(o) is dict and 'rand_seed' not in o for o in island_options)
+        assert all(o.get('problem_instance') is island_options[0].get('problem_instance') for o in island_options)
+        assert len({(o.get('t_max'), o.get('maximize')) for o in island_options}) == 1
+        assert migration_interval > 0 and num_migrants > 0
+        assert topology in TOPOLOGIES
+        self.island_options = [{**o, 'use_matrix': True, 'stop_on_convergence': False} for o in island_options]
+        self.migration_interval = int(migration_interval)
+        self.num_migrants = int(num_migrants)
+        self.topology = topology
+        default_pop_size = inspect.signature(GA).parameters['pop_size'].default
+        for i, o in enumerate(self.island_options):
+            immigrants = self.num_migrants * len(self.sources(i))
+            pop_size = o.get('pop_size', default_pop_size)
+            if immigrants >= pop_size:
+                raise ValueError(
+                    f'island {i} would receive {immigrants} immigrants per migration, '
+                    f'but its population holds only {pop_size}'
+                )
+        root = np.random.SeedSequence(entropy)
+        self.entropy = root.entropy
+        self._seeds = root.spawn(len(self.island_options))
+
+    def neighbors(self, island:int) -> list[int]:
+        """The islands the given island sends migrants to.
+
+        Args:
+            island (int): The index of the island.
+
+        Returns:
+            list of int: The receiving islands.
+        """
+        k = len(self.island_options)
+        if k == 1:
+            return []
+        if self.topology == 'ring':
+            return [(island + 1) % k]
+        return [j for j in range(k) if j != island]
+
+    def sources(self, island:int) -> list[int]:
+        """The islands the given island receives migrants from.
+
+        Args:
+            island (int): The index of the island.
+
+        Returns:
+            list of int: The sending islands.
+        """
+        return [j for j in range(len(self.island_options)) if island in self.neighbors(j)]
+
+    def run(self) -> list[RunResult]:
+        """Evolve every island to t_max.
+
+        Returns:
+            list of RunResult: The best-of-run of every island. In order of island.
+        """
+        k = len(self.island_options)
+        inboxes = [multiprocessing.Queue() for _ in range(k)]
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=_run_island, args=(
+                i,
+                self.island_options[i],
+                self._seeds[i],
+                inboxes[i],
+                [inboxes[j] for j in self.neighbors(i)],
+                len(self.sources(i)),
+                self.migration_interval,
+                self.num_migrants,
+                results
+            ))
+            for i in range(k)
+        ]
+        for p in processes:
+            p.start()
+        records = {}
+        try:
+            while len(records) < k:
+                try:
+                    island, record = results.get(timeout=1.0)
+                    records[island] = record
+                except queue.Empty:
+                    # a dead island would leave its neighbors waiting on migrants forever
+                    if any(p.exitcode not in (None, 0) for p in processes):
+                        raise RuntimeError('An island terminated unexpectedly')
+        finally:
+            for p in processes:
+                if p.is_alive() and len(records) < k:
+                    p.terminate()
+                p.join()
+        return [RunResult(records[i].chromosome(), records[i].generation, i) for i in range(k)]
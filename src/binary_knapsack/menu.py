@@ -7,17 +7,26 @@ import random
 import time
 
 from binary_knapsack.ga import GA
+from binary_knapsack.mutation_method.bitwise import BitwiseMutation
+from binary_knapsack.mutation_method.method import MutationMethod
+from binary_knapsack.mutation_method.sparse import SparseBitwiseMutation
 from binary_knapsack.penalty_method.absolute import AbsolutePenalty
 from binary_knapsack.penalty_method.dynamic import DynamicPenalty
 from binary_knapsack.penalty_method.logarithmic import LogarithmicPenalty
 from binary_knapsack.penalty_method.method import PenaltyMethod
+from binary_knapsack.profiling import StageProfiler
+from binary_knapsack.repair_method.greedy import GreedyRepair
+from binary_knapsack.repair_method.method import RepairMethod
+from binary_knapsack.runner import MultiRunExecutor
 from binary_knapsack.selection_mechanism.mechanism import SelectionMechanism
-from binary_knapsack.selection_mechanism.proportional import Proportional
+from binary_knapsack.selection_mechanism.proportional import Proportional, StochasticUniversal
 from binary_knapsack.selection_mechanism.ranking import LinearRanking
 from binary_knapsack.selection_mechanism.tournament import DeterministicTournament, StochasticTournament
 from binary_knapsack.selection_mechanism.truncation import Truncation
 from binary_knapsack.test_problem.knapsack import BinaryKnapsack
+from binary_knapsack.test_problem.multidimensional_knapsack import MultiDimensionalKnapsack
 from binary_knapsack.test_problem.problem import TestProblem
+from binary_knapsack.test_problem.solver import quality_summary, solve
 from binary_knapsack.crossover_method.method import CrossoverMethod
 from binary_knapsack.crossover_method.majority_voting import MajorityVoting
 from binary_knapsack.crossover_method.p_uniform import PUniform
@@ -41,11 +50,13 @@ class GAMenu(object):
         Problems To Solve
 =================================
     1 - Binary Knapsack
+    2 - Multidimensional Knapsack
 =================================
 ''')
         options = [
             None,
-            BinaryKnapsack
+            BinaryKnapsack,
+            MultiDimensionalKnapsack
         ]
         ans = -1
         while ans not in range(1, len(options)):
@@ -111,6 +122,7 @@ class GAMenu(object):
     3 - Tournament (Deterministic)
     4 - Tournament (Stochastic)
     5 - Linear Ranking
+    6 - Stochastic Universal Sampling
 =================================
 ''')
         options = [
@@ -119,7 +131,8 @@ class GAMenu(object):
             Truncation,
             DeterministicTournament,
             StochasticTournament,
-            LinearRanking
+            LinearRanking,
+            StochasticUniversal
         ]
         ans = -1
         while ans not in range(1, len(options)):
@@ -170,6 +183,71 @@ class GAMenu(object):
                 crossover_parameters.update({k: self.prompt_int(v[0], v[1])})
         return Crossover_Method, crossover_parameters
 
+    def mutation_method_menu(self) -> MutationMethod:
+        """Menu for mutation methods.
+
+        Returns:
+            tuple[MutationMethod, dict]: (The chosen mutation method, Its parameters)
+        """
+        print('''
+=================================
+        Mutation Methods
+=================================
+    1 - Bitwise (Dense)
+    2 - Bitwise (Sparse, for low p_m)
+=================================
+''')
+        options = [
+            None,
+            BitwiseMutation,
+            SparseBitwiseMutation
+        ]
+        ans = -1
+        while ans not in range(1, len(options)):
+            ans = self.prompt_int('Which Mutation Method?', 1)
+        Mutation_Method : MutationMethod = options[ans]
+        mutation_parameters = {}
+        for k, v in Mutation_Method.parameters().items():
+            dtype = type(v[1])
+            assert(dtype in (float, int))
+            if dtype is float:
+                mutation_parameters.update({k: self.prompt_float(v[0], v[1])})
+            elif dtype is int:
+                mutation_parameters.update({k: self.prompt_int(v[0], v[1])})
+        return Mutation_Method, mutation_parameters
+
+    def repair_method_menu(self) -> RepairMethod:
+        """Menu for repair methods.
+
+        Returns:
+            tuple[RepairMethod, dict]: (The chosen repair method or None, Its parameters)
+        """
+        print('''
+=================================
+        Repair Methods
+=================================
+    1 - None (Penalize Only)
+    2 - Greedy by Profit/Weight Ratio
+=================================
+''')
+        options = [
+            None,
+            None,
+            GreedyRepair
+        ]
+        ans = -1
+        while ans not in range(1, len(options)):
+            ans = self.prompt_int('Which Repair Method?', 1)
+        Repair_Method : RepairMethod = options[ans]
+        repair_parameters = {}
+        if Repair_Method is None:
+            return Repair_Method, repair_parameters
+        for k, v in Repair_Method.parameters().items():
+            dtype = type(v[1])
+            assert(dtype in (bool,))
+            repair_parameters.update({k: self.prompt_bool(v[0], v[1])})
+        return Repair_Method, repair_parameters
+
     def input_display(self, name:str, default=None) -> str:
         """Generate the string to be displayed in an prompt.
 
@@ -263,35 +341,56 @@ class GAMenu(object):
                     selection_parameters = self.selection_mechanism_menu()
                 Crossover_Method, \
                     crossover_parameters = self.crossover_method_menu()
+                Mutation_Method, \
+                    mutation_parameters = self.mutation_method_menu()
+                Repair_Method, \
+                    repair_parameters = self.repair_method_menu()
                 options = {
                     'pop_size': self.prompt_int('Population Size', 30),
                     'p_m': self.prompt_float('Probability of Mutation', 0.05),
                     't_max': self.prompt_int('Max Generations', 50),
                     'maximize': self.prompt_bool('Maximize', True),
+                    'use_matrix': self.prompt_bool('Use Population Matrix?', True),
+                    'packed': self.prompt_bool('Bit-Pack Population?', False),
+                    'evaluation_workers': self.prompt_int('Evaluation Worker Processes (0 for none)', 0),
+                    'fitness_cache_size': self.prompt_int('Fitness Cache Size (0 for none)', 0),
+                    'delta_evaluation': self.prompt_bool('Delta Evaluation?', False),
                     'Select_Mechanism': Select_Mechanism,
                     'selection_parameters': selection_parameters,
                     'problem_instance': problem_instance,
                     'Crossover_Method': Crossover_Method,
                     'crossover_parameters': crossover_parameters,
                     'Penalty_Method': Penalty_Method,
-                    'penalty_parameters': penalty_parameters
+                    'penalty_parameters': penalty_parameters,
+                    'Mutation_Method': Mutation_Method,
+                    'mutation_parameters': mutation_parameters,
+                    'Repair_Method': Repair_Method,
+                    'repair_parameters': repair_parameters
                 }
                 if self.prompt_bool('Single run?', False):
+                    profiler = StageProfiler() if self.prompt_bool('Profile Stages?', False) else None
                     await GA(
                         **options,
-                        rand_seed=self.prompt_int('Random Seed', random.randint(1, 123456789))
+                        rand_seed=self.prompt_int('Random Seed', random.randint(1, 123456789)),
+                        profiler=profiler
                     ).simulate()
+                    if profiler is not None:
+                        print(profiler.report())
                 elif self.prompt_bool('Collect stats?', True):
                     num_runs = self.prompt_int('Number of Runs', 30)
-                    best_of_runs = await asyncio.gather(*[GA(
-                        **options,
-                        rand_seed=random.randint(1, 123456789)).simulate()
-                        for r in range(num_runs)
-                    ])
-                    print(best_of_runs)
+                    reference = None
+                    if options['maximize'] and self.prompt_bool('Compare to Reference Solver?', True):
+                        target_quality = self.prompt_float('Target Fraction of Optimum', 0.99)
+                        reference = solve(problem_instance)
+                        options['target_fitness'] = target_quality * reference.profit
+                    executor = MultiRunExecutor(options, num_runs, entropy=random.randint(1, 123456789))
+                    best_of_runs = []
+                    for result in executor.results():
+                        print(f'Run {result.run_index} finished: {result.best_of_run} at t={result.generation}')
+                        best_of_runs.append(result)
                     print(problem_instance)
                     best_of_runs.sort(key=lambda x:x[0].fitness_score, reverse=options['maximize'])
-                    options.update({'problem_parameters': problem_parameters})
+                    options.update({'problem_parameters': problem_parameters, 'entropy': executor.entropy})
                     print(f'\nOptions: {json.dumps(options, sort_keys=True, indent=2, default=str)}')
                     print(f'\nStats over {num_runs} runs:')
                     fitness_scores = [bor[0].fitness_score for bor in best_of_runs]
@@ -301,6 +400,22 @@ class GAMenu(object):
                     print(f'Standard Deviation of Best Fitness: {np.std(fitness_scores)}')
                     print(f'Mean Generation Best Was Acheived: {np.mean(generations)}')
                     print(f'Standard Deviation of Generations: {np.std(generations)}')
+                    if reference is not None:
+                        quality = quality_summary(
+                            reference,
+                            problem_instance,
+                            np.stack([bor.best_of_run.bitstring for bor in best_of_runs]),
+                            [bor.target_hit for bor in best_of_runs],
+                            target_quality
+                        )
+                        print(f'Reference Optimum: {quality["optimum"]} ({quality["solver"]}, '
+                            f'{"proven" if quality["proven_optimal"] else "bounded by " + str(quality["upper_bound"])})')
+                        print(f'Runs Without a Feasible Solution: {quality["infeasible_runs"]}')
+                        print(f'Mean Optimality Gap of Feasible Runs: {quality["mean_gap"]}')
+                        print(f'Standard Deviation of Optimality Gap: {quality["std_gap"]}')
+                        print(f'Runs Reaching {target_quality} of Optimum: {quality["target_hits"]}')
+                        print(f'Mean Generation Target Was Reached: {quality["mean_target_generation"]}')
+                        print(f'Mean Seconds to Target: {quality["mean_target_seconds"]}')
             except AssertionError as ae:
                 raise ae
             except Exception as e:
@@ -0,0 +1,71 @@
+# ahester57
+
+import numpy as np
+
+from binary_knapsack.chromosome import Chromosome
+from binary_knapsack.mutation_method.method import MutationMethod
+from binary_knapsack.population_matrix import PopulationMatrix
+
+
+class BitwiseMutation(MutationMethod):
+    """Facilitates dense bitwise mutation. Every allele flips independently with probability p_m.
+
+    One uniform draw per allele builds a boolean mask which is XOR-ed over the whole generation.
+
+    Attributes:
+        random (np.random.Generator): The random number generator.
+        p_m (float): Probability of mutation, per allele. In range [0, 1].
+    """
+    def __init__(self,
+        random:np.random.Generator,
+        p_m:float
+    ) -> None:
+        """Initialize the parameters for dense bitwise mutation.
+
+        Args:
+            random (np.random.Generator): The random number generator.
+            p_m (float): Probability of mutation, per allele. In range [0, 1].
+        """
+        super().__init__(random, p_m)
+
+    def mutate(self, population:list[Chromosome]) -> list[Chromosome]:
+        """Perform dense bitwise mutation on the population using self.p_m as probability of occurrence.
+
+        Args:
+            population (list of Chromosome): The population to act upon.
+
+        Returns:
+            list of Chromosome: A new population after a round of dense bitwise mutation.
+        """
+        mutations = self._generate_mask(len(population), population[0].num_items)
+        for j in np.flatnonzero(mutations.any(axis=1)):
+            population[j].bitstring = population[j].bitstring ^ mutations[j]
+        return population
+
+    def mutate_matrix(self, population:PopulationMatrix) -> PopulationMatrix:
+        """Perform dense bitwise mutation in place on a population matrix using self.p_m as probability of occurrence.
+
+        Args:
+            population (PopulationMatrix): The population to act upon.
+
+        Returns:
+            PopulationMatrix: The same population after a round of dense bitwise mutation.
+        """
+        population.mutate(self._generate_mask(len(population), population.dims))
+        return population
+
+    def _generate_mask(self, pop_size:int, num_items:int) -> np.ndarray[np.bool_]:
+        """Generate the mutation mask for one generation.
+
+        Args:
+            pop_size (int): Population size.
+            num_items (int): The number of items to choose from.
+
+        Returns:
+            np.ndarray of bool: (pop_size x num_items) mask. True where an allele mutates.
+        """
+        return self.random.uniform(0, 1, size=(pop_size, num_items)) < self.p_m
+
+    @staticmethod
+    def parameters() -> dict[str, tuple]:
+        return {}
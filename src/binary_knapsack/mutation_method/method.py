@@ -0,0 +1,56 @@
+# ahester57
+
+import numpy as np
+
+from binary_knapsack.chromosome import Chromosome
+from binary_knapsack.population_matrix import PopulationMatrix
+
+
+class MutationMethod:
+    """Represents a generic mutation method. Does not function as one. Only provides base.
+
+    Attributes:
+        random (np.random.Generator): The random number generator.
+        p_m (float): Probability of mutation, per allele. In range [0, 1].
+    """
+    def __init__(self,
+        random:np.random.Generator,
+        p_m:float=0.05
+    ) -> None:
+        """Initialize the parameters for mutation.
+
+        Args:
+            random (np.random.Generator): The random number generator.
+            p_m (float, optional): Probability of mutation, per allele. In range [0, 1]. Defaults to 0.05.
+        """
+        assert type(random) is np.random.Generator
+        assert p_m >= 0 and p_m <= 1
+        self.random = random
+        self.p_m = p_m
+
+    def mutate(self, population:list[Chromosome]) -> list[Chromosome]:
+        """Perform gene-wise mutation on the population using self.p_m as probability of occurrence.
+
+        Args:
+            population (list of Chromosome): The population to act upon.
+
+        Returns:
+            list of Chromosome: A new population after a round of gene-wise mutation.
+        """
+        raise NotImplementedError
+
+    def mutate_matrix(self, population:PopulationMatrix) -> PopulationMatrix:
+        """Perform gene-wise mutation in place on a population matrix using self.p_m as probability of occurrence.
+
+        Args:
+            population (PopulationMatrix): The population to act upon.
+
+        Returns:
+            PopulationMatrix: The same population after a round of gene-wise mutation.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def parameters() -> dict[str, tuple]:
+        """{'param_name': tuple('description', default_value)}"""
+        raise NotImplementedError
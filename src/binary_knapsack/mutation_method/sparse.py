@@ -0,0 +1,86 @@
+# ahester57
+
+import numpy as np
+
+from binary_knapsack.chromosome import Chromosome
+from binary_knapsack.mutation_method.method import MutationMethod
+from binary_knapsack.population_matrix import PopulationMatrix
+
+
+class SparseBitwiseMutation(MutationMethod):
+    """Facilitates sparse bitwise mutation. Every allele flips independently with probability p_m.
+
+    Rather than drawing once per allele, draws the geometric gaps between consecutive flips over the
+    flattened (pop_size x dims) population, so the work is proportional to the number of flips.
+    Best suited to low p_m.
+
+    Attributes:
+        random (np.random.Generator): The random number generator.
+        p_m (float): Probability of mutation, per allele. In range [0, 1].
+    """
+    def __init__(self,
+        random:np.random.Generator,
+        p_m:float
+    ) -> None:
+        """Initialize the parameters for sparse bitwise mutation.
+
+        Args:
+            random (np.random.Generator): The random number generator.
+            p_m (float): Probability of mutation, per allele. In range [0, 1].
+        """
+        super().__init__(random, p_m)
+
+    def mutate(self, population:list[Chromosome]) -> list[Chromosome]:
+        """Perform sparse bitwise mutation on the population using self.p_m as probability of occurrence.
+
+        Args:
+            population (list of Chromosome): The population to act upon.
+
+        Returns:
+            list of Chromosome: A new population after a round of sparse bitwise mutation.
+        """
+        rows, loci = self._sample_flips(len(population), population[0].num_items)
+        changed, starts = np.unique(rows, return_index=True)
+        for j, row_loci in zip(changed, np.split(loci, starts[1:])):
+            bitstring = population[j].bitstring.copy()
+            bitstring[row_loci] ^= 1
+            population[j].bitstring = bitstring
+        return population
+
+    def mutate_matrix(self, population:PopulationMatrix) -> PopulationMatrix:
+        """Perform sparse bitwise mutation in place on a population matrix using self.p_m as probability of occurrence.
+
+        Args:
+            population (PopulationMatrix): The population to act upon.
+
+        Returns:
+            PopulationMatrix: The same population after a round of sparse bitwise mutation.
+        """
+        population.flip(*self._sample_flips(len(population), population.dims))
+        return population
+
+    def _sample_flips(self, pop_size:int, num_items:int) -> tuple[np.ndarray]:
+        """Sample the loci which flip this generation.
+
+        Args:
+            pop_size (int): Population size.
+            num_items (int): The number of items to choose from.
+
+        Returns:
+            tuple of np.ndarray: (rows, loci) of each flip. Ordered by row, then locus. No duplicates.
+        """
+        total = pop_size * num_items
+        if self.p_m == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        expected = total * self.p_m
+        batch_size = int(expected + 4 * np.sqrt(expected) + 16)
+        # gaps between Bernoulli(p_m) successes are Geometric(p_m)
+        positions = np.cumsum(self.random.geometric(self.p_m, size=batch_size)) - 1
+        while positions[-1] < total:
+            more = np.cumsum(self.random.geometric(self.p_m, size=batch_size)) + positions[-1]
+            positions = np.concatenate((positions, more))
+        return np.divmod(positions[:np.searchsorted(positions, total)], num_items)
+
+    @staticmethod
+    def parameters() -> dict[str, tuple]:
+        return {}
@@ -0,0 +1,290 @@
+# ahester57
+
+import numpy as np
+
+from binary_knapsack import bitpacking
+from binary_knapsack.best_of_run import BestOfRun
+from binary_knapsack.chromosome import Chromosome
+from binary_knapsack.crossover_method.method import CrossoverMethod
+from binary_knapsack.population_matrix import DELTA_MAX_DEPTH, DELTA_MAX_FLIP_FRACTION, PopulationMatrix
+from binary_knapsack.test_problem.problem import TestProblem
+
+
+class PackedPopulationMatrix(PopulationMatrix):
+    """Depicts a population of chromosomes as one bit-packed (pop_size x packed_width) matrix.
+
+    Eight alleles share one byte, so the population takes 1/8th the memory of a PopulationMatrix.
+    Rows are padded to whole uint64 words so mutation and crossover are word-level XOR/mask operations.
+
+    Attributes:
+        packed (np.ndarray of uint8): The packed rows. See bitpacking.pack().
+        num_items (int): The number of items to choose from.
+        fitness_scores (np.ndarray of float64): The fitness scores. Aligned by row.
+        fitness_costs (np.ndarray of float64): The (pop_size,) or (pop_size x m) fitness costs. Aligned by row.
+        objective_scores (np.ndarray of float64): The fitness scores before penalization. Aligned by row.
+        delta_depths (np.ndarray of uint8): How many delta evaluations in a row led to each fitness. 0 if evaluated in full.
+    """
+    def __init__(self,
+        packed:np.ndarray[np.uint8],
+        num_items:int,
+        fitness_scores:np.ndarray[np.float64]=None,
+        fitness_costs:np.ndarray[np.float64]=None,
+        objective_scores:np.ndarray[np.float64]=None,
+        delta_depths:np.ndarray[np.uint8]=None
+    ) -> None:
+        """Initialize a packed population matrix.
+
+        Args:
+            packed (np.ndarray of uint8): The packed rows to be represented.
+            num_items (int): The number of items to choose from.
+            fitness_scores (np.ndarray of float64, optional): Known fitness scores. NaN if not evaluated.
+            fitness_costs (np.ndarray of float64, optional): Known fitness costs. NaN if not evaluated.
+            objective_scores (np.ndarray of float64, optional): Known scores before penalization. Defaults to fitness_scores.
+            delta_depths (np.ndarray of uint8, optional): Known delta evaluation depths. Defaults to 0.
+        """
+        assert packed is not None and type(packed) is np.ndarray
+        assert packed.ndim == 2 and packed.dtype == np.uint8
+        assert num_items > 0 and packed.shape[1] == bitpacking.packed_width(num_items)
+        self.packed = np.ascontiguousarray(packed)
+        self.num_items = int(num_items)
+        pop_size = len(self.packed)
+        if fitness_scores is None:
+            fitness_scores = np.full(pop_size, np.nan)
+        if fitness_costs is None:
+            fitness_costs = np.full(pop_size, np.nan)
+        if objective_scores is None:
+            objective_scores = np.array(fitness_scores, dtype=np.float64)
+        if delta_depths is None:
+            delta_depths = np.zeros(pop_size, dtype=np.uint8)
+        assert len(fitness_scores) == pop_size and len(fitness_costs) == pop_size and len(objective_scores) == pop_size
+        assert len(delta_depths) == pop_size
+        self.fitness_scores = np.asarray(fitness_scores, dtype=np.float64)
+        self.fitness_costs = np.asarray(fitness_costs, dtype=np.float64)
+        self.objective_scores = np.asarray(objective_scores, dtype=np.float64)
+        self.delta_depths = np.asarray(delta_depths, dtype=np.uint8)
+        self._clear_stats()
+
+    @classmethod
+    def random(cls, random:np.random.Generator, pop_size:int, dims:int) -> 'PackedPopulationMatrix':
+        """Initialize a uniformly random packed population matrix.
+
+        Draws the same alleles as PopulationMatrix.random() for the same random state.
+
+        Args:
+            random (np.random.Generator): The random number generator.
+            pop_size (int): Population size.
+            dims (int): The number of items to choose from.
+
+        Returns:
+            PackedPopulationMatrix: The randomly initialized population.
+        """
+        assert pop_size > 0 and dims > 0
+        return cls(bitpacking.pack(random.integers(2, size=(pop_size, dims), dtype=np.uint8)), dims)
+
+    def evaluate(self, problem_instance:TestProblem, parents:PopulationMatrix=None) -> np.ndarray[np.signedinteger]:
+        """Evaluate every individual not yet evaluated with the given fitness function.
+
+        Args:
+            problem_instance (TestProblem): Function of \vec{x}. Returns (tuple[float]).
+            parents (PackedPopulationMatrix, optional): The evaluated parent of each row, aligned by row.
+                Children close to their parent are delta-evaluated if the problem supports it.
+
+        Returns:
+            np.ndarray of int: The rows which were evaluated.
+        """
+        assert problem_instance is not None
+        self._fit_costs(problem_instance.cost_shape)
+        pending = np.flatnonzero(np.isnan(self.fitness_scores))
+        remaining = pending
+        if parents is not None and problem_instance.supports_delta and len(pending) > 0:
+            remaining = self._evaluate_delta(problem_instance, parents, pending)
+        if len(remaining) == len(self):
+            self.fitness_scores[:], self.fitness_costs[:] = problem_instance.try_with_packed_bitstrings(self.packed)
+        elif len(remaining) > 0:
+            self.fitness_scores[remaining], self.fitness_costs[remaining] = problem_instance.try_with_packed_bitstrings(
+                self.packed[remaining]
+            )
+        self.objective_scores[remaining] = self.fitness_scores[remaining]
+        self.delta_depths[remaining] = 0
+        self._clear_stats()
+        return pending
+
+    def _evaluate_delta(self,
+        problem_instance:TestProblem,
+        parents:'PackedPopulationMatrix',
+        pending:np.ndarray[np.signedinteger]
+    ) -> np.ndarray[np.signedinteger]:
+        """Delta-evaluate the pending rows which differ from their parent in few loci. Counts flips word by word.
+
+        A parent whose fitness came from DELTA_MAX_DEPTH delta evaluations in a row has its children evaluated in full.
+
+        Args:
+            problem_instance (TestProblem): Function of \vec{x}. Supports try_with_flips.
+            parents (PackedPopulationMatrix): The evaluated parent of each row, aligned by row.
+            pending (np.ndarray of int): The rows not yet evaluated.
+
+        Returns:
+            np.ndarray of int: The pending rows still to be evaluated in full.
+        """
+        flipped = bitpacking.words(self.packed[pending]) ^ bitpacking.words(parents.packed[pending])
+        near = np.bitwise_count(flipped).sum(axis=1) <= self.num_items * DELTA_MAX_FLIP_FRACTION
+        near &= parents.delta_depths[pending] < DELTA_MAX_DEPTH
+        if near.any():
+            targets = pending[near]
+            rows, loci = np.nonzero(bitpacking.unpack(flipped[near].view(np.uint8), self.num_items))
+            alleles = bitpacking.unpack(self.packed[targets], self.num_items)[rows, loci]
+            self._apply_flips(problem_instance, parents, targets, rows, loci, alleles)
+        return pending[~near]
+
+    def gather(self, indices:np.ndarray[np.signedinteger]) -> 'PackedPopulationMatrix':
+        """Gather the given rows into a new population. Fitness travels with each row.
+
+        Args:
+            indices (np.ndarray of int): An index-defined population, i.e., the result of selection.
+
+        Returns:
+            PackedPopulationMatrix: A new population containing copies of the chosen rows.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        return PackedPopulationMatrix(
+            self.packed[indices],
+            self.num_items,
+            self.fitness_scores[indices],
+            self.fitness_costs[indices],
+            self.objective_scores[indices],
+            self.delta_depths[indices]
+        )
+
+    def crossover(self, crossover_instance:CrossoverMethod) -> 'PackedPopulationMatrix':
+        """Perform crossover on this population. Unchanged rows keep their fitness.
+
+        Args:
+            crossover_instance (CrossoverMethod): The configured instance of the chosen method.
+
+        Returns:
+            PackedPopulationMatrix: A new population after a round of crossover.
+        """
+        offspring = PackedPopulationMatrix(
+            crossover_instance.crossover_packed(self.packed, self.num_items, self.fitness_scores),
+            self.num_items,
+            self.fitness_scores.copy(),
+            self.fitness_costs.copy(),
+            self.objective_scores.copy(),
+            self.delta_depths.copy()
+        )
+        offspring.invalidate((bitpacking.words(offspring.packed) != bitpacking.words(self.packed)).any(axis=1))
+        return offspring
+
+    def mutate(self, mutations:np.ndarray[np.bool_]) -> None:
+        """Flip every allele marked in the (pop_size x dims) mutation mask in place.
+
+        Args:
+            mutations (np.ndarray of bool): True where an allele mutates.
+        """
+        flips = bitpacking.words(bitpacking.pack(mutations))
+        np.bitwise_xor(bitpacking.words(self.packed), flips, out=bitpacking.words(self.packed))
+        self.invalidate(flips.any(axis=1))
+
+    def flip(self, rows:np.ndarray[np.signedinteger], loci:np.ndarray[np.signedinteger]) -> None:
+        """Flip the alleles at the given (row, locus) coordinates in place.
+
+        Args:
+            rows (np.ndarray of int): The row of each flip.
+            loci (np.ndarray of int): The locus of each flip. No (row, locus) pair may repeat.
+        """
+        # several flips may land in the same byte, so accumulate unbuffered
+        bits = np.right_shift(0x80, loci % 8).astype(np.uint8)
+        np.bitwise_xor.at(self.packed, (rows, loci // 8), bits)
+        self.invalidate(rows)
+
+    def packed_rows(self, indices:np.ndarray[np.signedinteger]) -> np.ndarray[np.uint8]:
+        """Copy the given packed rows, e.g., to send them to another process.
+
+        Args:
+            indices (np.ndarray of int): The rows to copy.
+
+        Returns:
+            np.ndarray of uint8: The packed rows.
+        """
+        return self.packed[indices]
+
+    def unpacked_rows(self, indices:np.ndarray[np.signedinteger]) -> np.ndarray[np.uint8]:
+        """Unpack a copy of the given rows.
+
+        Args:
+            indices (np.ndarray of int): The rows to copy.
+
+        Returns:
+            np.ndarray of uint8: The (len(indices) x dims) rows.
+        """
+        return bitpacking.unpack(self.packed[indices], self.num_items)
+
+    def assign_packed(self, rows:np.ndarray[np.signedinteger], packed:np.ndarray[np.uint8]) -> None:
+        """Overwrite the given rows with packed individuals, clearing their fitness.
+
+        Args:
+            rows (np.ndarray of int): The rows to overwrite.
+            packed (np.ndarray of uint8): One packed row per overwritten row.
+        """
+        self.packed[rows] = packed
+        self.invalidate(rows)
+
+    def chromosome(self, index:int) -> Chromosome:
+        """Create a Chromosome object from one row.
+
+        Args:
+            index (int): The row of the individual.
+
+        Returns:
+            Chromosome: A copy of the individual.
+        """
+        c = Chromosome(None, self.num_items)
+        c.bitstring = bitpacking.unpack(self.packed[index], self.num_items)
+        if not np.isnan(self.fitness_scores[index]):
+            c.fitness_score = self.fitness_scores[index]
+            c.objective_score = self.objective_scores[index]
+            # a copy, so the row can be invalidated later
+            c.fitness_cost = self.fitness_costs[index].copy()
+        return c
+
+    def snapshot(self, index:int, generation:int) -> BestOfRun:
+        """Snapshot one evaluated row without unpacking it.
+
+        Args:
+            index (int): The row of the individual.
+            generation (int): The current generation.
+
+        Returns:
+            BestOfRun: The snapshot.
+        """
+        return BestOfRun(
+            self.packed[index, :-(-self.num_items // 8)].tobytes(),
+            self.num_items,
+            self.fitness_scores[index],
+            self.fitness_costs[index].copy(),
+            int(generation)
+        )
+
+    def allele_counts(self) -> np.ndarray[np.signedinteger]:
+        """Per locus, the number of individuals with allele 1. Unpacks a block of rows at a time.
+
+        Returns:
+            np.ndarray of int: The (dims,) counts.
+        """
+        counts = np.zeros(self.num_items, dtype=np.int64)
+        block = max(1, (1 << 20) // self.num_items)
+        for start in range(0, len(self), block):
+            counts += bitpacking.unpack(self.packed[start:start + block], self.num_items).sum(axis=0, dtype=np.int64)
+        return counts
+
+    @property
+    def bitstrings(self) -> np.ndarray[np.uint8]:
+        """An unpacked copy of the population. One allele per byte."""
+        return bitpacking.unpack(self.packed, self.num_items)
+
+    @property
+    def dims(self) -> int:
+        return self.num_items
+
+    def __len__(self) -> int:
+        return len(self.packed)
@@ -31,10 +31,22 @@ class AbsolutePenalty(PenaltyMethod):
             population (list of Chromosome): The population to assess.
             t (int): The current generation. Ignored for static penalty methods.
         """
-        for k, v in self.constraints.items():
-            for c in population:
-                if getattr(c, k) > v:
-                    c.fitness_score = np.float64(0.0)
+        infeasible = (self._violations(self._chromosome_costs(population)) > 0).any(axis=1)
+        for c, is_infeasible in zip(population, infeasible):
+            if is_infeasible:
+                c.fitness_score = np.float64(0.0)
+
+    def penalize_arrays(self, fitness:np.ndarray[np.float64], costs:np.ndarray[np.float64], t:int=None) -> None:
+        """Assess and penalize fitness scores in place using absolute, static penalty.
+
+        Penalty(x) = {fitness(x) if infeasibe; 0 otherwise}
+
+        Args:
+            fitness (np.ndarray of float64): The fitness scores. Modified in place.
+            costs (np.ndarray of float64): The (pop_size,) or (pop_size x m) constrained values, one column per limit.
+            t (int): The current generation. Ignored for static penalty methods.
+        """
+        fitness[(self._violations(costs) > 0).any(axis=1)] = 0.0
 
     @staticmethod
     def parameters() -> dict[str, tuple]:
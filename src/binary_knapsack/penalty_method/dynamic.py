@@ -41,18 +41,39 @@ class DynamicPenalty(PenaltyMethod):
         self.beta = beta
 
     def penalize(self, population:list[Chromosome], t:int) -> None:
-        """Assess and penalize the population using absolute, static penalty.
+        """Assess and penalize the population using dynamic penalty.
 
         Penalty(x) = $(C * t)^{alpha} * \sum_j^m{f_j(x)^{beta}}$
 
+        Every individual is penalized afresh from its objective score. See penalize_arrays.
+
         Args:
             population (list of Chromosome): The population to assess.
             t (int): The current generation.
         """
-        for k, v in self.constraints.items():
-            for c in population:
-                if getattr(c, k) > v:
-                    c.fitness_score = np.float64(0.0)
+        fitness = np.array([c.objective_score for c in population], dtype=np.float64)
+        self.penalize_arrays(fitness, self._chromosome_costs(population), t)
+        for c, fitness_score in zip(population, fitness):
+            c.fitness_score = fitness_score
+
+    def penalize_arrays(self, fitness:np.ndarray[np.float64], costs:np.ndarray[np.float64], t:int=None) -> None:
+        """Assess and penalize fitness scores in place using dynamic penalty.
+
+        Penalty(x) = $(C * t)^{alpha} * \sum_j^m{f_j(x)^{beta}}$
+
+        The penalty is subtracted from the fitness, floored at zero so it stays a valid selection weight.
+        Generation 0 is penalized as generation 1; a zero factor would let infeasible individuals win outright.
+
+        Args:
+            fitness (np.ndarray of float64): The fitness scores. Modified in place.
+            costs (np.ndarray of float64): The (pop_size,) or (pop_size x m) constrained values, one column per limit.
+            t (int): The current generation.
+        """
+        assert t is not None
+        violations = self._violations(costs)
+        infeasible = (violations > 0).any(axis=1)
+        penalty = (self.c * max(t, 1)) ** self.alpha * np.sum(violations[infeasible] ** self.beta, axis=1)
+        fitness[infeasible] = np.maximum(fitness[infeasible] - penalty, 0.0)
 
     @staticmethod
     def parameters() -> dict[str, tuple]:
@@ -11,6 +11,8 @@ class LogarithmicPenalty(PenaltyMethod):
 
     Penalty(x) = log_2(1 + \rho * (fitness_cost - constraint_limit)
 
+    With several constraints, penalize_arrays sums the degrees of violation.
+
     Attributes:
         constraints (list): The constraints.
     """
@@ -33,11 +35,24 @@ class LogarithmicPenalty(PenaltyMethod):
             population (list of Chromosome): The population to assess.
             t (int): The current generation. Ignored for static penalty methods.
         """
-        for k, v in self.constraints.items():
-            for c in population:
-                attr_val = getattr(c, k)
-                if attr_val > v:
-                    c.fitness_score = np.log2(1 + self.rho * (attr_val - v))
+        violations = self._violations(self._chromosome_costs(population))
+        for c, overages in zip(population, violations):
+            if (overages > 0).any():
+                c.fitness_score = np.log2(1 + self.rho * overages.sum())
+
+    def penalize_arrays(self, fitness:np.ndarray[np.float64], costs:np.ndarray[np.float64], t:int=None) -> None:
+        """Assess and penalize fitness scores in place using logarithmic, static penalty.
+
+        Penalty(x) = log_2(1 + \rho * \sum_j^m{fitness_cost_j - constraint_limit_j})
+
+        Args:
+            fitness (np.ndarray of float64): The fitness scores. Modified in place.
+            costs (np.ndarray of float64): The (pop_size,) or (pop_size x m) constrained values, one column per limit.
+            t (int): The current generation. Ignored for static penalty methods.
+        """
+        violations = self._violations(costs)
+        infeasible = (violations > 0).any(axis=1)
+        fitness[infeasible] = np.log2(1 + self.rho * violations[infeasible].sum(axis=1))
 
     @staticmethod
     def parameters() -> dict[str, tuple]:
@@ -1,6 +1,9 @@
 # ahester57
 
+import numpy as np
+
 from binary_knapsack.chromosome import Chromosome
+from binary_knapsack.population_matrix import PopulationMatrix
 
 
 class PenaltyMethod:
@@ -8,15 +11,19 @@ class PenaltyMethod:
 
     Attributes:
         constraints (list): The constraints.
+        limits (np.ndarray of float64): Every constraint limit, flattened in constraint order.
     """
     def __init__(self, constraints: dict) -> None:
         """Initialize the parameters for penalization.
-        
+
         Args:
             constraints (dict): The constraints.
         """
         assert type(constraints) is dict
         self.constraints = constraints
+        self.limits = np.concatenate([
+            np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in constraints.values()
+        ])
 
     def penalize(self, population:list[Chromosome], t:int=None) -> None:
         """Assess and penalize the population using a penalty method.
@@ -27,6 +34,81 @@ class PenaltyMethod:
         """
         raise NotImplementedError
 
+    def penalize_matrix(self, population:PopulationMatrix, t:int=None) -> None:
+        """Assess and penalize a population matrix in place using a penalty method.
+
+        Every row is penalized afresh from its objective score, so survivors of earlier generations
+        carry the penalty of generation t rather than the one they were evaluated under.
+
+        Args:
+            population (PopulationMatrix): The population to assess.
+            t (int): The current generation.
+        """
+        np.copyto(population.fitness_scores, population.objective_scores)
+        self.penalize_arrays(population.fitness_scores, self.costs(population), t)
+
+    def penalize_arrays(self, fitness:np.ndarray[np.float64], costs:np.ndarray[np.float64], t:int=None) -> None:
+        """Assess and penalize fitness scores in place, all individuals and constraints at once.
+
+        Args:
+            fitness (np.ndarray of float64): The fitness scores. Modified in place.
+            costs (np.ndarray of float64): The (pop_size,) or (pop_size x m) constrained values, one column per limit.
+            t (int): The current generation.
+        """
+        raise NotImplementedError
+
+    def costs(self, population:list[Chromosome] | PopulationMatrix) -> np.ndarray[np.float64]:
+        """Gather the constrained values of a population, one column per limit.
+
+        Args:
+            population (list of Chromosome or PopulationMatrix): The evaluated population.
+
+        Returns:
+            np.ndarray of float64: The (pop_size x m) constrained values.
+        """
+        if isinstance(population, PopulationMatrix):
+            return np.column_stack([population.attribute(k) for k in self.constraints])
+        return self._chromosome_costs(population)
+
+    def violation(self, costs:np.ndarray[np.float64]) -> np.ndarray[np.float64]:
+        """Total degree of violation of each individual, over every constraint. Zero where feasible.
+
+        Args:
+            costs (np.ndarray of float64): The (pop_size,) or (pop_size x m) constrained values, one column per limit.
+
+        Returns:
+            np.ndarray of float64: The (pop_size,) summed overages.
+        """
+        return self._violations(costs).sum(axis=1)
+
+    def _chromosome_costs(self, population:list[Chromosome]) -> np.ndarray[np.float64]:
+        """Gather the constrained values of Chromosome objects, one column per limit.
+
+        Args:
+            population (list of Chromosome): The evaluated population.
+
+        Returns:
+            np.ndarray of float64: The (pop_size x m) constrained values.
+        """
+        return np.column_stack([
+            np.array([getattr(c, k) for c in population], dtype=np.float64) for k in self.constraints
+        ])
+
+    def _violations(self, costs:np.ndarray[np.float64]) -> np.ndarray[np.float64]:
+        """Degree of violation of each constraint. Zero where satisfied.
+
+        Args:
+            costs (np.ndarray of float64): The (pop_size,) or (pop_size x m) constrained values, one column per limit.
+
+        Returns:
+            np.ndarray of float64: The (pop_size x m) overages.
+        """
+        costs = np.asarray(costs, dtype=np.float64)
+        if costs.ndim == 1:
+            costs = costs[:, np.newaxis]
+        assert costs.shape[1] == len(self.limits)
+        return np.maximum(costs - self.limits, 0.0)
+
     @staticmethod
     def parameters() -> dict[str, tuple]:
         """{'param_name': tuple('description', default_value)}"""
@@ -5,6 +5,7 @@ import numpy as np
 from collections import deque
 
 from binary_knapsack.chromosome import Chromosome
+from binary_knapsack.population_stats import PopulationStats
 from binary_knapsack.test_problem.problem import TestProblem
 
 
@@ -24,61 +25,70 @@ class Population:
         assert members is not None and type(members) in [list, tuple]
         self.members = tuple(members)
         self._is_evaluated = False
-        self._high_of = None
-        self._low_of = None
-        self._average_fitness = None
-        self._sum_of_fitnesses = None
+        self._stats = None
 
-    def evaluate(self, problem_instance:TestProblem) -> None:
+    def evaluate(self, problem_instance:TestProblem) -> np.ndarray[np.signedinteger]:
         """Evaluate the population with the given fitness function.
 
         Args:
             problem_instance (TestProblem): Function of \vec{x}. Returns (tuple[float]).
+
+        Returns:
+            np.ndarray of int: The members which were evaluated.
         """
-        deque((c.evaluate(problem_instance) for c in self.members), maxlen=0) # execute the generator
+        evaluated = np.fromiter((j for j, c in enumerate(self.members) if not c.is_evaluated), dtype=np.intp)
+        pending = [self.members[j] for j in evaluated]
+        if problem_instance.supports_batch:
+            if len(pending) > 0:
+                fitness_scores, fitness_costs = problem_instance.try_with_bitstrings(
+                    np.stack([c.bitstring for c in pending])
+                )
+                for c, fitness_score, fitness_cost in zip(pending, fitness_scores, fitness_costs):
+                    c.fitness_score = c.objective_score = fitness_score
+                    c.fitness_cost = fitness_cost
+        else:
+            deque((c.evaluate(problem_instance) for c in pending), maxlen=0) # execute the generator
         self._is_evaluated = True
+        self._stats = None
+        return evaluated
+
+    def statistics(self, diversity:bool=False) -> PopulationStats:
+        """Compute the statistics of this generation in one pass over the members. Cached.
+
+        Args:
+            diversity (bool, optional): Also compute allele frequencies and mean pairwise Hamming distance. Default False.
+
+        Returns:
+            PopulationStats: The statistics.
+        """
+        if self._stats is None or (diversity and self._stats.allele_frequencies is None):
+            assert self._is_evaluated
+            allele_counts = None
+            if diversity:
+                allele_counts = np.stack([c.bitstring for c in self.members]).sum(axis=0, dtype=np.int64)
+            self._stats = PopulationStats.from_fitness(
+                np.fromiter((c.fitness_score for c in self.members), dtype=np.float64, count=len(self.members)),
+                allele_counts
+            )
+        return self._stats
 
     @property
     def high_score(self) -> Chromosome:
-        if self._high_of is not None:
-            return self._high_of
-        assert self._is_evaluated
-        high_fitness = 0
-        for c in self.members:
-            if c.fitness_score > high_fitness:
-                high_fitness = c.fitness_score
-                self._high_of = c
-        return self._high_of
+        return self.members[self.statistics().high_index]
 
     @property
     def low_score(self) -> Chromosome:
-        if self._low_of is not None:
-            return self._low_of
-        assert self._is_evaluated
-        low_fitness = float('inf')
-        for c in self.members:
-            if c.fitness_score < low_fitness:
-                low_fitness = c.fitness_score
-                self._low_of = c
-        return self._low_of
+        return self.members[self.statistics().low_index]
 
     @property
     def average_fitness(self) -> float:
         """\sum_{j=1}^N{f_j} / N"""
-        if self._average_fitness is not None:
-            return self._average_fitness
-        assert self._is_evaluated and len(self.members) > 0
-        self._average_fitness = self.sum_of_fitnesses / len(self.members)
-        return self._average_fitness
+        return self.statistics().average_fitness
 
     @property
     def sum_of_fitnesses(self) -> float:
         """\sum_{j=1}^N{f_j}"""
-        if self._sum_of_fitnesses is not None:
-            return self._sum_of_fitnesses
-        assert self._is_evaluated
-        self._sum_of_fitnesses = np.sum((c.fitness_score for c in self.members))
-        return self._sum_of_fitnesses
+        return self.statistics().sum_of_fitnesses
 
     @property
     def is_evaluated(self) -> bool:
@@ -86,4 +96,7 @@ class Population:
 
     @property
     def is_converged(self) -> bool:
-        return self.high_score == self.low_score
+        return self.statistics().is_converged
+
+    def __len__(self) -> int:
+        return len(self.members)
@@ -0,0 +1,399 @@
+# ahester57
+
+import numpy as np
+
+from binary_knapsack import bitpacking
+from binary_knapsack.best_of_run import BestOfRun
+from binary_knapsack.chromosome import Chromosome
+from binary_knapsack.population_stats import PopulationStats
+from binary_knapsack.crossover_method.method import CrossoverMethod
+from binary_knapsack.test_problem.problem import TestProblem
+
+
+# Children differing from their parent in at most this fraction of loci are delta-evaluated.
+DELTA_MAX_FLIP_FRACTION = 0.125
+# Fitness reached by this many delta evaluations in a row is not delta-evaluated from again; rounding error adds up.
+DELTA_MAX_DEPTH = 4
+
+
+class PopulationMatrix:
+    """Depicts a population of chromosomes as one contiguous (pop_size x dims) matrix.
+
+    Chromosome objects are only created on demand, e.g., for the best-of-run and reporting.
+    A fitness score of NaN marks an individual which has not been evaluated yet.
+
+    Attributes:
+        bitstrings (np.ndarray of uint8): The (pop_size x dims) matrix. Row j is the bitstring of individual j.
+        fitness_scores (np.ndarray of float64): The fitness scores. Aligned by row.
+        fitness_costs (np.ndarray of float64): The (pop_size,) or (pop_size x m) fitness costs. Aligned by row.
+        objective_scores (np.ndarray of float64): The fitness scores before penalization. Aligned by row.
+        delta_depths (np.ndarray of uint8): How many delta evaluations in a row led to each fitness. 0 if evaluated in full.
+    """
+    def __init__(self,
+        bitstrings:np.ndarray[np.uint8],
+        fitness_scores:np.ndarray[np.float64]=None,
+        fitness_costs:np.ndarray[np.float64]=None,
+        objective_scores:np.ndarray[np.float64]=None,
+        delta_depths:np.ndarray[np.uint8]=None
+    ) -> None:
+        """Initialize a population matrix.
+
+        Args:
+            bitstrings (np.ndarray of uint8): The (pop_size x dims) matrix to be represented.
+            fitness_scores (np.ndarray of float64, optional): Known fitness scores. NaN if not evaluated.
+            fitness_costs (np.ndarray of float64, optional): Known fitness costs. NaN if not evaluated.
+            objective_scores (np.ndarray of float64, optional): Known scores before penalization. Defaults to fitness_scores.
+            delta_depths (np.ndarray of uint8, optional): Known delta evaluation depths. Defaults to 0.
+        """
+        assert bitstrings is not None and type(bitstrings) is np.ndarray
+        assert bitstrings.ndim == 2 and bitstrings.dtype == np.uint8
+        self.bitstrings = np.ascontiguousarray(bitstrings)
+        pop_size = len(self.bitstrings)
+        if fitness_scores is None:
+            fitness_scores = np.full(pop_size, np.nan)
+        if fitness_costs is None:
+            fitness_costs = np.full(pop_size, np.nan)
+        if objective_scores is None:
+            objective_scores = np.array(fitness_scores, dtype=np.float64)
+        if delta_depths is None:
+            delta_depths = np.zeros(pop_size, dtype=np.uint8)
+        assert len(fitness_scores) == pop_size and len(fitness_costs) == pop_size and len(objective_scores) == pop_size
+        assert len(delta_depths) == pop_size
+        self.fitness_scores = np.asarray(fitness_scores, dtype=np.float64)
+        self.fitness_costs = np.asarray(fitness_costs, dtype=np.float64)
+        self.objective_scores = np.asarray(objective_scores, dtype=np.float64)
+        self.delta_depths = np.asarray(delta_depths, dtype=np.uint8)
+        self._clear_stats()
+
+    @classmethod
+    def random(cls, random:np.random.Generator, pop_size:int, dims:int) -> 'PopulationMatrix':
+        """Initialize a uniformly random population matrix.
+
+        Args:
+            random (np.random.Generator): The random number generator.
+            pop_size (int): Population size.
+            dims (int): The number of items to choose from.
+
+        Returns:
+            PopulationMatrix: The randomly initialized population.
+        """
+        assert pop_size > 0 and dims > 0
+        return cls(random.integers(2, size=(pop_size, dims), dtype=np.uint8))
+
+    def evaluate(self, problem_instance:TestProblem, parents:'PopulationMatrix'=None) -> np.ndarray[np.signedinteger]:
+        """Evaluate every individual not yet evaluated with the given fitness function.
+
+        Args:
+            problem_instance (TestProblem): Function of \vec{x}. Returns (tuple[float]).
+            parents (PopulationMatrix, optional): The evaluated parent of each row, aligned by row.
+                Children close to their parent are delta-evaluated if the problem supports it.
+
+        Returns:
+            np.ndarray of int: The rows which were evaluated.
+        """
+        assert problem_instance is not None and callable(problem_instance.try_with_bitstring)
+        self._fit_costs(problem_instance.cost_shape)
+        pending = np.flatnonzero(np.isnan(self.fitness_scores))
+        remaining = pending
+        if parents is not None and problem_instance.supports_delta and len(pending) > 0:
+            remaining = self._evaluate_delta(problem_instance, parents, pending)
+        if problem_instance.supports_batch:
+            if len(remaining) == len(self):
+                # skip the gather when no individual survived unchanged
+                self.fitness_scores[:], self.fitness_costs[:] = problem_instance.try_with_bitstrings(self.bitstrings)
+            elif len(remaining) > 0:
+                self.fitness_scores[remaining], self.fitness_costs[remaining] = problem_instance.try_with_bitstrings(
+                    self.bitstrings[remaining]
+                )
+        else:
+            for j in remaining:
+                self.fitness_scores[j], self.fitness_costs[j] = problem_instance.try_with_bitstring(self.bitstrings[j])
+        self.objective_scores[remaining] = self.fitness_scores[remaining]
+        self.delta_depths[remaining] = 0
+        self._clear_stats()
+        return pending
+
+    def _evaluate_delta(self,
+        problem_instance:TestProblem,
+        parents:'PopulationMatrix',
+        pending:np.ndarray[np.signedinteger]
+    ) -> np.ndarray[np.signedinteger]:
+        """Delta-evaluate the pending rows which differ from their parent in few loci.
+
+        Every delta evaluation adds rounding error to its parent's, so a parent whose fitness
+        came from DELTA_MAX_DEPTH delta evaluations in a row has its children evaluated in full.
+
+        Args:
+            problem_instance (TestProblem): Function of \vec{x}. Supports try_with_flips.
+            parents (PopulationMatrix): The evaluated parent of each row, aligned by row.
+            pending (np.ndarray of int): The rows not yet evaluated.
+
+        Returns:
+            np.ndarray of int: The pending rows still to be evaluated in full.
+        """
+        flipped = self.bitstrings[pending] != parents.bitstrings[pending]
+        near = flipped.sum(axis=1) <= self.dims * DELTA_MAX_FLIP_FRACTION
+        near &= parents.delta_depths[pending] < DELTA_MAX_DEPTH
+        if near.any():
+            rows, loci = np.nonzero(flipped[near])
+            targets = pending[near]
+            self._apply_flips(problem_instance, parents, targets, rows, loci, self.bitstrings[targets[rows], loci])
+        return pending[~near]
+
+    def _apply_flips(self,
+        problem_instance:TestProblem,
+        parents:'PopulationMatrix',
+        targets:np.ndarray[np.signedinteger],
+        rows:np.ndarray[np.signedinteger],
+        loci:np.ndarray[np.signedinteger],
+        alleles:np.ndarray[np.uint8]
+    ) -> None:
+        """Update the target rows from their parents' unpenalized fitness and the flipped loci.
+
+        Args:
+            problem_instance (TestProblem): Function of \vec{x}. Supports try_with_flips.
+            parents (PopulationMatrix): The evaluated parent of each row, aligned by row.
+            targets (np.ndarray of int): The rows to update.
+            rows (np.ndarray of int): For each flip, its position in targets.
+            loci (np.ndarray of int): For each flip, the flipped locus.
+            alleles (np.ndarray of uint8): For each flip, the new allele.
+        """
+        self.fitness_scores[targets], self.fitness_costs[targets] = problem_instance.try_with_flips(
+            parents.objective_scores[targets], parents.fitness_costs[targets], rows, loci, alleles
+        )
+        self.objective_scores[targets] = self.fitness_scores[targets]
+        self.delta_depths[targets] = parents.delta_depths[targets] + 1
+
+    def _fit_costs(self, cost_shape:tuple[int, ...]) -> None:
+        """Hold one fitness cost of the given shape per row. Reallocates, before the first evaluation only.
+
+        Args:
+            cost_shape (tuple of int): See TestProblem.cost_shape.
+        """
+        if self.fitness_costs.shape[1:] != cost_shape:
+            assert np.isnan(self.fitness_scores).all(), 'fitness costs changed shape between evaluations'
+            self.fitness_costs = np.full((len(self), *cost_shape), np.nan)
+
+    def gather(self, indices:np.ndarray[np.signedinteger]) -> 'PopulationMatrix':
+        """Gather the given rows into a new population. Fitness travels with each row.
+
+        Args:
+            indices (np.ndarray of int): An index-defined population, i.e., the result of selection.
+
+        Returns:
+            PopulationMatrix: A new population containing copies of the chosen rows.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        return PopulationMatrix(
+            self.bitstrings[indices],
+            self.fitness_scores[indices],
+            self.fitness_costs[indices],
+            self.objective_scores[indices],
+            self.delta_depths[indices]
+        )
+
+    def crossover(self, crossover_instance:CrossoverMethod) -> 'PopulationMatrix':
+        """Perform crossover on this population. Unchanged rows keep their fitness.
+
+        Args:
+            crossover_instance (CrossoverMethod): The configured instance of the chosen method.
+
+        Returns:
+            PopulationMatrix: A new population after a round of crossover.
+        """
+        offspring = PopulationMatrix(
+            crossover_instance.crossover_matrix(self.bitstrings, self.fitness_scores),
+            self.fitness_scores.copy(),
+            self.fitness_costs.copy(),
+            self.objective_scores.copy(),
+            self.delta_depths.copy()
+        )
+        offspring.invalidate((offspring.bitstrings != self.bitstrings).any(axis=1))
+        return offspring
+
+    def mutate(self, mutations:np.ndarray[np.bool_]) -> None:
+        """Flip every allele marked in the (pop_size x dims) mutation mask in place.
+
+        Args:
+            mutations (np.ndarray of bool): True where an allele mutates.
+        """
+        np.bitwise_xor(self.bitstrings, mutations, out=self.bitstrings)
+        self.invalidate(mutations.any(axis=1))
+
+    def flip(self, rows:np.ndarray[np.signedinteger], loci:np.ndarray[np.signedinteger]) -> None:
+        """Flip the alleles at the given (row, locus) coordinates in place.
+
+        Args:
+            rows (np.ndarray of int): The row of each flip.
+            loci (np.ndarray of int): The locus of each flip. No (row, locus) pair may repeat.
+        """
+        self.bitstrings[rows, loci] ^= 1
+        self.invalidate(rows)
+
+    def packed_rows(self, indices:np.ndarray[np.signedinteger]) -> np.ndarray[np.uint8]:
+        """Pack the given rows, e.g., to send them to another process.
+
+        Args:
+            indices (np.ndarray of int): The rows to pack.
+
+        Returns:
+            np.ndarray of uint8: The packed rows. See bitpacking.pack().
+        """
+        return bitpacking.pack(self.bitstrings[indices])
+
+    def unpacked_rows(self, indices:np.ndarray[np.signedinteger]) -> np.ndarray[np.uint8]:
+        """Copy the given rows, one allele per byte.
+
+        Args:
+            indices (np.ndarray of int): The rows to copy.
+
+        Returns:
+            np.ndarray of uint8: The (len(indices) x dims) rows.
+        """
+        return self.bitstrings[indices]
+
+    def assign_packed(self, rows:np.ndarray[np.signedinteger], packed:np.ndarray[np.uint8]) -> None:
+        """Overwrite the given rows with packed individuals, clearing their fitness.
+
+        Args:
+            rows (np.ndarray of int): The rows to overwrite.
+            packed (np.ndarray of uint8): One packed row per overwritten row. See bitpacking.pack().
+        """
+        self.bitstrings[rows] = bitpacking.unpack(packed, self.dims)
+        self.invalidate(rows)
+
+    def invalidate(self, rows:np.ndarray) -> None:
+        """Mark the given rows as changed, clearing their fitness.
+
+        Args:
+            rows (np.ndarray of bool or int): A mask or indices of the changed rows.
+        """
+        self.fitness_scores[rows] = np.nan
+        self.fitness_costs[rows] = np.nan
+        self.objective_scores[rows] = np.nan
+        self._clear_stats()
+
+    def attribute(self, name:str) -> np.ndarray:
+        """Get the vector of values for a Chromosome attribute, e.g., a constraint key.
+
+        Args:
+            name (str): The Chromosome attribute name. e.g., 'fitness_cost'.
+
+        Returns:
+            np.ndarray: The attribute's values. Aligned by row.
+        """
+        if name == 'fitness_score':
+            return self.fitness_scores
+        if name == 'fitness_cost':
+            return self.fitness_costs
+        raise AttributeError(name)
+
+    def chromosome(self, index:int) -> Chromosome:
+        """Create a Chromosome object from one row.
+
+        Args:
+            index (int): The row of the individual.
+
+        Returns:
+            Chromosome: A copy of the individual.
+        """
+        c = Chromosome(None, self.dims)
+        c.bitstring = self.bitstrings[index].copy()
+        if not np.isnan(self.fitness_scores[index]):
+            c.fitness_score = self.fitness_scores[index]
+            c.objective_score = self.objective_scores[index]
+            # a copy, so the row can be invalidated later
+            c.fitness_cost = self.fitness_costs[index].copy()
+        return c
+
+    def snapshot(self, index:int, generation:int) -> BestOfRun:
+        """Snapshot one evaluated row without creating a Chromosome.
+
+        Args:
+            index (int): The row of the individual.
+            generation (int): The current generation.
+
+        Returns:
+            BestOfRun: The snapshot.
+        """
+        return BestOfRun.from_bitstring(
+            self.bitstrings[index],
+            self.fitness_scores[index],
+            self.fitness_costs[index].copy(),
+            generation
+        )
+
+    def statistics(self, diversity:bool=False) -> PopulationStats:
+        """Compute the statistics of this generation in one pass. Cached until the population changes.
+
+        Args:
+            diversity (bool, optional): Also compute allele frequencies and mean pairwise Hamming distance. Default False.
+
+        Returns:
+            PopulationStats: The statistics.
+        """
+        if self._stats is None or (diversity and self._stats.allele_frequencies is None):
+            assert self.is_evaluated
+            self._stats = PopulationStats.from_fitness(
+                self.fitness_scores,
+                self.allele_counts() if diversity else None
+            )
+        return self._stats
+
+    def allele_counts(self) -> np.ndarray[np.signedinteger]:
+        """Per locus, the number of individuals with allele 1.
+
+        Returns:
+            np.ndarray of int: The (dims,) counts.
+        """
+        return self.bitstrings.sum(axis=0, dtype=np.int64)
+
+    @property
+    def members(self) -> tuple[Chromosome]:
+        """Every individual as a Chromosome. Only intended for reporting."""
+        return tuple(self.chromosome(j) for j in range(len(self)))
+
+    @property
+    def dims(self) -> int:
+        return self.bitstrings.shape[1]
+
+    @property
+    def high_index(self) -> int:
+        return self.statistics().high_index
+
+    @property
+    def low_index(self) -> int:
+        return self.statistics().low_index
+
+    @property
+    def high_score(self) -> Chromosome:
+        return self.chromosome(self.high_index)
+
+    @property
+    def low_score(self) -> Chromosome:
+        return self.chromosome(self.low_index)
+
+    @property
+    def average_fitness(self) -> float:
+        """\sum_{j=1}^N{f_j} / N"""
+        return self.statistics().average_fitness
+
+    @property
+    def sum_of_fitnesses(self) -> float:
+        """\sum_{j=1}^N{f_j}"""
+        return self.statistics().sum_of_fitnesses
+
+    @property
+    def is_evaluated(self) -> bool:
+        return not np.isnan(self.fitness_scores).any()
+
+    @property
+    def is_converged(self) -> bool:
+        return self.statistics().is_converged
+
+    def _clear_stats(self) -> None:
+        """Forget any statistics computed from the fitness scores."""
+        self._stats = None
+
+    def __len__(self) -> int:
+        return len(self.bitstrings)
@@ -0,0 +1,83 @@
+# ahester57
+
+import numpy as np
+
+from typing import NamedTuple
+
+
+# Fitness scores this close, relative to the larger, count as equal. Delta evaluation rounds differently than full.
+CONVERGENCE_RTOL = 1e-12
+
+class PopulationStats(NamedTuple):
+    """Statistics of one generation, computed in one vectorized pass over the fitness scores.
+
+    Attributes:
+        high_index (int): The first individual with the highest fitness score.
+        low_index (int): The first individual with the lowest fitness score.
+        high_fitness (np.float64): The highest fitness score.
+        low_fitness (np.float64): The lowest fitness score.
+        sum_of_fitnesses (np.float64): \\sum_{j=1}^N{f_j}
+        average_fitness (np.float64): \\sum_{j=1}^N{f_j} / N
+        std_fitness (np.float64): The standard deviation of the fitness scores.
+        allele_frequencies (np.ndarray of float64): Per locus, the fraction of individuals with allele 1. None if not computed.
+        mean_hamming_distance (np.float64): The mean Hamming distance over all pairs of individuals. None if not computed.
+    """
+    high_index: int
+    low_index: int
+    high_fitness: np.float64
+    low_fitness: np.float64
+    sum_of_fitnesses: np.float64
+    average_fitness: np.float64
+    std_fitness: np.float64
+    allele_frequencies: np.ndarray = None
+    mean_hamming_distance: np.float64 = None
+
+    @classmethod
+    def from_fitness(cls,
+        fitness_scores:np.ndarray[np.float64],
+        allele_counts:np.ndarray[np.signedinteger]=None
+    ) -> 'PopulationStats':
+        """Compute the statistics of a generation.
+
+        The mean pairwise Hamming distance follows from the allele counts alone: at a locus where
+        c of N individuals carry a 1, c * (N - c) of the N * (N - 1) / 2 pairs differ.
+
+        Args:
+            fitness_scores (np.ndarray of float64): The evaluated fitness scores.
+            allele_counts (np.ndarray of int, optional): Per locus, the number of individuals with allele 1.
+
+        Returns:
+            PopulationStats: The statistics.
+        """
+        fitness_scores = np.asarray(fitness_scores, dtype=np.float64)
+        pop_size = len(fitness_scores)
+        assert pop_size > 0 and not np.isnan(fitness_scores).any()
+        high_index = int(np.argmax(fitness_scores))
+        low_index = int(np.argmin(fitness_scores))
+        sum_of_fitnesses = np.sum(fitness_scores)
+        average_fitness = sum_of_fitnesses / pop_size
+        allele_frequencies = None
+        mean_hamming_distance = None
+        if allele_counts is not None:
+            allele_counts = np.asarray(allele_counts, dtype=np.float64)
+            allele_frequencies = allele_counts / pop_size
+            mean_hamming_distance = np.float64(0.0)
+            if pop_size > 1:
+                mean_hamming_distance = 2 * np.sum(allele_counts * (pop_size - allele_counts)) / (pop_size * (pop_size - 1))
+        return cls(
+            high_index,
+            low_index,
+            fitness_scores[high_index],
+            fitness_scores[low_index],
+            sum_of_fitnesses,
+            average_fitness,
+            np.sqrt(np.mean(np.square(fitness_scores - average_fitness))),
+            allele_frequencies,
+            mean_hamming_distance
+        )
+
+    @property
+    def is_converged(self) -> bool:
+        """Whether every individual has the same fitness score, up to rounding. See CONVERGENCE_RTOL."""
+        spread = abs(self.high_fitness - self.low_fitness)
+        return spread <= CONVERGENCE_RTOL * max(abs(self.high_fitness), abs(self.low_fitness))
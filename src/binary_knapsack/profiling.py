@@ -0,0 +1,99 @@
+# ahester57
+
+import math
+import numpy as np
+
+
+# The GA methods which may be timed, outermost first.
+STAGES = (
+    'iterate',
+    'create_next_population',
+    'selection_mechanism',
+    'crossover_method',
+    'bitwise_gene_mutation',
+    'repair_method',
+    'evaluate_population'
+)
+
+
+class ProfilingHook:
+    """Receives the timing of each GA stage. Does not record anything. Only provides base.
+
+    Subclass to forward timings elsewhere, e.g., to a metrics system.
+    """
+    def on_stage(self, stage:str, seconds:float, evaluations:int) -> None:
+        """Record one call of a stage.
+
+        Args:
+            stage (str): The GA method. One of STAGES.
+            seconds (float): The wall-time of the call.
+            evaluations (int): The number of individuals evaluated during the call.
+        """
+        raise NotImplementedError
+
+
+class StageProfiler(ProfilingHook):
+    """Keeps per-stage call counts, total wall-time and wall-time histograms.
+
+    Histogram bucket b counts calls lasting [2^(b-1), 2^b) microseconds; bucket 0 counts calls under 1 microsecond.
+
+    Attributes:
+        num_buckets (int): The number of histogram buckets. The last bucket also counts longer calls.
+        calls (dict): {stage: number of calls}
+        seconds (dict): {stage: total wall-time}
+        evaluations (dict): {stage: individuals evaluated}
+        histograms (dict): {stage: np.ndarray of int64 call counts per bucket}
+    """
+    def __init__(self, num_buckets:int=32) -> None:
+        """Initialize empty histograms for every stage.
+
+        Args:
+            num_buckets (int, optional): The number of histogram buckets. Default 32, i.e., up to ~36 minutes.
+        """
+        assert num_buckets > 0
+        self.num_buckets = int(num_buckets)
+        self.calls = {stage: 0 for stage in STAGES}
+        self.seconds = {stage: 0.0 for stage in STAGES}
+        self.evaluations = {stage: 0 for stage in STAGES}
+        self.histograms = {stage: np.zeros(self.num_buckets, dtype=np.int64) for stage in STAGES}
+
+    def on_stage(self, stage:str, seconds:float, evaluations:int) -> None:
+        """Record one call of a stage.
+
+        Args:
+            stage (str): The GA method. One of STAGES.
+            seconds (float): The wall-time of the call.
+            evaluations (int): The number of individuals evaluated during the call.
+        """
+        self.calls[stage] += 1
+        self.seconds[stage] += seconds
+        self.evaluations[stage] += evaluations
+        # frexp's exponent is floor(log2(x)) + 1, without a log call
+        bucket = math.frexp(seconds * 1e6)[1] if seconds >= 1e-6 else 0
+        self.histograms[stage][min(bucket, self.num_buckets - 1)] += 1
+
+    @property
+    def evaluations_per_second(self) -> float:
+        """Individuals evaluated per second spent in evaluate_population."""
+        if self.seconds['evaluate_population'] == 0:
+            return 0.0
+        return self.evaluations['evaluate_population'] / self.seconds['evaluate_population']
+
+    def report(self) -> str:
+        """Summarize every stage that was called.
+
+        Returns:
+            str: One line per stage; calls, total and mean wall-time, and the busiest histogram bucket.
+        """
+        lines = [f'{"Stage":<24}{"Calls":>8}{"Total (s)":>12}{"Mean (ms)":>12}{"Mode (us)":>14}']
+        for stage in STAGES:
+            if self.calls[stage] == 0:
+                continue
+            mode = int(np.argmax(self.histograms[stage]))
+            lines.append(
+                f'{stage:<24}{self.calls[stage]:>8}{self.seconds[stage]:>12.4f}'
+                f'{1e3 * self.seconds[stage] / self.calls[stage]:>12.4f}'
+                f'{f"<{2 ** mode}":>14}'
+            )
+        lines.append(f'Evaluations per second: {self.evaluations_per_second:.1f}')
+        return '\n'.join(lines)
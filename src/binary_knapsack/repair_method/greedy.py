@@ -0,0 +1,122 @@
+# ahester57
+
+import numpy as np
+
+from binary_knapsack.repair_method.method import RepairMethod
+from binary_knapsack.test_problem.knapsack import BinaryKnapsack
+
+
+class GreedyRepair(RepairMethod):
+    """Repairs knapsack solutions greedily, by profit/weight ratio.
+
+    DROP: remove selected items in ascending ratio order until every capacity holds.
+    ADD (optional): then insert unselected items in descending ratio order wherever they still fit.
+
+    The ratio order is the problem's own, computed once per instance. Both phases act on the whole
+    population at once: dropping is a running sum over the infeasible rows, adding takes one step per item
+    over just the rows with room left. The problem's capacities are shrunk by a rounding tolerance,
+    so a repaired solution stays feasible however its weight is summed at evaluation.
+
+    Attributes:
+        problem_instance (BinaryKnapsack): The problem whose constraints are repaired.
+        greedy_add (bool): Whether to fill remaining capacity after dropping.
+    """
+    def __init__(self, problem_instance:BinaryKnapsack, greedy_add:bool=False) -> None:
+        """Initialize the parameters for greedy repair.
+
+        Args:
+            problem_instance (BinaryKnapsack): The problem whose constraints are repaired.
+            greedy_add (bool, optional): Whether to fill remaining capacity after dropping. Default False.
+        """
+        super().__init__(problem_instance)
+        assert isinstance(problem_instance, BinaryKnapsack), 'greedy repair needs item profits and weights'
+        assert greedy_add in (False, True)
+        self.greedy_add = greedy_add
+        self._order = problem_instance.ratio_order
+        # each item's position in the ratio order
+        self._rank = np.argsort(self._order)
+        # (dims x m) weights, one row per item
+        self._item_weights = np.ascontiguousarray(np.atleast_2d(problem_instance.weights).T)
+        capacities = np.atleast_1d(problem_instance.constraints['fitness_cost']).astype(np.float64)
+        self._limits = capacities - np.finfo(np.float64).eps * problem_instance.dims * capacities
+        # (m x dims) weights, columns in ascending ratio order
+        self._ordered_weights = np.ascontiguousarray(self._item_weights[self._order].T)
+        if self.greedy_add:
+            # per constraint, the lightest item from each position down to the lowest ratio
+            self._lightest_below = np.minimum.accumulate(self._item_weights[self._order], axis=0)
+
+    def repair_bitstrings(self, bitstrings:np.ndarray[np.uint8]) -> np.ndarray[np.uint8]:
+        """Drop, then optionally add, items of a (num_solns x dims) matrix of solutions.
+
+        Args:
+            bitstrings (np.ndarray of uint8): The solutions. Not modified.
+
+        Returns:
+            np.ndarray of uint8: The repaired solutions. Aligned by row.
+        """
+        repaired = bitstrings.copy()
+        loads = bitstrings @ self._item_weights
+        infeasible = np.flatnonzero((loads > self._limits).any(axis=1))
+        if len(infeasible) > 0:
+            cut = self._drop(bitstrings, loads, infeasible)
+            # drop every item ranked below each row's cut
+            repaired[infeasible] *= self._rank >= cut[:, np.newaxis]
+        if self.greedy_add:
+            self._add(repaired, loads)
+        return repaired
+
+    def _drop(self,
+        bitstrings:np.ndarray[np.uint8],
+        loads:np.ndarray[np.float64],
+        rows:np.ndarray[np.signedinteger]
+    ) -> np.ndarray[np.signedinteger]:
+        """Find how many of the lowest-ratio items each infeasible row must give up for every limit to hold.
+
+        Args:
+            bitstrings (np.ndarray of uint8): The (num_solns x dims) solutions.
+            loads (np.ndarray of float64): (num_solns x m) weight of each solution against each limit. Updated in place.
+            rows (np.ndarray of int): The infeasible rows.
+
+        Returns:
+            np.ndarray of int: For each of rows, the ratio rank below which its items are dropped.
+        """
+        # (len(rows) x dims), columns in ascending ratio order
+        selected = np.take(bitstrings[rows], self._order, axis=1)
+        excess = loads[rows] - self._limits
+        cut = np.zeros(len(rows), dtype=np.intp)
+        for i, weights in enumerate(self._ordered_weights):
+            if not (excess[:, i] > 0).any():
+                continue
+            removed = selected * weights
+            # an item goes if the limit is still exceeded once every lower-ratio item has gone
+            removed_before = np.cumsum(removed, axis=1) - removed
+            cut = np.maximum(cut, (removed_before < excess[:, i, np.newaxis]).sum(axis=1))
+        selected *= np.arange(len(self._order)) >= cut[:, np.newaxis]
+        loads[rows] = selected @ self._ordered_weights.T
+        return cut
+
+    def _add(self, repaired:np.ndarray[np.uint8], loads:np.ndarray[np.float64]) -> None:
+        """Insert items in descending ratio order, in place, wherever they fit.
+
+        Walks the items in descending ratio order, only over the rows with room for the lightest remaining item.
+
+        Args:
+            repaired (np.ndarray of uint8): The (num_solns x dims) feasible solutions. Updated in place.
+            loads (np.ndarray of float64): (num_solns x m) weight of each solution against each limit.
+        """
+        slack = self._limits - loads
+        active = np.arange(len(repaired))
+        for position in range(len(self._order) - 1, -1, -1):
+            active = active[(slack[active] >= self._lightest_below[position]).all(axis=1)]
+            if len(active) == 0:
+                break
+            item = self._order[position]
+            weights = self._item_weights[item]
+            fits = active[(repaired[active, item] == 0) & (slack[active] >= weights).all(axis=1)]
+            repaired[fits, item] = 1
+            slack[fits] -= weights
+
+    @staticmethod
+    def parameters() -> dict[str, tuple]:
+        """{'param_name': tuple('description', default_value)}"""
+        return {'greedy_add': ('Greedily Add Items After Dropping?', False)}
@@ -0,0 +1,78 @@
+# ahester57
+
+import numpy as np
+
+from binary_knapsack.chromosome import Chromosome
+from binary_knapsack.population_matrix import PopulationMatrix
+from binary_knapsack.test_problem.problem import TestProblem
+
+
+class RepairMethod:
+    """Represents a generic repair method. Does not function as one. Only provides base.
+
+    Repair turns infeasible solutions into feasible ones before they are evaluated,
+    so evaluations are not spent on individuals the penalty method would discard.
+
+    Attributes:
+        problem_instance (TestProblem): The problem whose constraints are repaired.
+    """
+    def __init__(self, problem_instance:TestProblem) -> None:
+        """Initialize the parameters for repair.
+
+        Args:
+            problem_instance (TestProblem): The problem whose constraints are repaired.
+        """
+        assert problem_instance is not None
+        self.problem_instance = problem_instance
+
+    def repair(self, population:list[Chromosome]) -> list[Chromosome]:
+        """Repair every individual not yet evaluated. Evaluated ones were repaired before.
+
+        Args:
+            population (list of Chromosome): The population to act upon.
+
+        Returns:
+            list of Chromosome: The same population, repaired.
+        """
+        pending = [c for c in population if not c.is_evaluated]
+        if len(pending) == 0:
+            return population
+        bitstrings = np.stack([c.bitstring for c in pending])
+        repaired = self.repair_bitstrings(bitstrings)
+        for c, changed, bitstring in zip(pending, (repaired != bitstrings).any(axis=1), repaired):
+            if changed:
+                c.bitstring = bitstring
+        return population
+
+    def repair_matrix(self, population:PopulationMatrix) -> PopulationMatrix:
+        """Repair every row not yet evaluated, in place. Evaluated rows were repaired before.
+
+        Args:
+            population (PopulationMatrix): The population to act upon.
+
+        Returns:
+            PopulationMatrix: The same population, repaired.
+        """
+        pending = np.flatnonzero(np.isnan(population.fitness_scores))
+        if len(pending) == 0:
+            return population
+        bitstrings = population.unpacked_rows(pending)
+        rows, loci = np.nonzero(self.repair_bitstrings(bitstrings) != bitstrings)
+        population.flip(pending[rows], loci)
+        return population
+
+    def repair_bitstrings(self, bitstrings:np.ndarray[np.uint8]) -> np.ndarray[np.uint8]:
+        """Repair a (num_solns x dims) matrix of solutions, all at once.
+
+        Args:
+            bitstrings (np.ndarray of uint8): The solutions. Not modified.
+
+        Returns:
+            np.ndarray of uint8: The repaired solutions. Aligned by row.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def parameters() -> dict[str, tuple]:
+        """{'param_name': tuple('description', default_value)}"""
+        raise NotImplementedError
@@ -0,0 +1,123 @@
+# ahester57
+
+import asyncio
+import numpy as np
+import os
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, NamedTuple
+
+from binary_knapsack.best_of_run import BestOfRun, TargetHit
+from binary_knapsack.chromosome import Chromosome
+from binary_knapsack.ga import GA
+
+
+# GA options of the current worker process. Shipped once per worker by _init_worker.
+_worker_options : dict = None
+
+
+def _init_worker(options:dict) -> None:
+    """Receive the GA options, including the problem instance, once per worker process.
+
+    Args:
+        options (dict): Keyword arguments for GA, excluding rand_seed.
+    """
+    global _worker_options
+    _worker_options = options
+
+
+def _run_one(run_index:int, seed:np.random.SeedSequence) -> tuple[int, BestOfRun, TargetHit]:
+    """Simulate one independent run in a worker process.
+
+    Args:
+        run_index (int): The position of the run in the experiment.
+        seed (np.random.SeedSequence): The run's own seed.
+
+    Returns:
+        tuple[int, BestOfRun, TargetHit]: (run_index, The best-of-run snapshot, When the target fitness was reached)
+    """
+    ga = GA(**_worker_options, rand_seed=seed)
+    asyncio.run(ga.simulate())
+    return run_index, ga.best_of_run_record, ga.target_hit
+
+
+class RunResult(NamedTuple):
+    """The outcome of one independent run.
+
+    Attributes:
+        best_of_run (Chromosome): The best individual found.
+        generation (int): The generation the best individual was found.
+        run_index (int): The position of the run in the experiment. Determines its seed.
+        target_hit (TargetHit): When the run reached the target_fitness option. None if it did not, or none was given.
+    """
+    best_of_run: Chromosome
+    generation: int
+    run_index: int
+    target_hit: TargetHit = None
+
+
+class MultiRunExecutor:
+    """Distributes independent seeded GA runs across a process pool.
+
+    Run i is always seeded with the i-th child of SeedSequence(entropy), so results are
+    reproducible regardless of the number of workers or the order runs complete in.
+
+    Attributes:
+        options (dict): Keyword arguments for GA, excluding rand_seed.
+        num_runs (int): The number of independent runs.
+        entropy (int): Entropy of the root SeedSequence.
+        max_workers (int): The number of worker processes.
+    """
+    def __init__(self,
+        options:dict,
+        num_runs:int=30,
+        entropy:int=None,
+        max_workers:int=None
+    ) -> None:
+        """Initialize a multi-run executor.
+
+        Args:
+            options (dict): Keyword arguments for GA, excluding rand_seed.
+            num_runs (int, optional): The number of independent runs. Default 30.
+            entropy (int, optional): Entropy of the root SeedSequence. Drawn from the OS if not given.
+            max_workers (int, optional): The number of worker processes. Defaults to one per CPU, at most num_runs.
+        """
+        assert type(options) is dict and 'rand_seed' not in options
+        assert num_runs > 0
+        self.options = options
+        self.num_runs = int(num_runs)
+        root = np.random.SeedSequence(entropy)
+        self.entropy = root.entropy
+        self._seeds = root.spawn(self.num_runs)
+        if max_workers is None:
+            max_workers = min(self.num_runs, os.cpu_count() or 1)
+        assert max_workers > 0
+        self.max_workers = int(max_workers)
+
+    def results(self) -> Iterator[RunResult]:
+        """Run every simulation, yielding each result as soon as it completes.
+
+        Yields:
+            RunResult: The outcome of one run. In order of completion.
+        """
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.options,)
+        )
+        try:
+            futures = [executor.submit(_run_one, r, seed) for r, seed in enumerate(self._seeds)]
+            for future in as_completed(futures):
+                run_index, record, target_hit = future.result()
+                yield RunResult(record.chromosome(), record.generation, run_index, target_hit)
+        finally:
+            # stop queued runs if the consumer stops early or a run fails
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(self) -> list[RunResult]:
+        """Run every simulation.
+
+        Returns:
+            list of RunResult: The outcome of every run. In order of run_index.
+        """
+        return sorted(self.results(), key=lambda r:r.run_index)
@@ -8,7 +8,7 @@ class SelectionMechanism:
 
     Attributes:
         random (np.random.Generator): The random number generator.
-        population_fitnesses (tuple of float): The population fitness scores, in order.
+        population_fitnesses (np.ndarray of float64): The population fitness scores, in order.
         sum_of_fitnesses (float, optional): The sum of the populations' fitness scores.
         maximize (bool, optional): (False)[minimize]; (True)[maximize]. Default True.
         pop_size (int): The size of the population.
@@ -31,16 +31,46 @@ class SelectionMechanism:
         assert population_fitnesses is not None
         assert type(random) is np.random.Generator
         self.random = random
-        self.population_fitnesses = population_fitnesses
+        self.population_fitnesses = np.asarray(population_fitnesses, dtype=np.float64)
         self.sum_of_fitnesses = sum_of_fitnesses
         self.maximize = maximize
         if self.sum_of_fitnesses is None:
-            self.sum_of_fitnesses = np.sum(population_fitnesses)
+            self.sum_of_fitnesses = np.sum(self.population_fitnesses)
         self.pop_size = len(self.population_fitnesses)
 
     def next_population(self) -> tuple[int]:
         raise NotImplementedError
 
+    @staticmethod
+    def _generate_cdf(pmf:np.ndarray[np.float64]) -> np.ndarray[np.float64]:
+        """Generate the cumulative distribution of a probability mass function.
+
+        Normalized the same way np.random.Generator.choice normalizes its p.
+
+        Args:
+            pmf (np.ndarray of float64): Probability Mass Function of population's fitness scores.
+
+        Returns:
+            np.ndarray of float64: The cumulative distribution. The last entry is exactly 1.
+        """
+        cdf = np.cumsum(pmf)
+        assert np.isfinite(cdf[-1]) and cdf[-1] > 0
+        cdf /= cdf[-1]
+        return cdf
+
+    def _sample_from_cdf(self, cdf:np.ndarray[np.float64]) -> np.ndarray[np.signedinteger]:
+        """Generate a new index-defined population by roulette-wheel draws from the given distribution.
+
+        Equivalent to self.random.choice(pop_size, size=pop_size, p=pmf), without re-validating the pmf.
+
+        Args:
+            cdf (np.ndarray of float64): Cumulative distribution from _generate_cdf.
+
+        Returns:
+            np.ndarray of int: A population-sized array containing indices of chosen individuals.
+        """
+        return cdf.searchsorted(self.random.random(self.pop_size), side='right')
+
     @staticmethod
     def parameters() -> dict[str, tuple]:
         """{'param_name': tuple('description', default_value)}"""
@@ -40,33 +40,76 @@ class Proportional(SelectionMechanism):
         """
         return self._sample_from_pmf(self._generate_pmf())
 
-    def _generate_pmf(self) -> tuple[float]:
+    def _generate_pmf(self) -> np.ndarray[np.float64]:
         """Generate a probability mass function for given fitnesses.
 
         Returns:
-            tuple of float: A population-sized list containing respective probablities of selection.
+            np.ndarray of float64: A population-sized array containing respective probablities of selection.
         """
         assert self.sum_of_fitnesses > 0
-        pmf = tuple(f / self.sum_of_fitnesses for f in self.population_fitnesses)
-        # TODO: numpy-ify this
+        pmf = self.population_fitnesses / self.sum_of_fitnesses
         if not self.maximize:
             # Minimizing, invert the weights
-            inv_pmf = [1.0 / w for w in pmf]
-            sum_inv_pmf = np.sum(inv_pmf)
-            pmf = tuple(tw / sum_inv_pmf for tw in inv_pmf)
+            inv_pmf = 1.0 / pmf
+            pmf = inv_pmf / np.sum(inv_pmf)
         return pmf
 
-    def _sample_from_pmf(self, pmf:tuple[float]) -> np.ndarray[np.signedinteger]:
+    def _sample_from_pmf(self, pmf:np.ndarray[np.float64]) -> np.ndarray[np.signedinteger]:
         """Generate a new index-defined population by stochastic choice based on the given ranks.
 
         Args:
-            pmf (tuple of float): Probability Mass Function of population's fitness scores.
+            pmf (np.ndarray of float64): Probability Mass Function of population's fitness scores.
 
         Returns:
-            tuple of int: A population-sized list containing indices of chosen individuals.
+            np.ndarray of int: A population-sized array containing indices of chosen individuals.
         """
-        return self.random.choice(self.pop_size, size=self.pop_size, replace=True, p=pmf)
+        return self._sample_from_cdf(self._generate_cdf(pmf))
 
     @staticmethod
     def parameters() -> dict[str, tuple]:
         return {}
+
+
+class StochasticUniversal(Proportional):
+    """Facilitates proportional selection by stochastic universal sampling (SUS).
+
+    One random offset places pop_size evenly spaced pointers on the roulette wheel, so the whole
+    population is drawn with a single random number and the spread of copies is minimal.
+
+    Attributes:
+        random (np.random.Generator): The random number generator.
+        population_fitnesses (tuple of float): The population fitness scores, in order.
+        sum_of_fitnesses (float): The sum of the populations' fitness scores.
+        maximize (bool): (False)[minimize]; (True)[maximize]. Default True.
+        pop_size (int): The size of the population.
+    """
+    def __init__(self,
+        random:np.random.Generator,
+        population_fitnesses:tuple[float],
+        sum_of_fitnesses:float=None,
+        maximize:bool=True,
+        **kwargs
+    ) -> None:
+        """Initialize the parameters for stochastic universal sampling.
+
+        Args:
+            random (np.random.Generator): The random number generator.
+            population_fitnesses (tuple of float): The population fitness scores, in order.
+            sum_of_fitnesses (float, optional): The sum of the populations' fitness scores.
+            maximize (bool, optional): (False)[minimize]; (True)[maximize]. Default True.
+        """
+        super().__init__(random, population_fitnesses, sum_of_fitnesses, maximize, **kwargs)
+
+    def _sample_from_pmf(self, pmf:np.ndarray[np.float64]) -> np.ndarray[np.signedinteger]:
+        """Generate a new index-defined population with evenly spaced pointers.
+
+        Args:
+            pmf (np.ndarray of float64): Probability Mass Function of population's fitness scores.
+
+        Returns:
+            np.ndarray of int: A population-sized array containing indices of chosen individuals. Shuffled.
+        """
+        pointers = (self.random.uniform(0, 1) + np.arange(self.pop_size)) / self.pop_size
+        chosen = self._generate_cdf(pmf).searchsorted(pointers, side='right')
+        # the pointers are sorted; shuffle so crossover does not pair copies of the same individual
+        return self.random.permutation(chosen)
@@ -1,10 +1,30 @@
 # ahester57
 
+import functools
 import numpy as np
 
 from binary_knapsack.selection_mechanism.mechanism import SelectionMechanism
 
 
+# Rank distributions kept, one per (pop_size, max). A sweep over max evicts the least recently used.
+CDF_CACHE_SIZE = 32
+
+
+def _rank_pmf(pop_size:int, max_copies:float) -> np.ndarray[np.float64]:
+    """The probability of selecting each rank, worst first, given the expected copies of the best."""
+    min_copies = 2 - max_copies
+    ranks = np.arange(pop_size, dtype=np.float64)
+    return (min_copies + ranks / (pop_size - 1) * (max_copies - min_copies)) / pop_size
+
+
+@functools.lru_cache(maxsize=CDF_CACHE_SIZE)
+def _rank_cdf(pop_size:int, max_copies:float) -> np.ndarray[np.float64]:
+    """The cumulative distribution of _rank_pmf. Read-only, as it is shared by every run in the process."""
+    cdf = SelectionMechanism._generate_cdf(_rank_pmf(pop_size, max_copies))
+    cdf.setflags(write=False)
+    return cdf
+
+
 class LinearRanking(SelectionMechanism):
     """Facilitates linear ranking selection with replacement.
 
@@ -40,7 +60,6 @@ class LinearRanking(SelectionMechanism):
             self.max = self.parameters()['max'][1]
         assert self.max >= 1 and self.max <= 2
         self.min = 2 - self.max
-        self._max_min = self.max - self.min
 
     def next_population(self) -> tuple[int]:
         """Perform linear ranking selection on the population.
@@ -49,45 +68,36 @@ class LinearRanking(SelectionMechanism):
             tuple of int: An index-defined population after a round of linear ranking selection.
         """
         rank_list = self._generate_linear_ranks()
-        return tuple(rank_list[i] for i in self._sample_from_pmf(self._generate_pmf()))
+        return rank_list[self._sample_from_cdf(self._cached_cdf())]
 
-    def _generate_linear_ranks(self) -> tuple[int]:
-        """Generate a ranked list of members in order of fitness score.
+    def _generate_linear_ranks(self) -> np.ndarray[np.signedinteger]:
+        """Generate a ranked list of members in order of fitness score, worst first.
 
         Returns:
-            tuple of int: A population-sized list containing original index in order of rank.
+            np.ndarray of int: A population-sized array containing original index in order of rank.
         """
-        # TODO: numpy-ify this
         assert self.sum_of_fitnesses > 0
-        sorted_keep_indices = [(i, f) for i, f in enumerate(self.population_fitnesses)]
-        sorted_keep_indices.sort(key=lambda x:x[1], reverse=not self.maximize)
-        return tuple(f[0] for f in sorted_keep_indices)
+        # stable, so ties keep population order exactly as list.sort would
+        if self.maximize:
+            return np.argsort(self.population_fitnesses, kind='stable')
+        return np.argsort(-self.population_fitnesses, kind='stable')
 
-    def _generate_pmf(self) -> tuple[float]:
+    def _generate_pmf(self) -> np.ndarray[np.float64]:
         """Generate a probability mass function for the current population.
 
         Returns:
-            list of tuple: A population-sized list containing pmf for this population.
+            np.ndarray of float64: A population-sized array containing pmf for this population, by rank.
         """
-        # TODO: numpy-ify this
-        return tuple(
-            er / self.pop_size
-            for er in tuple(
-                self.min + (float(rank) / (self.pop_size - 1) * self._max_min)
-                for rank in np.arange(self.pop_size)
-            )
-        )
-
-    def _sample_from_pmf(self, pmf:tuple[float]) -> np.ndarray[np.signedinteger]:
-        """Generate a new index-defined population by stochastic choice based on the given ranks.
+        return _rank_pmf(self.pop_size, self.max)
 
-        Args:
-            pmf (tuple of float): Probability Mass Function of population's fitness scores.
+    def _cached_cdf(self) -> np.ndarray[np.float64]:
+        """Get the cumulative distribution of _generate_pmf. The rank distribution only depends on pop_size and max,
+        so it is computed once per pair, for the CDF_CACHE_SIZE most recent pairs.
 
         Returns:
-            tuple of int: A population-sized list containing indices of chosen individuals.
+            np.ndarray of float64: The cumulative distribution, by rank. Read-only.
         """
-        return self.random.choice(self.pop_size, size=self.pop_size, replace=True, p=pmf)
+        return _rank_cdf(self.pop_size, self.max)
 
     @staticmethod
     def parameters() -> dict[str, tuple]:
@@ -2,8 +2,6 @@
 
 import numpy as np
 
-from collections import deque
-
 from binary_knapsack.selection_mechanism.mechanism import SelectionMechanism
 
 
@@ -16,6 +14,7 @@ class DeterministicTournament(SelectionMechanism):
         sum_of_fitnesses (float): The sum of the populations' fitness scores.
         maximize (bool): (False)[minimize]; (True)[maximize]. Default True.
         pop_size (int): The size of the population.
+        size (int): The number of contenders in each tournament.
     """
     def __init__(self,
         random:np.random.Generator,
@@ -31,43 +30,48 @@ class DeterministicTournament(SelectionMechanism):
             population_fitnesses (tuple of float): The population fitness scores, in order.
             sum_of_fitnesses (float): The sum of the populations' fitness scores.
             maximize (bool): (False)[minimize]; (True)[maximize]. Default True.
+            size (int): The number of contenders in each tournament.
         """
         super().__init__(random, population_fitnesses, sum_of_fitnesses, maximize, **kwargs)
+        if 'size' in kwargs.keys():
+            self.size = int(kwargs['size'])
+        else:
+            self.size = DeterministicTournament.parameters()['size'][1]
+        assert self.size > 0
 
-    def next_population(self) -> tuple[int]:
+    def next_population(self) -> np.ndarray[np.signedinteger]:
         """Perform deterministic tournament selection on the population.
 
+        Every tournament is drawn at once as one (pop_size x size) matrix of contender indices.
+
         Returns:
-            tuple of int: An index-defined population after a round of deterministic tournament selection.
+            np.ndarray of int: An index-defined population after a round of deterministic tournament selection.
         """
-        next_pop = []
-        deque((next_pop.append(self._compete(*self._choose_two())) for i in np.arange(self.pop_size)), maxlen=0)
-        return tuple(next_pop)
+        contenders = self._choose_contenders()
+        return contenders[np.arange(self.pop_size), self._compete(self.population_fitnesses[contenders])]
+
+    def _choose_contenders(self) -> np.ndarray[np.signedinteger]:
+        """Generate a (pop_size x size) matrix of contender indices, uniformly with replacement."""
+        return self.random.integers(0, self.pop_size, size=(self.pop_size, self.size))
 
-    def _choose_two(self) -> int:
-        """Generate a random number representing the index of the chosen individual."""
-        return self.random.choice(np.arange(self.pop_size), size=2, replace=True)
+    def _compete(self, fitnesses:np.ndarray[np.float64]) -> np.ndarray[np.signedinteger]:
+        """Every tournament at once. The fittest contender wins.
 
-    def _compete(self, one:int, two:int) -> int:
-        """Head-to-head combat between two individuals.
+        When maximizing, ties go to the earliest contender. When minimizing, ties go to the latest.
 
         Args:
-            one (int): Index of first contender.
-            one (int): Index of second contender.
+            fitnesses (np.ndarray of float64): (pop_size x size) fitness scores of the contenders.
 
         Returns:
-            int: Index of winner.
+            np.ndarray of int: Column of the winner of each tournament.
         """
-        result = self.population_fitnesses[one] < self.population_fitnesses[two]
         if self.maximize:
-            result = not result
-        if result:
-            return one
-        return two
+            return np.argmax(fitnesses, axis=1)
+        return self.size - 1 - np.argmin(fitnesses[:, ::-1], axis=1)
 
     @staticmethod
     def parameters() -> dict[str, tuple]:
-        return {}
+        return {'size': ('Enter Tournament Size', 2)}
 
 
 class StochasticTournament(DeterministicTournament):
@@ -103,25 +107,24 @@ class StochasticTournament(DeterministicTournament):
         else:
             self.prob = self.parameters()['prob'][1]
         assert self.prob > 0 and self.prob < 1
+        # head-to-head only
+        self.size = 2
 
-    def _compete(self, one:int, two:int) -> int:
-        """Head-to-head combat between two individuals with a chance that the loser wins.
+    def _compete(self, fitnesses:np.ndarray[np.float64]) -> np.ndarray[np.signedinteger]:
+        """Every head-to-head at once, with a chance that the loser wins.
 
         Args:
-            one (int): Index of first contender.
-            one (int): Index of second contender.
+            fitnesses (np.ndarray of float64): (pop_size x 2) fitness scores of the contenders.
 
         Returns:
-            int: Index of winner.
+            np.ndarray of int: Column of the winner of each tournament.
         """
-        result = self.population_fitnesses[one] < self.population_fitnesses[two]
-        if self.random.uniform(0, 1) > self.prob:
-            result = not result
+        result = fitnesses[:, 0] < fitnesses[:, 1]
+        upset = self.random.uniform(0, 1, size=self.pop_size) > self.prob
+        result = result ^ upset
         if self.maximize:
-            result = not result
-        if result:
-            return one
-        return two
+            result = ~result
+        return np.where(result, 0, 1)
 
     @staticmethod
     def parameters() -> dict[str, tuple]:
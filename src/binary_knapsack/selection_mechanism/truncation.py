@@ -46,28 +46,30 @@ class Truncation(SelectionMechanism):
         """
         return self._sample_from_top_tao(self._generate_top_tao())
 
-    def _generate_top_tao(self) -> list[tuple]:
+    def _generate_top_tao(self) -> np.ndarray[np.signedinteger]:
         """Generate a pool of members for reproduction based on top tao% fitness scores.
 
         Returns:
-            list of tuple: A non-population-sized list containing respective indices and fitness scores.
+            np.ndarray of int: A non-population-sized array containing indices of the best, best first.
         """
-        # TODO: numpy-ify this
         assert self.sum_of_fitnesses > 0
-        sorted_keep_indices = [(i, f) for i, f in enumerate(self.population_fitnesses)]
-        sorted_keep_indices.sort(key=lambda x:x[1], reverse=self.maximize)
-        return [tt[0] for tt in sorted_keep_indices[:int(self.pop_size * self.tao)]]
+        # stable, so ties keep population order exactly as list.sort would
+        if self.maximize:
+            ranked = np.argsort(-self.population_fitnesses, kind='stable')
+        else:
+            ranked = np.argsort(self.population_fitnesses, kind='stable')
+        return ranked[:int(self.pop_size * self.tao)]
 
-    def _sample_from_top_tao(self, top_tao:list[tuple]) -> tuple[int]:
+    def _sample_from_top_tao(self, top_tao:np.ndarray[np.signedinteger]) -> np.ndarray[np.signedinteger]:
         """Generate a new index-defined population by stochastic choice based on the given members.
 
         Args:
-            top_tao (list of tuple): Pool of members available for sampling.
+            top_tao (np.ndarray of int): Pool of members available for sampling.
 
         Returns:
-            tuple of int: A population-sized list containing indices of chosen individuals.
+            np.ndarray of int: A population-sized array containing indices of chosen individuals.
         """
-        return self.random.choice(top_tao, size=self.pop_size, replace=True)
+        return top_tao[self.random.integers(0, len(top_tao), size=self.pop_size)]
 
     @staticmethod
     def parameters() -> dict[str, tuple]:
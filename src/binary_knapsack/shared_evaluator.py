@@ -0,0 +1,258 @@
+# ahester57
+
+import numpy as np
+import os
+import weakref
+
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+from binary_knapsack.test_problem.problem import TestProblem
+
+
+# Alleles per chunk of work. Chunks of wide bitstrings hold fewer rows.
+CHUNK_ALLELES = 1 << 20
+
+# The problem instance and attached shared memory of the current worker process.
+_worker_problem : TestProblem = None
+_worker_buffers : dict = {}
+
+
+def _init_worker(problem_instance:TestProblem) -> None:
+    """Receive the problem instance once per worker process.
+
+    Args:
+        problem_instance (TestProblem): The wrapped problem instance.
+    """
+    global _worker_problem
+    _worker_problem = problem_instance
+
+
+def _attach(*names:str) -> list[shared_memory.SharedMemory]:
+    """Attach to shared memory blocks by name, once per worker process. Detaches from any others.
+
+    Args:
+        names (str): The names of the blocks in use.
+
+    Returns:
+        list of shared_memory.SharedMemory: The attached blocks, in order.
+    """
+    for stale in set(_worker_buffers) - set(names):
+        _worker_buffers.pop(stale).close()
+    for name in names:
+        if name not in _worker_buffers:
+            _worker_buffers[name] = shared_memory.SharedMemory(name=name)
+    return [_worker_buffers[name] for name in names]
+
+
+def _evaluate_chunk(
+    solns_name:str,
+    results_name:str,
+    shape:tuple[int, int],
+    cost_width:int,
+    packed:bool,
+    start:int,
+    stop:int
+) -> None:
+    """Evaluate rows [start, stop) of the shared solutions, writing the results in place.
+
+    Args:
+        solns_name (str): The shared memory holding the (capacity x width) solutions.
+        results_name (str): The shared memory holding the (capacity x 1 + cost_width) fitness scores and costs.
+        shape (tuple[int, int]): (capacity, width) of the shared solutions.
+        cost_width (int): The number of fitness costs per solution.
+        packed (bool): Whether the solutions are bit-packed.
+        start (int): The first row of the chunk.
+        stop (int): One past the last row of the chunk.
+    """
+    solns_shm, results_shm = _attach(solns_name, results_name)
+    solns = np.ndarray(shape, dtype=np.uint8, buffer=solns_shm.buf)[start:stop]
+    results = np.ndarray((shape[0], 1 + cost_width), dtype=np.float64, buffer=results_shm.buf)
+    if packed:
+        fitness_scores, fitness_costs = _worker_problem.try_with_packed_bitstrings(solns)
+    elif _worker_problem.supports_batch:
+        fitness_scores, fitness_costs = _worker_problem.try_with_bitstrings(solns)
+    else:
+        for j, soln in enumerate(solns, start):
+            results[j, 0], results[j, 1:] = _worker_problem.try_with_bitstring(soln)
+        return
+    results[start:stop, 0] = fitness_scores
+    results[start:stop, 1:] = np.reshape(fitness_costs, (stop - start, cost_width))
+
+
+def _release(executor:ProcessPoolExecutor, buffers:list[shared_memory.SharedMemory]) -> None:
+    """Stop the workers, then free the shared memory."""
+    executor.shutdown(wait=True, cancel_futures=True)
+    for shm in buffers:
+        shm.close()
+        shm.unlink()
+    buffers.clear()
+
+
+class SharedMemoryEvaluator(TestProblem):
+    """Evaluates batches of solutions on a process pool, through shared memory.
+
+    Wraps another TestProblem, so any population can use it in place of the problem instance.
+    The batch is copied once into shared memory; workers read their chunk of rows and write
+    fitness scores and costs in place, without pickling any arrays. The shared blocks are reused
+    from batch to batch, but the population itself lives in ordinary memory: only the rows to
+    evaluate are copied over. Delta evaluation runs in this process; it costs less than the copy.
+
+    Attributes:
+        problem_instance (TestProblem): The wrapped problem instance.
+        dims (int): The number of items to choose from.
+        max_workers (int): The number of worker processes.
+    """
+    def __init__(self, problem_instance:TestProblem, max_workers:int=None) -> None:
+        """Initialize the worker pool. The problem instance is sent to each worker once.
+
+        Args:
+            problem_instance (TestProblem): The problem instance to wrap.
+            max_workers (int, optional): The number of worker processes. Defaults to one per CPU.
+        """
+        assert problem_instance is not None
+        super().__init__(problem_instance.dims)
+        self.problem_instance = problem_instance
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        assert max_workers > 0
+        self.max_workers = int(max_workers)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(problem_instance,)
+        )
+        self._cost_width = int(np.prod(problem_instance.cost_shape, dtype=np.int64))
+        self._buffers = []
+        self._solns = None
+        self._results = None
+        self._finalizer = weakref.finalize(self, _release, self._executor, self._buffers)
+
+    def try_with_bitstring(self, soln:np.ndarray[np.uint8]) -> tuple:
+        """Evaluate a single bit-string solution in this process."""
+        return self.problem_instance.try_with_bitstring(soln)
+
+    def try_with_bitstrings(self, solns:np.ndarray[np.uint8]) -> tuple[np.ndarray]:
+        """Evaluate a (pop_size x dims) matrix of bit-string solutions on the worker pool."""
+        return self._fan_out(solns, False)
+
+    def try_with_packed_bitstrings(self, packed:np.ndarray[np.uint8]) -> tuple[np.ndarray]:
+        """Evaluate a matrix of bit-packed solutions on the worker pool."""
+        return self._fan_out(packed, True)
+
+    def try_with_flips(self,
+        fitness_scores:np.ndarray[np.float64],
+        fitness_costs:np.ndarray[np.float64],
+        rows:np.ndarray[np.signedinteger],
+        loci:np.ndarray[np.signedinteger],
+        alleles:np.ndarray[np.uint8]
+    ) -> tuple[np.ndarray]:
+        """Delta-evaluate solutions in this process."""
+        return self.problem_instance.try_with_flips(fitness_scores, fitness_costs, rows, loci, alleles)
+
+    def chunk_size(self, num_rows:int) -> int:
+        """The number of rows per chunk of work.
+
+        At most CHUNK_ALLELES alleles per chunk, but at least one chunk per worker.
+
+        Args:
+            num_rows (int): The number of rows to evaluate.
+
+        Returns:
+            int: Rows per chunk.
+        """
+        return max(1, min(CHUNK_ALLELES // self.dims, -(-num_rows // self.max_workers)))
+
+    def close(self) -> None:
+        """Stop the worker pool and free the shared memory."""
+        # views must go before their buffers can be closed
+        self._solns = None
+        self._results = None
+        self._finalizer()
+
+    def _fan_out(self, solns:np.ndarray[np.uint8], packed:bool) -> tuple[np.ndarray]:
+        """Copy the solutions into shared memory, then evaluate them chunk by chunk on the worker pool.
+
+        Args:
+            solns (np.ndarray of uint8): The (num_rows x width) solutions.
+            packed (bool): Whether the solutions are bit-packed.
+
+        Returns:
+            tuple[np.ndarray]: (fitness_scores, fitness_costs)
+        """
+        assert self._finalizer.alive
+        num_rows = len(solns)
+        chunk = self.chunk_size(num_rows)
+        if num_rows <= chunk:
+            # not worth the round trip
+            if packed:
+                return self.problem_instance.try_with_packed_bitstrings(solns)
+            return self._evaluate_here(solns)
+        self._reserve(num_rows, solns.shape[1])
+        self._solns[:num_rows] = solns
+        futures = [
+            self._executor.submit(
+                _evaluate_chunk,
+                self._buffers[0].name,
+                self._buffers[1].name,
+                self._solns.shape,
+                self._cost_width,
+                packed,
+                start,
+                min(start + chunk, num_rows)
+            )
+            for start in range(0, num_rows, chunk)
+        ]
+        wait(futures)
+        for future in futures:
+            future.result()
+        fitness_costs = self._results[:num_rows, 1:].reshape(num_rows, *self.cost_shape)
+        return self._results[:num_rows, 0].copy(), fitness_costs.copy()
+
+    def _evaluate_here(self, solns:np.ndarray[np.uint8]) -> tuple[np.ndarray]:
+        """Evaluate unpacked solutions in this process."""
+        if self.problem_instance.supports_batch:
+            return self.problem_instance.try_with_bitstrings(solns)
+        fitness_scores, fitness_costs = zip(*(self.problem_instance.try_with_bitstring(soln) for soln in solns))
+        return np.array(fitness_scores), np.array(fitness_costs)
+
+    def _reserve(self, num_rows:int, width:int) -> None:
+        """Make sure the shared memory fits (num_rows x width) solutions. Reallocates when too small.
+
+        Args:
+            num_rows (int): The number of rows to evaluate.
+            width (int): Bytes per row.
+        """
+        if self._solns is not None and self._solns.shape[1] == width and len(self._solns) >= num_rows:
+            return
+        capacity = max(num_rows, 0 if self._solns is None else len(self._solns))
+        self._solns = None
+        self._results = None
+        for shm in self._buffers:
+            shm.close()
+            shm.unlink()
+        self._buffers[:] = [
+            shared_memory.SharedMemory(create=True, size=capacity * width),
+            shared_memory.SharedMemory(create=True, size=capacity * (1 + self._cost_width) * np.dtype(np.float64).itemsize)
+        ]
+        self._solns = np.ndarray((capacity, width), dtype=np.uint8, buffer=self._buffers[0].buf)
+        self._results = np.ndarray((capacity, 1 + self._cost_width), dtype=np.float64, buffer=self._buffers[1].buf)
+
+    @property
+    def supports_delta(self) -> bool:
+        return self.problem_instance.supports_delta
+
+    @property
+    def cost_shape(self) -> tuple[int, ...]:
+        return self.problem_instance.cost_shape
+
+    @property
+    def constraints(self) -> dict:
+        """{'chromosome_attribute': max_limit}"""
+        return self.problem_instance.constraints
+
+    def __enter__(self) -> 'SharedMemoryEvaluator':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
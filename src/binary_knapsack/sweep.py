@@ -0,0 +1,404 @@
+# ahester57
+
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import math
+import sys
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, NamedTuple
+
+from binary_knapsack.experiment import build_problem, ga_options, read_spec_file, resolve
+from binary_knapsack.ga import GA
+
+
+METHODS = ('grid', 'random')
+
+# Problem instances of the current worker process, by their [problem] spec. Shipped once per worker by _init_worker.
+_worker_problems : dict = None
+
+
+def _init_worker(problems:dict) -> None:
+    """Receive every problem instance of the sweep, once per worker process.
+
+    Args:
+        problems (dict): {'problem spec as JSON': TestProblem}.
+    """
+    global _worker_problems
+    _worker_problems = problems
+
+
+def _simulate(key:int, problem:str, options:dict, seed:np.random.SeedSequence) -> tuple[int, float, str, int]:
+    """Simulate one seeded run of one configuration in a worker process.
+
+    A run scores the objective of its best feasible solution. The penalized fitness of an infeasible
+    one depends on the penalty parameters being swept, so a run with no feasible solution fails.
+
+    Args:
+        key (int): The configuration's position in the sweep.
+        problem (str): The configuration's problem, as a key of the worker's problem instances. See _init_worker.
+        options (dict): Keyword arguments for GA, excluding problem_instance and rand_seed.
+        seed (np.random.SeedSequence): The run's own seed.
+
+    Returns:
+        tuple[int, float, str, int]: (key, The best feasible objective, The error if the run failed, else None,
+            The generations completed, fewer than t_max if the population converged or the run failed)
+    """
+    generations = 0
+    try:
+        ga = GA(**options, problem_instance=_worker_problems[problem], rand_seed=seed)
+
+        async def simulate():
+            nonlocal generations
+            # the first snapshot is the initial population; every later one follows a generation
+            async for snapshot in ga.generations():
+                generations += snapshot.generation > 0
+
+        asyncio.run(simulate())
+        if not ga.best_of_run_is_feasible:
+            return key, np.nan, f'no feasible solution in {generations} generations', generations
+        return key, float(ga.best_of_run_record.fitness_score), None, generations
+    except Exception as e:
+        return key, np.nan, f'{type(e).__name__}: {e}', generations
+
+
+class ConfigResult(NamedTuple):
+    """The outcome of one configuration on one rung of successive halving.
+
+    Attributes:
+        key (int): The configuration's position in the sweep.
+        spec (dict): The resolved spec. Its t_max is that of the final rung.
+        assignment (dict): {'section.param': value} drawn for this configuration.
+        rung (int): The rung, from 0.
+        t_max (int): The generations each run was given on this rung. A run whose population converges stops early.
+        score (float): The mean best feasible objective over the runs. NaN if any run failed or found no feasible solution.
+        fitness_scores (tuple of float): Each run's best feasible objective, in order of run_index.
+        promoted (bool): Whether the configuration survived to the next rung.
+        error (str): The first error raised by a run, or why it failed. None if every run finished.
+    """
+    key: int
+    spec: dict
+    assignment: dict
+    rung: int
+    t_max: int
+    score: float
+    fitness_scores: tuple
+    promoted: bool
+    error: str = None
+
+
+def expand_grid(space:dict) -> list[dict]:
+    """Every combination of the values of a search space.
+
+    Args:
+        space (dict): {'section.param': [values]} or {'section.param': {'low', 'high', 'num'[, 'log']}}
+
+    Returns:
+        list of dict: One {'section.param': value} per combination.
+    """
+    axes = {path: _grid_values(path, values) for path, values in space.items()}
+    return [dict(zip(axes, combination)) for combination in itertools.product(*axes.values())]
+
+
+def sample_random(space:dict, num_samples:int, random:np.random.Generator, types:dict) -> list[dict]:
+    """Draw configurations independently and uniformly from a search space.
+
+    Args:
+        space (dict): {'section.param': [values]} or {'section.param': {'low', 'high'[, 'log']}}
+        num_samples (int): The number of configurations.
+        random (np.random.Generator): The random number generator.
+        types (dict): {'section.param': type of its default}. Integer parameters draw integers in [low, high].
+
+    Returns:
+        list of dict: One {'section.param': value} per configuration.
+    """
+    assert num_samples > 0
+    samples = [{} for _ in range(num_samples)]
+    for path, values in space.items():
+        if isinstance(values, list):
+            draws = [values[i] for i in random.integers(len(values), size=num_samples)]
+        elif isinstance(values, dict) and values.keys() <= {'low', 'high', 'log'} and {'low', 'high'} <= values.keys():
+            low, high = values['low'], values['high']
+            if values.get('log', False):
+                draws = np.exp(random.uniform(np.log(low), np.log(high), size=num_samples))
+                if types[path] is int:
+                    draws = np.rint(draws).astype(int)
+            elif types[path] is int:
+                draws = random.integers(low, high, size=num_samples, endpoint=True)
+            else:
+                draws = random.uniform(low, high, size=num_samples)
+            draws = [v.item() for v in draws]
+        else:
+            raise ValueError(f'{path}: expected a list of values or {{low, high[, log]}}, not {values!r}')
+        for sample, v in zip(samples, draws):
+            sample[path] = v
+    return samples
+
+
+def assign(spec:dict, assignment:dict) -> dict:
+    """Overlay {'section.param': value} on a copy of a spec."""
+    spec = copy.deepcopy(spec)
+    for path, value in assignment.items():
+        section, _, param = path.partition('.')
+        if not param:
+            raise ValueError(f'{path}: expected section.param, e.g., ga.p_m')
+        spec.setdefault(section, {})[param] = value
+    return spec
+
+
+def _grid_values(path:str, values) -> list:
+    """The values of one grid axis. Ranges are spaced evenly, or geometrically if 'log'."""
+    if isinstance(values, list) and len(values) > 0:
+        return values
+    if isinstance(values, dict) and values.keys() <= {'low', 'high', 'num', 'log'} and {'low', 'high', 'num'} <= values.keys():
+        spaced = np.geomspace if values.get('log', False) else np.linspace
+        points = spaced(values['low'], values['high'], int(values['num']))
+        if all(type(values[k]) is int for k in ('low', 'high')):
+            points = np.unique(np.rint(points).astype(int))
+        return [v.item() for v in points]
+    raise ValueError(f'{path}: expected a non-empty list of values or {{low, high, num[, log]}}, not {values!r}')
+
+
+class SuccessiveHalving:
+    """Races configurations on growing budgets, keeping the best 1/eta of them after each rung.
+
+    With R rungs after the first, rung r simulates t_max / eta^(R - r) generations per run, so most
+    configurations are dropped after a small fraction of t_max. Every configuration runs with the same
+    num_runs seeds, children of SeedSequence(entropy), so they are compared on common random numbers.
+    Each rung restarts its survivors from generation 0; a run's first generations do not depend on t_max.
+
+    Attributes:
+        specs (list of dict): The resolved spec of each configuration.
+        assignments (list of dict): {'section.param': value} of each configuration. Aligned by index.
+        eta (int): The reduction factor. Keep ceil(n / eta) configurations after each rung.
+        maximize (bool): (False)[minimize]; (True)[maximize] the mean best feasible objective.
+        num_rungs (int): The number of rungs, including the last one at the full t_max.
+        budgets (list of int): t_max of each rung.
+        num_runs (int): Seeded runs per configuration per rung.
+        entropy (int): Entropy of the root SeedSequence.
+        max_workers (int): The number of worker processes.
+        generations (int): The number of generations completed so far, over every run. Converged runs stop early.
+    """
+    def __init__(self,
+        specs:list[dict],
+        assignments:list[dict]=None,
+        eta:int=3,
+        min_t_max:int=1,
+        max_workers:int=None
+    ) -> None:
+        """Initialize the rungs of a sweep.
+
+        Every spec must share num_runs, entropy, maximize and t_max; these are taken from the first.
+
+        Args:
+            specs (list of dict): The spec of each configuration. Resolved if they are not already.
+            assignments (list of dict, optional): {'section.param': value} of each configuration, for reporting.
+            eta (int, optional): The reduction factor. Default 3.
+            min_t_max (int, optional): The fewest generations of the first rung. Default 1.
+            max_workers (int, optional): The number of worker processes. Defaults to one per CPU.
+        """
+        assert len(specs) > 0
+        assert eta > 1 and min_t_max > 0
+        self.specs = [resolve(spec) for spec in specs]
+        self.assignments = assignments if assignments is not None else [{} for _ in specs]
+        assert len(self.assignments) == len(self.specs)
+        first = self.specs[0]
+        for spec in self.specs:
+            assert spec['num_runs'] == first['num_runs'] and spec['entropy'] == first['entropy']
+            assert spec['ga']['maximize'] == first['ga']['maximize'] and spec['ga']['t_max'] == first['ga']['t_max']
+        self.eta = int(eta)
+        self.maximize = first['ga']['maximize']
+        t_max = first['ga']['t_max']
+        # enough rungs to whittle the configurations down to one, but no rung below min_t_max
+        self.num_rungs = 1 + min(
+            int(math.log(len(self.specs), self.eta) + 1e-9),
+            int(math.log(max(t_max / min_t_max, 1), self.eta) + 1e-9)
+        )
+        self.budgets = [max(min_t_max, round(t_max / self.eta ** (self.num_rungs - 1 - r))) for r in range(self.num_rungs)]
+        self.num_runs = first['num_runs']
+        root = np.random.SeedSequence(first['entropy'])
+        self.entropy = root.entropy
+        self._seeds = root.spawn(self.num_runs)
+        self.max_workers = max_workers
+        self.generations = 0
+
+    def rungs(self) -> Iterator[list[ConfigResult]]:
+        """Race the configurations, yielding each rung once all of its runs complete.
+
+        Yields:
+            list of ConfigResult: The configurations raced on a rung. Best first.
+        """
+        survivors = list(range(len(self.specs)))
+        # configurations on the same problem share one instance, sent to each worker once
+        problem_keys = [json.dumps(spec['problem'], sort_keys=True) for spec in self.specs]
+        problems = {}
+        for key, problem in enumerate(problem_keys):
+            if problem not in problems:
+                problems[problem] = build_problem(self.specs[key])
+        options = {}
+        for key, spec in enumerate(self.specs):
+            # the rest of the options are small; they travel with each run
+            options[key] = ga_options(spec, problems[problem_keys[key]])
+            del options[key]['problem_instance']
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker, initargs=(problems,)) as executor:
+            for rung, t_max in enumerate(self.budgets):
+                futures = {
+                    executor.submit(_simulate, key, problem_keys[key], {**options[key], 't_max': t_max}, seed): run_index
+                    for key in survivors
+                    for run_index, seed in enumerate(self._seeds)
+                }
+                fitness_scores = {key: [None] * self.num_runs for key in survivors}
+                errors = {}
+                for future in as_completed(futures):
+                    key, fitness_score, error, generations = future.result()
+                    fitness_scores[key][futures[future]] = fitness_score
+                    self.generations += generations
+                    if error is not None:
+                        errors.setdefault(key, error)
+                scores = {key: float(np.mean(fitness_scores[key])) for key in survivors}
+                ranked = sorted(survivors, key=lambda key: self._rank(scores[key]))
+                if rung + 1 < self.num_rungs:
+                    survivors = [key for key in ranked[:math.ceil(len(ranked) / self.eta)] if not np.isnan(scores[key])]
+                else:
+                    survivors = []
+                yield [
+                    ConfigResult(
+                        key,
+                        self.specs[key],
+                        self.assignments[key],
+                        rung,
+                        t_max,
+                        scores[key],
+                        tuple(fitness_scores[key]),
+                        key in survivors,
+                        errors.get(key)
+                    )
+                    for key in ranked
+                ]
+                if len(survivors) == 0:
+                    return
+
+    def run(self) -> list[ConfigResult]:
+        """Race the configurations.
+
+        Returns:
+            list of ConfigResult: The configurations raced on the last rung reached. Best first.
+        """
+        final = None
+        for final in self.rungs():
+            pass
+        return final
+
+    @property
+    def exhaustive_generations(self) -> int:
+        """The generations simulating every configuration to the full t_max would take."""
+        return len(self.specs) * self.num_runs * self.budgets[-1]
+
+    def _rank(self, score:float) -> float:
+        """Sort key putting the best score first and failed configurations last."""
+        if np.isnan(score):
+            return np.inf
+        return -score if self.maximize else score
+
+
+def load_sweep(path:str, seed:int=None) -> tuple[list[dict], list[dict], dict]:
+    """Read a sweep file: a spec as for binary_knapsack.experiment, plus a [sweep] section.
+
+    [sweep] holds method ('grid' or 'random'), num_samples (random only), eta, min_t_max, seed,
+    and space: {'section.param': values}, where each param is one of its class's parameters()
+    or a [ga] option.
+
+    Args:
+        path (str): The sweep file. TOML if it ends in '.toml', else JSON.
+        seed (int, optional): Overrides the seed of random search.
+
+    Returns:
+        tuple[list of dict, list of dict, dict]: (The spec of each configuration, Their assignments, The [sweep] settings)
+    """
+    base = read_spec_file(path)
+    settings = base.pop('sweep', None)
+    if settings is None or 'space' not in settings:
+        raise ValueError(f'{path}: missing [sweep] section with a space')
+    unknown = set(settings) - {'method', 'num_samples', 'eta', 'min_t_max', 'seed', 'space'}
+    if unknown:
+        raise ValueError(f'{path}: unknown [sweep] keys {sorted(unknown)}')
+    method = settings.get('method', 'grid')
+    if method not in METHODS:
+        raise ValueError(f'{path}: unknown sweep method {method!r}; expected one of {METHODS}')
+    space = settings['space']
+    # each parameter keeps the type of its default, as published by parameters()
+    defaults = resolve(base)
+    types = {}
+    for key in space:
+        section, _, param = key.partition('.')
+        if not isinstance(defaults.get(section), dict) or param not in defaults[section] or param == 'class':
+            raise ValueError(f'{path}: {key} is not a parameter of the base spec')
+        types[key] = type(defaults[section][param])
+    if method == 'grid':
+        assignments = expand_grid(space)
+    else:
+        random = np.random.default_rng(settings.get('seed') if seed is None else seed)
+        assignments = sample_random(space, int(settings.get('num_samples', 27)), random, types)
+    specs = [resolve(assign(base, assignment)) for assignment in assignments]
+    return specs, assignments, settings
+
+
+def main(argv:list[str]=None) -> int:
+    """Run a parameter sweep with successive halving, appending one JSON line per configuration per rung.
+
+    Args:
+        argv (list of str, optional): The command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m binary_knapsack.sweep',
+        description='Tune GA parameters by grid or random search, dropping poor configurations early.'
+    )
+    parser.add_argument('sweep', help='sweep file; TOML if ending in .toml, else JSON')
+    parser.add_argument('-o', '--output', help='append one JSON line per configuration per rung here')
+    parser.add_argument('--max-workers', type=int, help='worker processes; defaults to one per CPU')
+    parser.add_argument('--seed', type=int, help='overrides the seed of random search')
+    parser.add_argument('--check', action='store_true', help='print the configurations and rungs, without running')
+    args = parser.parse_args(argv)
+
+    specs, assignments, settings = load_sweep(args.sweep, args.seed)
+    halving = SuccessiveHalving(
+        specs,
+        assignments,
+        settings.get('eta', 3),
+        settings.get('min_t_max', 1),
+        args.max_workers
+    )
+    print(f'{len(specs)} configurations; t_max per rung {halving.budgets}', file=sys.stderr)
+    if args.check:
+        for assignment in assignments:
+            print(json.dumps(assignment))
+        return 0
+    if args.output is None:
+        # runs print their progress to stdout, so results need a file of their own
+        parser.error('the following arguments are required: -o/--output')
+
+    best = None
+    with open(args.output, 'a') as f:
+        for results in halving.rungs():
+            for result in results:
+                f.write(json.dumps({**result._asdict(), 'entropy': halving.entropy}) + '\n')
+            f.flush()
+            best = results[0]
+            print(f'Rung {best.rung} (t_max={best.t_max}): {len(results)} raced, '
+                f'best {best.score} with {best.assignment}', file=sys.stderr)
+    print(f'Best: {json.dumps(best.assignment)} scored {best.score}', file=sys.stderr)
+    print(f'Simulated {halving.generations} generations; '
+        f'{halving.exhaustive_generations} without halving', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
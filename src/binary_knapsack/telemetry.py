@@ -0,0 +1,240 @@
+# ahester57
+
+import numpy as np
+import os
+import struct
+
+from binary_knapsack.profiling import STAGES, ProfilingHook
+
+
+# Every column file starts with a fixed-size .npy header, so the row count can be rewritten in place.
+HEADER_SIZE = 128
+
+# One column per field; each is its own .npy file.
+TELEMETRY_DTYPE = np.dtype([
+    ('t', np.int64),
+    ('high_fitness', np.float64),
+    ('low_fitness', np.float64),
+    ('average_fitness', np.float64),
+    ('std_fitness', np.float64),
+    ('best_fitness', np.float64),
+    ('best_cost', np.float64),  # the largest, for multi-constraint problems
+    ('best_generation', np.int64),
+    ('mean_hamming_distance', np.float64),
+    ('evaluations', np.int64),
+    *((f'seconds_{stage}', np.float64) for stage in STAGES)
+])
+
+
+def _header(dtype:np.dtype, count:int) -> bytes:
+    """A version 1.0 .npy header for a 1-D array of count entries, padded to HEADER_SIZE bytes."""
+    text = repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (count,)})
+    prefix = np.lib.format.magic(1, 0) + struct.pack('<H', HEADER_SIZE - 10)
+    return prefix + text.encode('latin1').ljust(HEADER_SIZE - len(prefix) - 1) + b'\n'
+
+
+def _read_count(f, dtype:np.dtype) -> int:
+    """The row count in the header of an open column file written by ColumnarTelemetry."""
+    f.seek(0)
+    if np.lib.format.read_magic(f) != (1, 0):
+        raise ValueError(f'{f.name}: not a telemetry column')
+    shape, _, descr = np.lib.format.read_array_header_1_0(f)
+    if descr != dtype or len(shape) != 1 or f.tell() != HEADER_SIZE:
+        raise ValueError(f'{f.name}: not a telemetry column of {dtype}')
+    return shape[0]
+
+
+def load_telemetry(path:str, mmap_mode:str='r') -> dict[str, np.ndarray]:
+    """Open every column of a telemetry log.
+
+    Args:
+        path (str): The directory written by ColumnarTelemetry.
+        mmap_mode (str, optional): See np.load. Default 'r', i.e., memory-mapped, read-only. None reads into memory.
+
+    Returns:
+        dict: {'column_name': np.ndarray} of the records flushed so far. In TELEMETRY_DTYPE order.
+    """
+    return {
+        name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+        for name in TELEMETRY_DTYPE.names
+    }
+
+
+class TelemetrySink:
+    """Receives one record per generation. Does not record anything. Only provides base.
+
+    Attributes:
+        count (int): The number of records received so far. Checkpoints store it; see truncate.
+    """
+    count : int = 0
+
+    def record(self, ga) -> None:
+        """Record the current generation of a GA.
+
+        Args:
+            ga (GA): The genetic algorithm, after evaluating a generation.
+        """
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Persist any buffered records. Called when a run finishes."""
+        pass
+
+    def truncate(self, count:int) -> None:
+        """Drop the records after the first count, e.g., those written after the checkpoint a run resumes from.
+
+        Args:
+            count (int): The records to keep.
+        """
+        pass
+
+    def close(self) -> None:
+        """Flush, then release any resources held."""
+        self.flush()
+
+
+class ColumnarTelemetry(TelemetrySink, ProfilingHook):
+    """Appends per-generation records to one .npy file per column.
+
+    Records are buffered and written in batches of buffer_size, so memory stays bounded however
+    long the run. Each flush appends to every column and rewrites its header with the new row
+    count, so the log can be memory-mapped with np.load, or load_telemetry, at any time.
+
+    Stage timings are recorded when this sink is also given to the GA as its profiler.
+    A stage which did not run in a generation is recorded as NaN.
+
+    Opened with append=True, the log continues after the records already flushed to its column files,
+    e.g., for a run resumed with GA.resume, which truncates it back to its checkpoint.
+
+    Attributes:
+        path (str): The directory holding the column files.
+        buffer_size (int): Records per batch.
+        diversity (bool): Record the mean pairwise Hamming distance. NaN otherwise.
+        count (int): The number of records written so far, including buffered ones.
+    """
+    def __init__(self, path:str, buffer_size:int=4096, diversity:bool=False, append:bool=False) -> None:
+        """Create an empty telemetry log, or continue one.
+
+        Args:
+            path (str): The directory to hold the column files. Created if missing.
+            buffer_size (int, optional): Records per batch. Default 4096.
+            diversity (bool, optional): Record the mean pairwise Hamming distance. Default False.
+            append (bool, optional): Continue after the records in existing column files, rather than truncate them. Default False.
+        """
+        assert buffer_size > 0
+        assert diversity in (False, True)
+        assert append in (False, True)
+        self.path = path
+        self.buffer_size = int(buffer_size)
+        self.diversity = diversity
+        self.count = 0
+        self._buffer = np.empty(self.buffer_size, dtype=TELEMETRY_DTYPE)
+        self._pending = 0
+        self._flushed = 0
+        self._stage_seconds = np.full(len(STAGES), np.nan)
+        self._stage_index = {stage: i for i, stage in enumerate(STAGES)}
+        os.makedirs(self.path, exist_ok=True)
+        self._files = {}
+        counts = []
+        for name in TELEMETRY_DTYPE.names:
+            column_path = os.path.join(self.path, f'{name}.npy')
+            if append and os.path.exists(column_path):
+                f = open(column_path, 'r+b')
+                self._files[name] = f
+                counts.append(_read_count(f, TELEMETRY_DTYPE[name]))
+            else:
+                f = open(column_path, 'w+b')
+                f.write(_header(TELEMETRY_DTYPE[name], 0))
+                self._files[name] = f
+                counts.append(0)
+        # a run killed mid-flush may have updated some headers but not others
+        self._flushed = self.count = min(counts)
+        if self._flushed < max(counts):
+            self._rewind(self._flushed)
+
+    def on_stage(self, stage:str, seconds:float, evaluations:int) -> None:
+        """Accumulate the wall-time of a stage into the current generation's record."""
+        i = self._stage_index[stage]
+        if np.isnan(self._stage_seconds[i]):
+            self._stage_seconds[i] = 0.0
+        self._stage_seconds[i] += seconds
+
+    def record(self, ga) -> None:
+        """Buffer a record of the current generation, flushing when the buffer is full.
+
+        Args:
+            ga (GA): The genetic algorithm, after evaluating a generation.
+        """
+        assert self._files, 'telemetry log is closed'
+        stats = ga.population.statistics(self.diversity)
+        best = ga.best_of_run_record
+        # one tuple assignment, in TELEMETRY_DTYPE order, is much cheaper than a write per field
+        self._buffer[self._pending] = (
+            ga.t,
+            stats.high_fitness,
+            stats.low_fitness,
+            stats.average_fitness,
+            stats.std_fitness,
+            best.fitness_score,
+            best.fitness_cost.max(),
+            best.generation,
+            np.nan if stats.mean_hamming_distance is None else stats.mean_hamming_distance,
+            ga.evaluations,
+            *self._stage_seconds.tolist()
+        )
+        self._stage_seconds[:] = np.nan
+        self._pending += 1
+        self.count += 1
+        if self._pending == self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append the buffered records to every column, then update each header's row count."""
+        if self._pending == 0 or not self._files:
+            return
+        batch = self._buffer[:self._pending]
+        offset = self._flushed
+        self._flushed += self._pending
+        for name, f in self._files.items():
+            # after the rows counted in the header; anything beyond them was never counted
+            f.seek(HEADER_SIZE + offset * TELEMETRY_DTYPE[name].itemsize)
+            f.write(np.ascontiguousarray(batch[name]).tobytes())
+            f.truncate()
+            f.seek(0)
+            f.write(_header(TELEMETRY_DTYPE[name], self._flushed))
+            f.flush()
+        self._pending = 0
+
+    def truncate(self, count:int) -> None:
+        """Drop the records after the first count, e.g., those written after the checkpoint a run resumes from.
+
+        Args:
+            count (int): The records to keep. A log holding fewer is left as is.
+        """
+        assert self._files, 'telemetry log is closed'
+        assert count >= 0
+        self.flush()
+        if count < self.count:
+            self._rewind(count)
+
+    def _rewind(self, count:int) -> None:
+        """Cut every column file back to its first count rows. Nothing may be buffered."""
+        self._flushed = self.count = count
+        for name, f in self._files.items():
+            f.truncate(HEADER_SIZE + count * TELEMETRY_DTYPE[name].itemsize)
+            f.seek(0)
+            f.write(_header(TELEMETRY_DTYPE[name], count))
+            f.flush()
+
+    def close(self) -> None:
+        """Flush, then close every column file."""
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def __enter__(self) -> 'ColumnarTelemetry':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,226 @@
+# ahester57
+
+import numpy as np
+import os
+
+from binary_knapsack.test_problem.knapsack import BinaryKnapsack
+from binary_knapsack.test_problem.problem import TestProblem
+
+
+def read_pisinger(path:str, instance:int=0) -> tuple:
+    """Read an instance in Pisinger's format. A file may hold several instances, separated by '-----'.
+
+        knapPI_1_50_1000_1
+        n 50
+        c 995
+        z 8373
+        time 0.00
+        1,94,485,0
+        ...
+
+    Item lines are 'index,profit,weight,in_optimum'.
+
+    Args:
+        path (str): The instance file.
+        instance (int, optional): The position of the instance in the file. Default 0.
+
+    Returns:
+        tuple: (profits (n,), weights (1 x n), capacities (1,), The optimal profit or None)
+    """
+    with open(path) as f:
+        blocks = [[]]
+        for line in f:
+            line = line.strip()
+            if line.startswith('-----'):
+                blocks.append([])
+            elif line:
+                blocks[-1].append(line)
+    blocks = [block for block in blocks if block]
+    if not 0 <= instance < len(blocks):
+        raise ValueError(f'{path}: no instance {instance}; the file holds {len(blocks)}')
+    header = {}
+    items = []
+    for line in blocks[instance][1:]:
+        if ',' in line:
+            items.append([float(v) for v in line.split(',')[1:3]])
+        else:
+            key, value = line.split(maxsplit=1)
+            header[key] = value
+    items = np.array(items, dtype=np.float64).reshape(-1, 2)
+    if len(items) != int(header['n']):
+        raise ValueError(f'{path}: instance {instance} lists {len(items)} items, not n={header["n"]}')
+    optimum = float(header['z']) if 'z' in header else None
+    return items[:, 0], items[:, 1][np.newaxis], np.array([float(header['c'])]), optimum
+
+
+def read_plain(path:str, instance:int=0) -> tuple:
+    """Read an instance as 'n capacity' followed by one 'profit weight' line per item.
+
+    Args:
+        path (str): The instance file.
+        instance (int, optional): Must be 0. Plain files hold one instance.
+
+    Returns:
+        tuple: (profits (n,), weights (1 x n), capacities (1,), None)
+    """
+    if instance != 0:
+        raise ValueError(f'{path}: plain instance files hold a single instance')
+    values = np.loadtxt(path, dtype=np.float64, ndmin=2)
+    n, capacity = int(values[0, 0]), values[0, 1]
+    items = values[1:n + 1]
+    if len(items) != n:
+        raise ValueError(f'{path}: lists {len(items)} items, not n={n}')
+    return items[:, 0], items[:, 1][np.newaxis], np.array([capacity]), None
+
+
+def read_orlib(path:str, instance:int=0) -> tuple:
+    """Read an instance in the OR-Library multidimensional knapsack format (mknap1, mknapcb*).
+
+    The file starts with the number of instances. Each instance is 'n m optimum', then the n profits,
+    the m rows of n weights, then the m capacities. An optimum of 0 means it is unknown.
+
+    Args:
+        path (str): The instance file.
+        instance (int, optional): The position of the instance in the file. Default 0.
+
+    Returns:
+        tuple: (profits (n,), weights (m x n), capacities (m,), The optimal profit or None)
+    """
+    with open(path) as f:
+        tokens = np.array(f.read().split(), dtype=np.float64)
+    num_instances = int(tokens[0])
+    if not 0 <= instance < num_instances:
+        raise ValueError(f'{path}: no instance {instance}; the file holds {num_instances}')
+    at = 1
+    for i in range(instance + 1):
+        n, m, optimum = int(tokens[at]), int(tokens[at + 1]), tokens[at + 2]
+        start = at + 3
+        at = start + n + m * n + m
+    profits = tokens[start:start + n]
+    weights = tokens[start + n:start + n + m * n].reshape(m, n)
+    capacities = tokens[start + n + m * n:at]
+    return profits, weights, capacities, float(optimum) if optimum > 0 else None
+
+
+# {format: reader}. Each returns (profits, weights, capacities, optimum).
+READERS = {
+    'pisinger': read_pisinger,
+    'plain': read_plain,
+    'orlib': read_orlib
+}
+
+
+def detect_format(path:str) -> str:
+    """Guess the format of an instance file from its suffix, else from its first line.
+
+    Returns:
+        str: 'npy', or one of READERS.
+    """
+    if path.endswith('.npy'):
+        return 'npy'
+    with open(path) as f:
+        first = next((line.split() for line in f if line.strip()), [])
+    try:
+        [float(token) for token in first]
+    except ValueError:
+        return 'pisinger'
+    if len(first) == 1:
+        return 'orlib'
+    if len(first) == 2:
+        return 'plain'
+    raise ValueError(f'{path}: unrecognized instance format')
+
+
+class FileKnapsack(BinaryKnapsack):
+    """A 0/1 Knapsack Problem read from an instance file rather than generated.
+
+    Reads Pisinger's format, OR-Library's (single constraint), plain 'profit weight' lists, and
+    (dims x 2) float64 .npy tables of (profit, weight) rows. A .npy table is memory-mapped on first
+    use, never read up front; pickling sends only its path, so every worker process maps the same
+    file and shares its pages. Convert large text instances with to_npy to get the same.
+
+    Attributes:
+        path (str): The instance file.
+        format (str): 'npy', 'pisinger', 'plain' or 'orlib'.
+        instance (int): The position of the instance in the file.
+        dims (int): The number of items to choose from.
+        capacity (float): Capacity of the knapsack.
+        optimum (float): The optimal profit, if the file records it. Else None.
+    """
+    def __init__(self, path:str='', capacity:float=0.0, instance:int=0) -> None:
+        """Read the header of an instance file. Text instances are parsed; .npy tables are mapped on first use.
+
+        Args:
+            path (str): The instance file.
+            capacity (float, optional): Capacity of the knapsack. Required for .npy tables. 0 reads it from the file.
+            instance (int, optional): The position of the instance in the file. Default 0.
+        """
+        assert os.path.isfile(path), f'no instance file {path!r}'
+        self.path = str(path)
+        self.instance = int(instance)
+        self.format = detect_format(self.path)
+        self.optimum = None
+        self._items = None
+        self._byte_tables = None
+        self._ratio_order = None
+        file_capacity = None
+        if self.format == 'npy':
+            # only the header is read until the items are needed
+            dims, width = np.load(self.path, mmap_mode='r').shape
+            assert width == 2, f'{path}: expected a (dims x 2) table of (profit, weight) rows'
+        else:
+            profits, weights, capacities, self.optimum = READERS[self.format](self.path, self.instance)
+            if len(capacities) != 1:
+                raise ValueError(f'{path}: instance {instance} has {len(capacities)} constraints; FileKnapsack holds one')
+            self._items = np.column_stack((profits, weights[0]))
+            dims = len(profits)
+            file_capacity = float(capacities[0])
+        TestProblem.__init__(self, dims)
+        self.capacity = float(capacity) if capacity > 0 else file_capacity
+        if self.capacity != file_capacity:
+            # the file's optimum is that of its own capacity
+            self.optimum = None
+        assert self.capacity is not None and self.capacity > 0, f'{path}: a capacity must be given for .npy tables'
+
+    @property
+    def _item_values(self) -> np.ndarray[np.float64]:
+        """(dims x 2) matrix of (profit, weight) rows. Memory-mapped from .npy tables."""
+        if self._items is None:
+            self._items = np.load(self.path, mmap_mode='r')
+            assert self._items.dtype == np.float64 and self._items.flags.c_contiguous
+        return self._items
+
+    @property
+    def profits(self) -> np.ndarray[np.float64]:
+        return self._item_values[:, 0]
+
+    @property
+    def weights(self) -> np.ndarray[np.float64]:
+        return self._item_values[:, 1]
+
+    def to_npy(self, path:str) -> None:
+        """Save the items as a (dims x 2) float64 .npy table, to be memory-mapped by later runs.
+
+        Args:
+            path (str): The .npy file to write.
+        """
+        np.save(path, np.ascontiguousarray(self._item_values, dtype=np.float64))
+
+    @staticmethod
+    def parameters() -> dict[str, tuple]:
+        return {
+            'path': ('Enter Instance File', ''),
+            'capacity': ('Enter Knapsack Capacity (0 to read from the file)', 0.0),
+            'instance': ('Enter Instance Number within the File', 0)
+        }
+
+    def __getstate__(self) -> dict:
+        # workers re-map .npy tables rather than receive a copy; lookup tables are rebuilt on demand
+        state = self.__dict__.copy()
+        state['_byte_tables'] = None
+        if self.format == 'npy':
+            state['_items'] = None
+        return state
+
+    def __repr__(self) -> str:
+        return f'FileKnapsack({self.path!r}, instance={self.instance}, dims={self.dims}, capacity={self.capacity})'
@@ -2,6 +2,7 @@
 
 import numpy as np
 
+from binary_knapsack import bitpacking
 from binary_knapsack.test_problem.problem import TestProblem
 
 
@@ -36,7 +37,11 @@ class BinaryKnapsack(TestProblem):
         self.weights = np.random.uniform(1, max_item_weight, size=self.dims)
         profit_variances = np.random.uniform(-profit_correlation_factor, profit_correlation_factor, size=self.dims)
         # If profit ends up below 0, set to 0 and consider it actual garbage.
-        self.profits = [np.max((0, self.weights[i] + profit_variances[i])) for i in range(self.dims)]
+        self.profits = np.maximum(0, self.weights + profit_variances)
+        # (dims x 2) matrix so one product yields both profit and weight
+        self._item_values = np.column_stack((self.profits, self.weights))
+        self._byte_tables = None
+        self._ratio_order = None
         print(self)
 
     def try_with_bitstring(self, soln:np.ndarray[np.uint8]) -> tuple[float]:
@@ -50,14 +55,110 @@ class BinaryKnapsack(TestProblem):
             tuple[float]: The (profit, weight) for the given solution to the problem.
         """
         assert len(soln) == self.dims
-        profit = np.float64(0)
-        weight = np.float64(0)
-        for i, x in enumerate(soln):
-            if x == 1:
-                profit += self.profits[i]
-                weight += self.weights[i]
+        profit, weight = np.dot(soln, self._item_values)
         return profit, weight
 
+    def try_with_bitstrings(self, solns:np.ndarray[np.uint8]) -> tuple[np.ndarray]:
+        """Evaluate a matrix of bit-string solutions to the problem in one pass.
+
+        Args:
+            solns (np.ndarray[np.uint8]): (pop_size x dims) matrix. Each row represents a solution to the problem.
+
+        Returns:
+            tuple[np.ndarray]: The (profits, weights) for the given solutions. Aligned by row.
+        """
+        assert solns.ndim == 2 and solns.shape[1] == self.dims
+        return self._split_totals(solns @ self._item_values)
+
+    def try_with_flips(self,
+        fitness_scores:np.ndarray[np.float64],
+        fitness_costs:np.ndarray[np.float64],
+        rows:np.ndarray[np.signedinteger],
+        loci:np.ndarray[np.signedinteger],
+        alleles:np.ndarray[np.uint8]
+    ) -> tuple[np.ndarray]:
+        """Evaluate solutions from their parents' (profit, weight) by adding or removing each flipped item.
+
+        Args:
+            fitness_scores (np.ndarray of float64): The profit of each parent.
+            fitness_costs (np.ndarray of float64): The weight of each parent.
+            rows (np.ndarray of int): For each flip, the position of its solution.
+            loci (np.ndarray of int): For each flip, the flipped locus.
+            alleles (np.ndarray of uint8): For each flip, the new allele. 1 adds the item; 0 removes it.
+
+        Returns:
+            tuple[np.ndarray]: The (profits, weights) for the children. Aligned with the parents.
+        """
+        deltas = self._item_values[loci] * np.where(alleles, 1.0, -1.0)[:, np.newaxis]
+        num_solns = len(fitness_scores)
+        return (
+            fitness_scores + np.bincount(rows, weights=deltas[:, 0], minlength=num_solns),
+            fitness_costs + np.bincount(rows, weights=deltas[:, 1], minlength=num_solns)
+        )
+
+    def try_with_packed_bitstrings(self, packed:np.ndarray[np.uint8]) -> tuple[np.ndarray]:
+        """Evaluate a matrix of bit-packed solutions using per-byte profit/weight lookup tables.
+
+        Args:
+            packed (np.ndarray[np.uint8]): Packed rows from bitpacking.pack(). Each row represents a solution.
+
+        Returns:
+            tuple[np.ndarray]: The (profits, weights) for the given solutions. Aligned by row.
+        """
+        assert packed.ndim == 2 and packed.shape[1] == bitpacking.packed_width(self.dims)
+        byte_tables = self.byte_tables
+        width = packed.shape[1]
+        # offset each byte into its own 256-entry slice of the flattened tables
+        offsets = 256 * np.arange(width, dtype=np.intp)
+        totals = np.empty((len(packed), byte_tables.shape[1]))
+        chunk = max(1, 2**20 // width)
+        for start in range(0, len(packed), chunk):
+            rows = packed[start:start+chunk]
+            totals[start:start+chunk] = byte_tables[rows + offsets].sum(axis=1)
+        return self._split_totals(totals)
+
+    def _split_totals(self, totals:np.ndarray[np.float64]) -> tuple[np.ndarray]:
+        """Split per-solution sums of _item_values rows into (fitness_scores, fitness_costs).
+
+        Args:
+            totals (np.ndarray of float64): (num_solns x 2) sums of (profit, weight).
+
+        Returns:
+            tuple[np.ndarray]: The (profits, weights). Aligned by row.
+        """
+        return totals[:, 0], totals[:, 1]
+
+    @property
+    def byte_tables(self) -> np.ndarray:
+        """(packed_width * 256 x 2) table. Row 256 * j + b holds the (profit, weight) of byte value b at byte j.
+
+        One column per column of _item_values, so subclasses with more values per item get them all.
+        """
+        if self._byte_tables is not None:
+            return self._byte_tables
+        width = bitpacking.packed_width(self.dims)
+        num_values = self._item_values.shape[1]
+        item_values = np.zeros((8 * width, num_values))
+        item_values[:self.dims] = self._item_values
+        byte_bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1)
+        self._byte_tables = np.einsum(
+            'bk,jkv->jbv', byte_bits, item_values.reshape(width, 8, num_values)
+        ).reshape(width * 256, num_values)
+        return self._byte_tables
+
+    @property
+    def ratio_order(self) -> np.ndarray[np.intp]:
+        """The items by ascending profit/weight ratio. Computed once, e.g., for repair."""
+        if self._ratio_order is None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratios = self.profits / self._ratio_denominators()
+            self._ratio_order = np.argsort(np.nan_to_num(ratios, nan=0.0), kind='stable')
+        return self._ratio_order
+
+    def _ratio_denominators(self) -> np.ndarray[np.float64]:
+        """The weight each item's profit is divided by for ratio_order."""
+        return self.weights
+
     @property
     def constraints(self) -> dict:
         """{'chromosome_attribute': max_limit}"""
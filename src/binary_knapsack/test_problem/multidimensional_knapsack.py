@@ -0,0 +1,166 @@
+# ahester57
+
+import numpy as np
+
+from binary_knapsack.test_problem.file_knapsack import READERS, detect_format
+from binary_knapsack.test_problem.knapsack import BinaryKnapsack
+from binary_knapsack.test_problem.problem import TestProblem
+
+
+class MultiDimensionalKnapsack(BinaryKnapsack):
+    """A class for the 0/1 Multidimensional Knapsack Problem: m resources, each with its own capacity.
+
+    The fitness cost of a solution is its (m,) vector of resource usage, so a population's
+    costs are one (pop_size x m) matrix from a single product with the item values.
+
+    Attributes:
+        dims (int): The number of items to choose from.
+        num_constraints (int): The number of resources, m.
+        weights (np.ndarray[float]): (m x dims) matrix. Row i holds each item's use of resource i.
+        profits (np.ndarray[float]): The profits for each item. Aligned by index.
+        capacities (np.ndarray[float]): The capacity of each resource.
+        constraints (dict): The constraints.
+    """
+    def __init__(self,
+        dims:int=20,
+        num_constraints:int=5,
+        max_item_weight:float=10.0,
+        profit_correlation_factor:float=5.0,
+        tightness:float=0.5,
+        seed:int=0
+    ) -> None:
+        """Initialize a problem test data set for the 0/1 Multidimensional Knapsack Problem.
+
+        Profits are weakly correlated with each item's mean weight, as in BinaryKnapsack.
+
+        Args:
+            dims (int): The number of items to choose from.
+            num_constraints (int): The number of resources, m.
+            max_item_weight (float): Upper bound for weight.
+            profit_correlation_factor (float): Constant used in generation of weakly correlated data sets.
+            tightness (float): Each capacity as a fraction of the resource's total weight.
+            seed (int): Seeds the generated data set.
+        """
+        TestProblem.__init__(self, dims)
+        assert num_constraints > 0
+        assert 0.0 < tightness < 1.0
+        np.random.seed(int(seed))
+        weights = np.random.uniform(1, max_item_weight, size=(int(num_constraints), self.dims))
+        profit_variances = np.random.uniform(-profit_correlation_factor, profit_correlation_factor, size=self.dims)
+        # If profit ends up below 0, set to 0 and consider it actual garbage.
+        profits = np.maximum(0, weights.mean(axis=0) + profit_variances)
+        self._set_items(profits, weights, tightness * weights.sum(axis=1))
+        print(self)
+
+    @classmethod
+    def from_file(cls, path:str, instance:int=0) -> 'MultiDimensionalKnapsack':
+        """Read an instance file, e.g., OR-Library's mknap files. See file_knapsack for the formats.
+
+        Args:
+            path (str): The instance file.
+            instance (int, optional): The position of the instance in the file. Default 0.
+
+        Returns:
+            MultiDimensionalKnapsack: The instance.
+        """
+        profits, weights, capacities, _ = READERS[detect_format(path)](path, instance)
+        problem = cls.__new__(cls)
+        TestProblem.__init__(problem, len(profits))
+        problem._set_items(profits, weights, capacities)
+        return problem
+
+    def _set_items(self,
+        profits:np.ndarray[np.float64],
+        weights:np.ndarray[np.float64],
+        capacities:np.ndarray[np.float64]
+    ) -> None:
+        """Hold the data set, and lay it out for evaluation.
+
+        Args:
+            profits (np.ndarray of float64): The (dims,) profits.
+            weights (np.ndarray of float64): The (m x dims) weights.
+            capacities (np.ndarray of float64): The (m,) capacities.
+        """
+        assert profits.shape == (self.dims,) and weights.shape == (len(capacities), self.dims)
+        self.num_constraints = len(capacities)
+        self.profits = np.asarray(profits, dtype=np.float64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.capacities = np.asarray(capacities, dtype=np.float64)
+        # (dims x 1 + m) matrix so one product yields the profit and every resource's usage
+        self._item_values = np.column_stack((self.profits, self.weights.T))
+        self._byte_tables = None
+        self._ratio_order = None
+
+    def try_with_bitstring(self, soln:np.ndarray[np.uint8]) -> tuple:
+        """Evaluate a bit-string solution to the problem.
+
+        Args:
+            soln (np.ndarray[np.uint8]): Represents a solution to the problem. \
+                The i^th item is selected if and only if (iff) x_i == 1.
+
+        Returns:
+            tuple: The (profit, (m,) resource usage) for the given solution to the problem.
+        """
+        assert len(soln) == self.dims
+        totals = np.dot(soln, self._item_values)
+        return totals[0], totals[1:]
+
+    def try_with_flips(self,
+        fitness_scores:np.ndarray[np.float64],
+        fitness_costs:np.ndarray[np.float64],
+        rows:np.ndarray[np.signedinteger],
+        loci:np.ndarray[np.signedinteger],
+        alleles:np.ndarray[np.uint8]
+    ) -> tuple[np.ndarray]:
+        """Evaluate solutions from their parents' (profit, resource usage) by adding or removing each flipped item.
+
+        Args:
+            fitness_scores (np.ndarray of float64): The profit of each parent.
+            fitness_costs (np.ndarray of float64): The (num_solns x m) resource usage of each parent.
+            rows (np.ndarray of int): For each flip, the position of its solution.
+            loci (np.ndarray of int): For each flip, the flipped locus.
+            alleles (np.ndarray of uint8): For each flip, the new allele. 1 adds the item; 0 removes it.
+
+        Returns:
+            tuple[np.ndarray]: The (profits, resource usage) for the children. Aligned with the parents.
+        """
+        deltas = self._item_values[loci] * np.where(alleles, 1.0, -1.0)[:, np.newaxis]
+        num_solns = len(fitness_scores)
+        totals = np.column_stack([
+            np.bincount(rows, weights=deltas[:, i], minlength=num_solns) for i in range(deltas.shape[1])
+        ])
+        return fitness_scores + totals[:, 0], fitness_costs + totals[:, 1:]
+
+    def _ratio_denominators(self) -> np.ndarray[np.float64]:
+        """Each item's weights relative to the capacities, summed over every resource."""
+        return (self.weights / self.capacities[:, np.newaxis]).sum(axis=0)
+
+    def _split_totals(self, totals:np.ndarray[np.float64]) -> tuple[np.ndarray]:
+        """Split per-solution sums of _item_values rows into (profits, (num_solns x m) resource usage)."""
+        return totals[:, 0], totals[:, 1:]
+
+    @property
+    def cost_shape(self) -> tuple[int, ...]:
+        return (self.num_constraints,)
+
+    @property
+    def constraints(self) -> dict:
+        """{'chromosome_attribute': max_limit}. One limit per resource."""
+        return {'fitness_cost': self.capacities}
+
+    @staticmethod
+    def parameters() -> dict[str, tuple]:
+        return {
+            'dims': ('Enter Number of Items', 20),
+            'num_constraints': ('Enter Number of Resource Constraints', 5),
+            'max_item_weight': ('Enter Maximum Weight of One Item', 10.0),
+            'profit_correlation_factor': ('Enter Profit Correlation Factor', 5.0),
+            'tightness': ('Enter Capacity as a Fraction of Total Weight', 0.5),
+            'seed': ('Enter Random Seed of the Data Set', 0)
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f'Profits\t\tWeights (one column per resource)\n{self._item_values}\n'
+            f'Capacities\n{self.capacities}'
+        )
@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from binary_knapsack import bitpacking
+
 
 class TestProblem(object):
     """Represents a generic test problem. Does not function as one. Only provides base.
@@ -22,6 +24,55 @@ class TestProblem(object):
         """Evaluate a bit-string solution to the problem."""
         raise NotImplementedError
 
+    def try_with_bitstrings(self, solns:np.ndarray[np.uint8]) -> tuple[np.ndarray]:
+        """Evaluate a (pop_size x dims) matrix of bit-string solutions to the problem in one pass."""
+        raise NotImplementedError
+
+    def try_with_flips(self,
+        fitness_scores:np.ndarray[np.float64],
+        fitness_costs:np.ndarray[np.float64],
+        rows:np.ndarray[np.signedinteger],
+        loci:np.ndarray[np.signedinteger],
+        alleles:np.ndarray[np.uint8]
+    ) -> tuple[np.ndarray]:
+        """Evaluate solutions from their parents' results and the loci flipped since. Optional.
+
+        Args:
+            fitness_scores (np.ndarray of float64): The unpenalized fitness score of each parent.
+            fitness_costs (np.ndarray of float64): The fitness cost of each parent.
+            rows (np.ndarray of int): For each flip, the position of its solution.
+            loci (np.ndarray of int): For each flip, the flipped locus.
+            alleles (np.ndarray of uint8): For each flip, the new allele.
+        """
+        raise NotImplementedError
+
+    def try_with_packed_bitstrings(self, packed:np.ndarray[np.uint8]) -> tuple[np.ndarray]:
+        """Evaluate a matrix of bit-packed solutions to the problem. Unpacks by default."""
+        solns = bitpacking.unpack(packed, self.dims)
+        if self.supports_batch:
+            return self.try_with_bitstrings(solns)
+        fitness_scores, fitness_costs = zip(*(self.try_with_bitstring(soln) for soln in solns))
+        return np.array(fitness_scores), np.array(fitness_costs)
+
+    @property
+    def supports_delta(self) -> bool:
+        """Whether this problem implements try_with_flips."""
+        return type(self).try_with_flips is not TestProblem.try_with_flips
+
+    def close(self) -> None:
+        """Release any resources held, e.g., worker processes. Nothing by default."""
+        pass
+
+    @property
+    def supports_batch(self) -> bool:
+        """Whether this problem implements try_with_bitstrings."""
+        return type(self).try_with_bitstrings is not TestProblem.try_with_bitstrings
+
+    @property
+    def cost_shape(self) -> tuple[int, ...]:
+        """The shape of one solution's fitness cost. () for a scalar, (m,) for one cost per constraint."""
+        return ()
+
     @property
     def constraints(self) -> dict:
         """{'chromosome_attribute': max_limit}"""
@@ -0,0 +1,308 @@
+# ahester57
+
+import bisect
+import hashlib
+import math
+import time
+
+import numpy as np
+
+from typing import NamedTuple
+
+from binary_knapsack.test_problem.knapsack import BinaryKnapsack
+
+
+# Largest dynamic programming table, in cells (items x capacity units). One bit per cell is kept.
+DP_MAX_CELLS = 2 ** 28
+# Largest power of ten tried when scaling weights to integers for dynamic programming.
+DP_MAX_SCALE = 10 ** 6
+# Nodes branch and bound explores before settling for a bounded, unproven solution.
+BB_MAX_NODES = 10 ** 6
+
+# {(instance digest, max_nodes): ReferenceSolution}. Each instance is solved once per process.
+_solutions : dict = {}
+
+
+class ReferenceSolution(NamedTuple):
+    """The best solution the reference solver found to an instance, and how far from optimal it may be.
+
+    Attributes:
+        profit (float): The profit of the best feasible solution found.
+        upper_bound (float): No solution has a higher profit. Equals profit once optimality is proven.
+        bitstring (np.ndarray of uint8): The best solution found. None if the optimum came from the instance file.
+        method (str): 'dp', 'branch_and_bound' or 'file'.
+        nodes (int): The branch and bound nodes explored. 0 for the other methods.
+        seconds (float): The wall-time of solving.
+    """
+    profit: float
+    upper_bound: float
+    bitstring: np.ndarray
+    method: str
+    nodes: int
+    seconds: float
+
+    @property
+    def is_optimal(self) -> bool:
+        return self.profit >= self.upper_bound
+
+    def gap(self, fitness:float) -> float:
+        """The relative optimality gap of a fitness score, (profit - fitness) / profit. 0 is optimal."""
+        assert self.profit > 0
+        return (self.profit - float(fitness)) / self.profit
+
+
+def solve(problem:BinaryKnapsack, max_nodes:int=BB_MAX_NODES) -> ReferenceSolution:
+    """Solve a knapsack instance for reference, once per instance.
+
+    A single constraint whose weights are integers, after scaling by a power of ten, is solved exactly
+    by dynamic programming if the table fits in DP_MAX_CELLS. Anything else goes to branch and bound,
+    which is exact unless it runs out of nodes. An optimum recorded in an instance file is taken as is.
+
+    Args:
+        problem (BinaryKnapsack): The instance. Any subclass, including MultiDimensionalKnapsack.
+        max_nodes (int, optional): Branch and bound nodes to explore before giving up. Default BB_MAX_NODES.
+
+    Returns:
+        ReferenceSolution: The solution. Cached by the instance's profits, weights and capacities.
+    """
+    assert isinstance(problem, BinaryKnapsack), 'the reference solver needs item profits and weights'
+    assert max_nodes > 0
+    profits = np.asarray(problem.profits, dtype=np.float64)
+    weights = np.atleast_2d(np.asarray(problem.weights, dtype=np.float64))
+    capacities = np.atleast_1d(problem.constraints['fitness_cost']).astype(np.float64)
+    digest = hashlib.sha1()
+    for a in (profits, weights, capacities):
+        digest.update(np.ascontiguousarray(a).tobytes())
+    key = (digest.hexdigest(), int(max_nodes))
+    if key in _solutions:
+        return _solutions[key]
+
+    start = time.perf_counter()
+    optimum = getattr(problem, 'optimum', None)
+    scale = _integer_scale(weights, capacities)
+    if optimum is not None:
+        solution = ReferenceSolution(float(optimum), float(optimum), None, 'file', 0, 0.0)
+    elif scale is not None and len(profits) * (math.floor(capacities[0] * scale + 1e-9) + 1) <= DP_MAX_CELLS:
+        # the capacity need not be integral; no solution can use its fraction
+        capacity = math.floor(capacities[0] * scale + 1e-9)
+        bitstring = solve_dp(profits, np.rint(weights[0] * scale).astype(np.int64), capacity)
+        profit = float(problem.try_with_bitstring(bitstring)[0])
+        solution = ReferenceSolution(profit, profit, bitstring, 'dp', 0, time.perf_counter() - start)
+    else:
+        bitstring, upper_bound, nodes = solve_branch_and_bound(
+            profits, weights, capacities, problem.ratio_order[::-1], max_nodes
+        )
+        profit = float(problem.try_with_bitstring(bitstring)[0])
+        if math.isclose(profit, upper_bound, rel_tol=1e-12):
+            # the search's running sums and the problem's product round differently
+            upper_bound = profit
+        solution = ReferenceSolution(
+            profit, max(profit, upper_bound), bitstring, 'branch_and_bound', nodes, time.perf_counter() - start
+        )
+    _solutions[key] = solution
+    return solution
+
+
+def _integer_scale(weights:np.ndarray[np.float64], capacities:np.ndarray[np.float64]) -> int:
+    """The smallest power of ten, up to DP_MAX_SCALE, making every weight an integer. None if there is none or several constraints."""
+    if len(capacities) != 1:
+        return None
+    scale = 1
+    while scale <= DP_MAX_SCALE:
+        scaled = weights[0] * scale
+        if np.all(np.abs(scaled - np.rint(scaled)) <= 1e-9 * scale) and capacities[0] * scale < np.iinfo(np.int64).max:
+            return scale
+        scale *= 10
+    return None
+
+
+def solve_dp(profits:np.ndarray[np.float64], weights:np.ndarray[np.int64], capacity:int) -> np.ndarray[np.uint8]:
+    """Solve a 0/1 knapsack with integer weights exactly, one item at a time over every capacity.
+
+    Args:
+        profits (np.ndarray of float64): The (dims,) profits.
+        weights (np.ndarray of int64): The (dims,) integer weights.
+        capacity (int): The integer capacity.
+
+    Returns:
+        np.ndarray of uint8: An optimal solution.
+    """
+    assert capacity >= 0 and np.all(weights >= 0)
+    # best[c] is the highest profit of the items so far weighing at most c
+    best = np.zeros(capacity + 1)
+    # bit c of row i is set if item i is in the best solution of weight at most c, given items 0..i
+    taken = np.zeros((len(profits), (capacity + 8) // 8), dtype=np.uint8)
+    take = np.zeros(capacity + 1, dtype=bool)
+    for i, (p, w) in enumerate(zip(profits, weights)):
+        if w > capacity or p <= 0:
+            continue
+        take[:w] = False
+        candidates = best[:capacity + 1 - w] + p
+        np.greater(candidates, best[w:], out=take[w:])
+        best[w:] = np.where(take[w:], candidates, best[w:])
+        taken[i] = np.packbits(take)
+    bitstring = np.zeros(len(profits), dtype=np.uint8)
+    c = capacity
+    for i in range(len(profits) - 1, -1, -1):
+        if taken[i, c >> 3] & (0x80 >> (c & 7)):
+            bitstring[i] = 1
+            c -= weights[i]
+    return bitstring
+
+
+def solve_branch_and_bound(
+    profits:np.ndarray[np.float64],
+    weights:np.ndarray[np.float64],
+    capacities:np.ndarray[np.float64],
+    order:np.ndarray[np.intp],
+    max_nodes:int=BB_MAX_NODES
+) -> tuple[np.ndarray[np.uint8], float, int]:
+    """Solve a 0/1 knapsack, with one or more constraints, by depth-first branch and bound.
+
+    Items are decided in the given order, taking each first. A subtree is pruned by the Dantzig bound:
+    the LP relaxation, filled greedily by ratio with a fraction of the first item that does not fit.
+    With several constraints the bound is that of their surrogate, the sum of each weight relative to
+    its capacity, which every feasible solution satisfies.
+
+    Args:
+        profits (np.ndarray of float64): The (dims,) profits.
+        weights (np.ndarray of float64): The (m x dims) weights.
+        capacities (np.ndarray of float64): The (m,) capacities.
+        order (np.ndarray of int): The items in descending profit/weight ratio.
+        max_nodes (int, optional): Nodes to explore before giving up. Default BB_MAX_NODES.
+
+    Returns:
+        tuple: (the best solution found, an upper bound on the optimal profit, the nodes explored)
+    """
+    # items which can never help are left out; the rest are indexed in ratio order
+    usable = (profits[order] > 0) & np.all(weights[:, order] <= capacities[:, np.newaxis], axis=0)
+    items = order[usable]
+    n = len(items)
+    p = profits[items].tolist()
+    columns = [tuple(column) for column in weights[:, items].T.tolist()]
+    surrogate = (weights[:, items] / capacities[:, np.newaxis]).sum(axis=0).tolist()
+    cum_p = [0.0, *np.cumsum(p).tolist()]
+    cum_s = [0.0, *np.cumsum(surrogate).tolist()]
+    integral = bool(np.all(profits == np.rint(profits)))
+
+    def bound(j:int, slack:float) -> float:
+        """The Dantzig bound on the profit of items j.. within the surrogate slack."""
+        s = bisect.bisect_right(cum_s, cum_s[j] + slack, j, n + 1) - 1
+        extra = cum_p[s] - cum_p[j]
+        if s < n:
+            extra += (slack - (cum_s[s] - cum_s[j])) * p[s] / surrogate[s]
+        return extra
+
+    best, best_items = 0.0, []
+    # the items taken on the way to the current node, in ratio order
+    path = []
+    profit, slack, room = 0.0, float(len(capacities)), capacities.tolist()
+    j, nodes = 0, 0
+    while nodes < max_nodes:
+        nodes += 1
+        ub = profit + bound(j, slack)
+        if integral:
+            # 1e-9 absorbs rounding in the running sums
+            ub = math.floor(ub + 1e-9)
+        if ub > best:
+            # take every item that fits until one does not
+            while j < n and all(w <= r for w, r in zip(columns[j], room)):
+                path.append(j)
+                profit += p[j]
+                slack -= surrogate[j]
+                room = [r - w for w, r in zip(columns[j], room)]
+                j += 1
+            if j < n:
+                # branch on leaving it out
+                j += 1
+                continue
+            if profit > best:
+                best, best_items = profit, list(path)
+        # backtrack to the latest item taken, leaving it out instead
+        if len(path) == 0:
+            upper_bound = best
+            break
+        k = path.pop()
+        profit -= p[k]
+        slack += surrogate[k]
+        room = [r + w for w, r in zip(columns[k], room)]
+        j = k + 1
+    else:
+        # out of nodes: the optimum lies in the current subtree or one of the branches left out along the path
+        upper_bound = max(best, profit + bound(j, slack))
+        profit, slack = 0.0, float(len(capacities))
+        for k in path:
+            upper_bound = max(upper_bound, profit + bound(k + 1, slack))
+            profit += p[k]
+            slack -= surrogate[k]
+    bitstring = np.zeros(len(profits), dtype=np.uint8)
+    bitstring[items[best_items]] = 1
+    return bitstring, upper_bound, nodes
+
+
+def feasible_objectives(problem:BinaryKnapsack, bitstrings:np.ndarray[np.uint8]) -> np.ndarray[np.float64]:
+    """The objective, i.e., unpenalized profit, of each solution. NaN for any which violates a constraint.
+
+    Args:
+        problem (BinaryKnapsack): The instance the solutions were found for.
+        bitstrings (np.ndarray of uint8): The (num_solns x dims) solutions, e.g., the best-of-runs.
+
+    Returns:
+        np.ndarray of float64: The objective of each solution. Aligned by row.
+    """
+    profits, costs = problem.try_with_bitstrings(np.atleast_2d(bitstrings))
+    capacities = np.atleast_1d(problem.constraints['fitness_cost'])
+    feasible = np.all(costs.reshape(len(profits), -1) <= capacities, axis=1)
+    return np.where(feasible, profits, np.nan)
+
+
+def _mean(values:list) -> float:
+    """The mean of values. None if there are none."""
+    if len(values) == 0:
+        return None
+    return float(np.mean(values))
+
+
+def quality_summary(
+    reference:ReferenceSolution,
+    problem:BinaryKnapsack,
+    bitstrings:np.ndarray[np.uint8],
+    target_hits:list,
+    target_quality:float
+) -> dict:
+    """Summarize independent runs against a reference solution.
+
+    A run's gap is measured from the objective of its best-of-run, not its fitness, which a penalty may have lowered.
+    A run whose best-of-run is infeasible has no gap; it is counted in infeasible_runs instead.
+
+    Args:
+        reference (ReferenceSolution): The reference solution of the instance the runs solved.
+        problem (BinaryKnapsack): The instance the runs solved.
+        bitstrings (np.ndarray of uint8): The (num_runs x dims) best-of-run of each run.
+        target_hits (list of TargetHit): When each run reached target_quality * reference.profit. None if it did not.
+        target_quality (float): The target as a fraction of the reference profit.
+
+    Returns:
+        dict: The reference, the feasible runs' relative optimality gaps, and how soon the runs that reached the target did so.
+    """
+    objectives = feasible_objectives(problem, bitstrings)
+    gaps = [reference.gap(f) for f in objectives[~np.isnan(objectives)]]
+    hits = [h for h in target_hits if h is not None]
+    return {
+        'optimum': reference.profit,
+        'upper_bound': reference.upper_bound,
+        'proven_optimal': reference.is_optimal,
+        'solver': reference.method,
+        'solver_seconds': reference.seconds,
+        'feasible_runs': len(gaps),
+        'infeasible_runs': len(objectives) - len(gaps),
+        'mean_gap': _mean(gaps),
+        'std_gap': None if len(gaps) == 0 else float(np.std(gaps)),
+        'min_gap': None if len(gaps) == 0 else float(np.min(gaps)),
+        'target_quality': float(target_quality),
+        'target_fitness': float(target_quality) * reference.profit,
+        'target_hits': len(hits),
+        'mean_target_generation': _mean([h.generation for h in hits]),
+        'mean_target_evaluations': _mean([h.evaluations for h in hits]),
+        'mean_target_seconds': _mean([h.seconds for h in hits])
+    }
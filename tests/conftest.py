@@ -0,0 +1,47 @@
+# ahester57
+
+import asyncio
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from binary_knapsack.ga import GA
+from binary_knapsack.test_problem.knapsack import BinaryKnapsack
+from binary_knapsack.test_problem.multidimensional_knapsack import MultiDimensionalKnapsack
+
+
+def quietly(factory, *args, **kwargs):
+    """Call factory, discarding what it prints. Problem instances print themselves."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return factory(*args, **kwargs)
+
+
+def simulate(**options) -> GA:
+    """Construct and run a GA to completion."""
+    ga = quietly(GA, **options)
+    quietly(asyncio.run, ga.simulate())
+    return ga
+
+
+@pytest.fixture
+def knapsack() -> BinaryKnapsack:
+    """The default 20-item knapsack of the menu."""
+    return quietly(BinaryKnapsack, dims=20, capacity=40.0)
+
+
+@pytest.fixture
+def large_knapsack() -> BinaryKnapsack:
+    """A 64-item knapsack with room for roughly a third of the items."""
+    return quietly(BinaryKnapsack, dims=64, capacity=128.0)
+
+
+@pytest.fixture
+def multidimensional_knapsack() -> MultiDimensionalKnapsack:
+    return quietly(MultiDimensionalKnapsack, dims=40, num_constraints=4, tightness=0.3, seed=1)
+
+
+@pytest.fixture
+def random() -> np.random.Generator:
+    return np.random.default_rng(12345)
@@ -0,0 +1,109 @@
+# ahester57
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from binary_knapsack.checkpoint import population_arrays
+from binary_knapsack.ga import GA
+from binary_knapsack.penalty_method.logarithmic import LogarithmicPenalty
+from binary_knapsack.selection_mechanism.tournament import StochasticTournament
+from binary_knapsack.telemetry import ColumnarTelemetry, TELEMETRY_DTYPE, _header, load_telemetry
+
+from tests.conftest import quietly, simulate
+
+
+MODES = [
+    {}, {'use_matrix': True}, {'packed': True}, {'use_matrix': True, 'fitness_cache_size': 256},
+    {'packed': True, 'delta_evaluation': True}
+]
+
+# stage timings differ from run to run
+COLUMNS = [name for name in TELEMETRY_DTYPE.names if not name.startswith('seconds_')]
+
+
+def options(problem, **kwargs) -> dict:
+    return {
+        'pop_size': 40,
+        't_max': 40,
+        'rand_seed': 7,
+        'problem_instance': problem,
+        'Penalty_Method': LogarithmicPenalty,
+        'penalty_parameters': {'rho': 1.3},
+        'Select_Mechanism': StochasticTournament,
+        **kwargs
+    }
+
+
+def run_until(ga:GA, t:int) -> None:
+    """Simulate until generation t, then stop as if the process had been killed."""
+    async def until():
+        async for snapshot in ga.generations():
+            if snapshot.generation >= t:
+                break
+    quietly(asyncio.run, until())
+
+
+def final_state(ga:GA) -> tuple:
+    arrays = population_arrays(ga.population)
+    return (
+        {name: array.tobytes() for name, array in arrays.items()},
+        ga.best_of_run_record,
+        ga.t,
+        ga.evaluations
+    )
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_resume_continues_bit_for_bit(large_knapsack, tmp_path, mode):
+    straight = simulate(**options(large_knapsack, **mode))
+    path = str(tmp_path / 'run.ckpt')
+    interrupted = quietly(GA, **options(large_knapsack, **mode))
+    run_until(interrupted, 15)
+    interrupted.checkpoint(path)
+    run_until(interrupted, 20)
+    resumed = quietly(GA.resume, path)
+    assert resumed.t == 15
+    quietly(asyncio.run, resumed.simulate())
+    assert final_state(resumed) == final_state(straight)
+
+
+@pytest.mark.parametrize('buffer_size', [1, 7, 4096])
+def test_resumed_telemetry_continues_the_log(large_knapsack, tmp_path, buffer_size):
+    with ColumnarTelemetry(str(tmp_path / 'straight'), buffer_size) as sink:
+        simulate(**options(large_knapsack), telemetry=sink)
+    path = str(tmp_path / 'run.ckpt')
+    with ColumnarTelemetry(str(tmp_path / 'resumed'), buffer_size) as sink:
+        interrupted = quietly(GA, **options(large_knapsack), telemetry=sink)
+        run_until(interrupted, 15)
+        interrupted.checkpoint(path)
+        # these records are written again once resumed
+        run_until(interrupted, 20)
+    with ColumnarTelemetry(str(tmp_path / 'resumed'), buffer_size, append=True) as sink:
+        assert sink.count == 21
+        resumed = quietly(GA.resume, path, telemetry=sink)
+        assert sink.count == 16
+        quietly(asyncio.run, resumed.simulate())
+    straight, resumed = load_telemetry(str(tmp_path / 'straight')), load_telemetry(str(tmp_path / 'resumed'))
+    np.testing.assert_array_equal(resumed['t'], np.arange(41))
+    for name in COLUMNS:
+        np.testing.assert_array_equal(resumed[name], straight[name], err_msg=name)
+
+
+def test_append_drops_a_partly_flushed_batch(tmp_path, knapsack):
+    path = str(tmp_path / 'log')
+    with ColumnarTelemetry(path, buffer_size=4) as sink:
+        simulate(pop_size=20, t_max=9, rand_seed=1, problem_instance=knapsack, telemetry=sink)
+    t = np.load(f'{path}/t.npy')
+    # as if killed while flushing: one column holds three more records than the others
+    with open(f'{path}/t.npy', 'r+b') as f:
+        f.seek(0, 2)
+        f.write(np.arange(3, dtype=np.int64).tobytes())
+        f.seek(0)
+        f.write(_header(TELEMETRY_DTYPE['t'], 13))
+    with ColumnarTelemetry(path, append=True) as sink:
+        assert sink.count == 10
+    columns = load_telemetry(path)
+    assert all(len(column) == 10 for column in columns.values())
+    np.testing.assert_array_equal(columns['t'], t)
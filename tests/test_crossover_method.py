@@ -0,0 +1,44 @@
+# ahester57
+
+import numpy as np
+import pytest
+
+from binary_knapsack import bitpacking
+from binary_knapsack.crossover_method.majority_voting import MajorityVoting
+from binary_knapsack.crossover_method.p_uniform import PUniform
+from binary_knapsack.crossover_method.single_point import SinglePoint
+
+
+CROSSOVERS = [SinglePoint, PUniform, MajorityVoting]
+
+
+def offspring(Crossover_Method, parents, fitness_scores, seed, compat=False, packed=False):
+    """One round of crossover by a fresh instance of Crossover_Method, seeded with seed."""
+    parameters = {k: v for k, (_, v) in Crossover_Method.parameters().items()}
+    crossover = Crossover_Method(np.random.default_rng(seed), compat=compat, **parameters)
+    if packed:
+        return bitpacking.unpack(
+            crossover.crossover_packed(bitpacking.pack(parents), parents.shape[1], fitness_scores),
+            parents.shape[1]
+        )
+    return crossover.crossover_matrix(parents, fitness_scores)
+
+
+@pytest.mark.parametrize('Crossover_Method', CROSSOVERS)
+@pytest.mark.parametrize('dims', [7, 20, 64, 131])
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_batched_compat_and_packed_crossover_agree(random, Crossover_Method, dims, seed):
+    parents = random.integers(2, size=(40, dims), dtype=np.uint8)
+    fitness_scores = random.uniform(1, 100, size=40)
+    batched = offspring(Crossover_Method, parents, fitness_scores, seed)
+    np.testing.assert_array_equal(batched, offspring(Crossover_Method, parents, fitness_scores, seed, compat=True))
+    np.testing.assert_array_equal(batched, offspring(Crossover_Method, parents, fitness_scores, seed, packed=True))
+    assert not np.array_equal(batched, parents)
+
+
+@pytest.mark.parametrize('Crossover_Method', CROSSOVERS)
+def test_crossover_does_not_modify_parents(random, Crossover_Method):
+    parents = random.integers(2, size=(40, 20), dtype=np.uint8)
+    original = parents.copy()
+    offspring(Crossover_Method, parents, random.uniform(1, 100, size=40), 1)
+    np.testing.assert_array_equal(parents, original)
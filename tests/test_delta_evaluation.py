@@ -0,0 +1,37 @@
+# ahester57
+
+import numpy as np
+import pytest
+
+from binary_knapsack.ga import GA
+from binary_knapsack.population_matrix import DELTA_MAX_DEPTH
+from binary_knapsack.population_stats import PopulationStats
+
+from tests.conftest import quietly
+
+
+@pytest.mark.parametrize('packed', [False, True])
+def test_delta_evaluation_agrees_with_full_over_a_run(large_knapsack, packed):
+    ga = quietly(
+        GA, pop_size=60, t_max=150, rand_seed=1, problem_instance=large_knapsack, use_matrix=True, packed=packed,
+        delta_evaluation=True
+    )
+    ga.initialize_population()
+    ga.evaluate_population()
+    delta_evaluated = 0
+    while ga.t < ga.t_max:
+        quietly(ga.iterate)
+        population = ga.population
+        assert population.delta_depths.max() <= DELTA_MAX_DEPTH
+        delta_evaluated += np.count_nonzero(population.delta_depths)
+        profits, weights = large_knapsack.try_with_bitstrings(population.unpacked_rows(np.arange(len(population))))
+        np.testing.assert_allclose(population.objective_scores, profits, rtol=1e-13)
+        np.testing.assert_allclose(population.fitness_costs, weights, rtol=1e-13)
+    assert delta_evaluated > 0
+
+
+def test_convergence_allows_for_rounding():
+    fitness_scores = np.array([53.46399068180871, np.nextafter(53.46399068180871, np.inf)])
+    assert PopulationStats.from_fitness(fitness_scores).is_converged
+    assert not PopulationStats.from_fitness(np.array([53.4, 53.5])).is_converged
+    assert PopulationStats.from_fitness(np.zeros(4)).is_converged
@@ -0,0 +1,151 @@
+# ahester57
+
+import pickle
+
+import numpy as np
+import pytest
+
+from binary_knapsack.test_problem.file_knapsack import FileKnapsack, detect_format, read_orlib, read_pisinger, read_plain
+from binary_knapsack.test_problem.multidimensional_knapsack import MultiDimensionalKnapsack
+
+from tests.conftest import quietly
+
+
+PISINGER = """knapPI_1_4_1000_1
+n 4
+c 10
+z 19
+time 0.00
+1,5,3,1
+2,7,4,1
+3,2,6,0
+4,7,3,1
+-----
+
+knapPI_1_3_1000_2
+n 3
+c 8
+z 13
+time 0.00
+1,6,5,0
+2,9,4,1
+3,4,4,1
+-----
+"""
+
+# the first optimum is unknown
+ORLIB = """2
+3 1 0
+10 20 30
+1 2 3
+4
+4 2 55
+5 6 7 8
+1 1 1 1
+2 2 2 2
+2 4
+"""
+
+PLAIN = """3 10
+5 3
+7 4
+9 5
+"""
+
+
+def write(tmp_path, name:str, text:str) -> str:
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_pisinger_files_hold_several_instances(tmp_path):
+    path = write(tmp_path, 'knapPI_1', PISINGER)
+    assert detect_format(path) == 'pisinger'
+    profits, weights, capacities, optimum = read_pisinger(path)
+    np.testing.assert_array_equal(profits, [5, 7, 2, 7])
+    np.testing.assert_array_equal(weights, [[3, 4, 6, 3]])
+    assert capacities.tolist() == [10.0] and optimum == 19.0
+    profits, weights, capacities, optimum = read_pisinger(path, instance=1)
+    np.testing.assert_array_equal(profits, [6, 9, 4])
+    np.testing.assert_array_equal(weights, [[5, 4, 4]])
+    assert capacities.tolist() == [8.0] and optimum == 13.0
+    with pytest.raises(ValueError, match='no instance 2; the file holds 2'):
+        read_pisinger(path, instance=2)
+
+
+def test_pisinger_item_count_must_match(tmp_path):
+    path = write(tmp_path, 'short', PISINGER.replace('n 4', 'n 5'))
+    with pytest.raises(ValueError, match='lists 4 items, not n=5'):
+        read_pisinger(path)
+
+
+def test_orlib_optimum_of_zero_is_unknown(tmp_path):
+    path = write(tmp_path, 'mknap', ORLIB)
+    assert detect_format(path) == 'orlib'
+    profits, weights, capacities, optimum = read_orlib(path)
+    np.testing.assert_array_equal(profits, [10, 20, 30])
+    np.testing.assert_array_equal(weights, [[1, 2, 3]])
+    assert capacities.tolist() == [4.0] and optimum is None
+    profits, weights, capacities, optimum = read_orlib(path, instance=1)
+    np.testing.assert_array_equal(profits, [5, 6, 7, 8])
+    np.testing.assert_array_equal(weights, [[1, 1, 1, 1], [2, 2, 2, 2]])
+    assert capacities.tolist() == [2.0, 4.0] and optimum == 55.0
+    with pytest.raises(ValueError, match='no instance 2'):
+        read_orlib(path, instance=2)
+
+
+def test_orlib_instances_load_as_either_problem(tmp_path):
+    path = write(tmp_path, 'mknap', ORLIB)
+    problem = quietly(FileKnapsack, path)
+    assert (problem.dims, problem.capacity, problem.optimum) == (3, 4.0, None)
+    with pytest.raises(ValueError, match='has 2 constraints'):
+        FileKnapsack(path, instance=1)
+    problem = MultiDimensionalKnapsack.from_file(path, instance=1)
+    np.testing.assert_array_equal(problem.capacities, [2.0, 4.0])
+    profit, usage = problem.try_with_bitstring(np.array([1, 0, 0, 1], dtype=np.uint8))
+    assert profit == 13.0 and usage.tolist() == [2.0, 4.0]
+
+
+def test_plain_files_hold_one_instance(tmp_path):
+    path = write(tmp_path, 'plain.txt', PLAIN)
+    assert detect_format(path) == 'plain'
+    profits, weights, capacities, optimum = read_plain(path)
+    np.testing.assert_array_equal(profits, [5, 7, 9])
+    np.testing.assert_array_equal(weights, [[3, 4, 5]])
+    assert capacities.tolist() == [10.0] and optimum is None
+    with pytest.raises(ValueError, match='a single instance'):
+        read_plain(path, instance=1)
+
+
+def test_unrecognized_format(tmp_path):
+    with pytest.raises(ValueError, match='unrecognized instance format'):
+        detect_format(write(tmp_path, 'table.txt', '1 2 3\n'))
+
+
+def test_file_optimum_only_holds_for_its_capacity(tmp_path):
+    path = write(tmp_path, 'knapPI_1', PISINGER)
+    assert FileKnapsack(path).optimum == 19.0
+    assert FileKnapsack(path, capacity=12.0).optimum is None
+    problem = FileKnapsack(path, instance=1)
+    profit, weight = problem.try_with_bitstring(np.array([0, 1, 1], dtype=np.uint8))
+    assert (profit, weight) == (13.0, 8.0) and problem.optimum == 13.0
+
+
+def test_npy_tables_are_mapped_again_after_pickling(tmp_path):
+    text = FileKnapsack(write(tmp_path, 'knapPI_1', PISINGER))
+    path = str(tmp_path / 'items.npy')
+    text.to_npy(path)
+    problem = FileKnapsack(path, capacity=10.0)
+    assert problem.format == 'npy' and problem.dims == 4 and problem.optimum is None
+    # nothing is read until the items are needed
+    assert problem._items is None
+    np.testing.assert_array_equal(problem.profits, text.profits)
+    assert isinstance(problem._items, np.memmap)
+    restored = pickle.loads(pickle.dumps(problem))
+    assert restored._items is None
+    solns = np.eye(4, dtype=np.uint8)
+    np.testing.assert_array_equal(restored.try_with_bitstrings(solns)[1], text.weights)
+    assert isinstance(restored._items, np.memmap)
+    # text instances travel with their items
+    assert pickle.loads(pickle.dumps(text))._items is not None
@@ -0,0 +1,48 @@
+# ahester57
+
+import numpy as np
+import pytest
+
+from binary_knapsack.fitness_cache import CachedProblem
+from binary_knapsack.test_problem import problem
+
+from tests.conftest import simulate
+
+
+class FullOnly(problem.TestProblem):
+    """A problem which can only evaluate in full."""
+    def __init__(self, problem_instance:problem.TestProblem) -> None:
+        super().__init__(problem_instance.dims)
+        self.problem_instance = problem_instance
+
+    def try_with_bitstring(self, soln:np.ndarray) -> tuple:
+        return self.problem_instance.try_with_bitstring(soln)
+
+
+def test_cache_forwards_delta_evaluation(knapsack, random):
+    cached = CachedProblem(knapsack)
+    assert cached.supports_delta
+    assert not CachedProblem(FullOnly(knapsack)).supports_delta
+    solns = random.integers(2, size=(10, knapsack.dims), dtype=np.uint8)
+    profits, weights = knapsack.try_with_bitstrings(solns)
+    rows, loci = np.array([0, 0, 3]), np.array([1, 5, 2])
+    alleles = 1 - solns[rows, loci]
+    np.testing.assert_array_equal(
+        cached.try_with_flips(profits, weights, rows, loci, alleles),
+        knapsack.try_with_flips(profits, weights, rows, loci, alleles)
+    )
+    assert cached.cache_info().size == 0
+
+
+@pytest.mark.parametrize('mode', [{'use_matrix': True}, {'packed': True}])
+@pytest.mark.parametrize('seed', [1, 2])
+def test_cache_does_not_change_a_delta_evaluated_run(large_knapsack, mode, seed):
+    runs = [
+        simulate(pop_size=60, t_max=60, rand_seed=seed, problem_instance=large_knapsack, fitness_cache_size=size,
+            delta_evaluation=True, **mode)
+        for size in (0, 4096)
+    ]
+    assert runs[1].problem_instance.cache_info().hits > 0
+    assert runs[0].evaluations == runs[1].evaluations
+    assert runs[0].best_of_run_record == runs[1].best_of_run_record
+    np.testing.assert_array_equal(runs[0].population.fitness_scores, runs[1].population.fitness_scores)
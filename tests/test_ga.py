@@ -0,0 +1,35 @@
+# ahester57
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from binary_knapsack.ga import GA
+from binary_knapsack.population_matrix import PopulationMatrix
+from binary_knapsack.test_problem.knapsack import BinaryKnapsack
+
+from tests.conftest import quietly, simulate
+
+
+MODES = {'object': {}, 'matrix': {'use_matrix': True}, 'packed': {'packed': True}}
+
+
+def initial_bitstrings(ga:GA) -> np.ndarray:
+    ga.initialize_population()
+    if isinstance(ga.population, PopulationMatrix):
+        return ga.population.unpacked_rows(np.arange(len(ga.population)))
+    return np.stack([c.bitstring for c in ga.population.members])
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+@pytest.mark.parametrize('dims', [13, 20])
+def test_every_mode_starts_from_the_same_population(seed, dims):
+    # uint8 draws are buffered per call, so drawing row by row differs unless dims is a multiple of 4
+    problem = quietly(BinaryKnapsack, dims=dims, capacity=2.0 * dims)
+    populations = [
+        initial_bitstrings(quietly(GA, pop_size=30, rand_seed=seed, problem_instance=problem, **kwargs))
+        for kwargs in MODES.values()
+    ]
+    for population in populations[1:]:
+        np.testing.assert_array_equal(population, populations[0])
@@ -0,0 +1,60 @@
+# ahester57
+
+import numpy as np
+import pytest
+
+from binary_knapsack.island import IslandModel, _emigrants, _immigrate
+from binary_knapsack.selection_mechanism.tournament import StochasticTournament
+
+from tests.conftest import quietly, simulate
+
+
+def options(problem) -> dict:
+    return {'pop_size': 30, 't_max': 30, 'problem_instance': problem, 'Select_Mechanism': StochasticTournament}
+
+
+def islands(problem, k:int=3, **kwargs) -> IslandModel:
+    return IslandModel([options(problem)] * k, entropy=11, **kwargs)
+
+
+def outcome(results:list) -> list:
+    return [(r.best_of_run.bitstring.tobytes(), r.best_of_run.fitness_score, r.generation) for r in results]
+
+
+def test_too_many_immigrants_are_rejected(knapsack):
+    with pytest.raises(ValueError, match='island 0 would receive 30 immigrants'):
+        islands(knapsack, 4, num_migrants=10, topology='fully_connected')
+    # a ring has one source per island
+    islands(knapsack, 4, num_migrants=10, topology='ring')
+
+
+def test_immigrants_replace_the_least_fit(large_knapsack):
+    source, island = (
+        simulate(**{**options(large_knapsack), 't_max': 5}, rand_seed=seed, use_matrix=True) for seed in (1, 2)
+    )
+    emigrants = _emigrants(source, 4)
+    np.testing.assert_array_equal(
+        source.population.fitness_scores[emigrants],
+        np.sort(source.population.fitness_scores)[::-1][:4]
+    )
+    survivors = np.argsort(island.population.fitness_scores, kind='stable')[4:]
+    kept = island.population.unpacked_rows(survivors)
+    _immigrate(island, source.population.packed_rows(emigrants))
+    assert island.population.is_evaluated
+    np.testing.assert_array_equal(island.population.unpacked_rows(survivors), kept)
+    replaced = np.setdiff1d(np.arange(30), survivors)
+    arrived = {row.tobytes() for row in island.population.unpacked_rows(replaced)}
+    assert arrived == {row.tobytes() for row in source.population.unpacked_rows(emigrants)}
+    np.testing.assert_array_equal(
+        np.sort(island.population.fitness_scores[replaced]),
+        np.sort(source.population.fitness_scores[emigrants])
+    )
+
+
+def test_seeded_islands_are_reproducible(large_knapsack):
+    model = quietly(islands, large_knapsack, migration_interval=5, topology='fully_connected')
+    runs = [outcome(quietly(model.run)) for _ in range(2)]
+    assert runs[0] == runs[1]
+    # without migration, the same seeds evolve differently
+    isolated = quietly(islands, large_knapsack, migration_interval=30, topology='fully_connected')
+    assert outcome(quietly(isolated.run)) != runs[0]
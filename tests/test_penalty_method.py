@@ -0,0 +1,80 @@
+# ahester57
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from binary_knapsack.ga import GA
+from binary_knapsack.penalty_method.absolute import AbsolutePenalty
+from binary_knapsack.penalty_method.dynamic import DynamicPenalty
+from binary_knapsack.penalty_method.logarithmic import LogarithmicPenalty
+from binary_knapsack.population import Population
+from binary_knapsack.population_matrix import PopulationMatrix
+
+from tests.conftest import quietly
+
+
+PENALTIES = [AbsolutePenalty, LogarithmicPenalty, DynamicPenalty]
+
+
+def penalty_instance(Penalty_Method, problem):
+    return Penalty_Method(problem.constraints, **{k: v for k, (_, v) in Penalty_Method.parameters().items()})
+
+
+def evaluated_population(random, problem, pop_size=50):
+    """The same random population as a PopulationMatrix and as Chromosome objects, both evaluated.
+
+    Items are picked with probability 0.3, so that some individuals are feasible and some are not.
+    """
+    matrix = PopulationMatrix((random.random((pop_size, problem.dims)) < 0.3).astype(np.uint8))
+    population = Population([matrix.chromosome(j) for j in range(pop_size)])
+    matrix.evaluate(problem)
+    population.evaluate(problem)
+    return matrix, population
+
+
+@pytest.mark.parametrize('Penalty_Method', PENALTIES)
+@pytest.mark.parametrize('problem', ['knapsack', 'multidimensional_knapsack'])
+@pytest.mark.parametrize('t', [0, 1, 7])
+def test_penalize_arrays_matches_chromosomes(request, random, Penalty_Method, problem, t):
+    problem = request.getfixturevalue(problem)
+    matrix, population = evaluated_population(random, problem)
+    penalty = penalty_instance(Penalty_Method, problem)
+    penalty.penalize_matrix(matrix, t)
+    penalty.penalize(population.members, t)
+    infeasible = penalty.violation(penalty.costs(matrix)) > 0
+    assert infeasible.any() and not infeasible.all()
+    np.testing.assert_allclose(matrix.fitness_scores, [c.fitness_score for c in population.members], rtol=1e-12)
+
+
+@pytest.mark.parametrize('Penalty_Method', PENALTIES)
+def test_penalizing_again_does_not_compound(knapsack, random, Penalty_Method):
+    matrix, population = evaluated_population(random, knapsack)
+    penalty = penalty_instance(Penalty_Method, knapsack)
+    for t in (3, 4, 5):
+        penalty.penalize_matrix(matrix, t)
+        penalty.penalize(population.members, t)
+    fresh, _ = evaluated_population(np.random.default_rng(12345), knapsack)
+    penalty.penalize_matrix(fresh, 5)
+    np.testing.assert_array_equal(matrix.fitness_scores, fresh.fitness_scores)
+    np.testing.assert_allclose(fresh.fitness_scores, [c.fitness_score for c in population.members], rtol=1e-12)
+
+
+def test_dynamic_penalty_penalizes_generation_zero(knapsack, random):
+    matrix, _ = evaluated_population(random, knapsack)
+    penalty = DynamicPenalty(knapsack.constraints)
+    penalty.penalize_matrix(matrix, 0)
+    infeasible = penalty.violation(penalty.costs(matrix)) > 0
+    assert np.all(matrix.fitness_scores[infeasible] < matrix.objective_scores[infeasible])
+
+
+@pytest.mark.parametrize('mode', [{}, {'use_matrix': True}, {'packed': True}])
+@pytest.mark.parametrize('seed', [1, 2, 3, 4, 5])
+def test_dynamic_penalty_best_of_run_is_feasible(knapsack, mode, seed):
+    ga = quietly(
+        GA, pop_size=30, t_max=50, rand_seed=seed, problem_instance=knapsack, Penalty_Method=DynamicPenalty, **mode
+    )
+    best, _ = quietly(asyncio.run, ga.simulate())
+    assert np.all(best.fitness_cost <= knapsack.constraints['fitness_cost'])
+    assert best.fitness_score > 0
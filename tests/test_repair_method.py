@@ -0,0 +1,87 @@
+# ahester57
+
+import numpy as np
+import pytest
+
+from binary_knapsack.population_matrix import PopulationMatrix
+from binary_knapsack.repair_method.greedy import GreedyRepair
+from binary_knapsack.test_problem.knapsack import BinaryKnapsack
+
+from tests.conftest import simulate
+
+
+@pytest.fixture(params=['knapsack', 'multidimensional_knapsack'])
+def instance(request) -> BinaryKnapsack:
+    return request.getfixturevalue(request.param)
+
+
+def capacities(instance:BinaryKnapsack) -> np.ndarray:
+    return np.atleast_1d(instance.constraints['fitness_cost'])
+
+
+def costs(instance:BinaryKnapsack, bitstrings:np.ndarray) -> np.ndarray:
+    """(num_solns x m) weight of each solution against each constraint."""
+    return instance.try_with_bitstrings(bitstrings)[1].reshape(len(bitstrings), -1)
+
+
+def bitstrings(instance:BinaryKnapsack, random:np.random.Generator) -> np.ndarray:
+    """Solutions from nearly empty to nearly full, so most are infeasible and some are not."""
+    p = np.linspace(0.05, 0.95, 200)[:, np.newaxis]
+    return (random.random((200, instance.dims)) < p).astype(np.uint8)
+
+
+def drop_one_at_a_time(instance:BinaryKnapsack, bitstring:np.ndarray) -> np.ndarray:
+    """Remove selected items in ascending ratio order until every capacity holds."""
+    repaired = bitstring.copy()
+    for item in instance.ratio_order:
+        if np.all(costs(instance, repaired[np.newaxis]) <= capacities(instance)):
+            break
+        repaired[item] = 0
+    return repaired
+
+
+@pytest.mark.parametrize('greedy_add', [False, True])
+def test_repaired_solutions_are_feasible(instance, random, greedy_add):
+    solns = bitstrings(instance, random)
+    original = solns.copy()
+    repaired = GreedyRepair(instance, greedy_add).repair_bitstrings(solns)
+    np.testing.assert_array_equal(solns, original)
+    assert repaired.dtype == np.uint8 and repaired.shape == solns.shape
+    assert np.all(costs(instance, repaired) <= capacities(instance))
+
+
+def test_drop_removes_the_lowest_ratio_items(instance, random):
+    solns = bitstrings(instance, random)
+    repaired = GreedyRepair(instance).repair_bitstrings(solns)
+    assert np.all(repaired <= solns)
+    feasible = np.all(costs(instance, solns) <= capacities(instance), axis=1)
+    np.testing.assert_array_equal(repaired[feasible], solns[feasible])
+    for soln, row in zip(solns[~feasible], repaired[~feasible]):
+        np.testing.assert_array_equal(row, drop_one_at_a_time(instance, soln))
+
+
+def test_add_leaves_no_room_for_another_item(instance, random):
+    solns = bitstrings(instance, random)
+    repaired = GreedyRepair(instance, greedy_add=True).repair_bitstrings(solns)
+    dropped = GreedyRepair(instance).repair_bitstrings(solns)
+    # adding only ever adds
+    assert np.all(repaired >= dropped)
+    weights = np.atleast_2d(instance.weights).T
+    for row, cost in zip(repaired, costs(instance, repaired)):
+        unselected = np.flatnonzero(row == 0)
+        fits = np.all(cost + weights[unselected] <= capacities(instance), axis=1)
+        assert not fits.any(), f'items {unselected[fits]} still fit'
+
+
+@pytest.mark.parametrize('mode', [{}, {'use_matrix': True}, {'packed': True}])
+def test_repaired_populations_are_feasible(multidimensional_knapsack, mode):
+    ga = simulate(
+        pop_size=30, t_max=10, rand_seed=3, problem_instance=multidimensional_knapsack,
+        Repair_Method=GreedyRepair, repair_parameters={'greedy_add': True}, **mode
+    )
+    if isinstance(ga.population, PopulationMatrix):
+        solns = ga.population.unpacked_rows(np.arange(len(ga.population)))
+    else:
+        solns = np.stack([c.bitstring for c in ga.population.members])
+    assert np.all(costs(multidimensional_knapsack, solns) <= capacities(multidimensional_knapsack))
+    assert ga.best_of_run_is_feasible
@@ -0,0 +1,15 @@
+# ahester57
+
+import numpy as np
+
+from binary_knapsack.selection_mechanism.ranking import CDF_CACHE_SIZE, LinearRanking, _rank_cdf
+
+
+def test_ranking_keeps_a_bounded_number_of_distributions(random):
+    fitnesses = random.random(30)
+    for max_copies in np.linspace(1.0, 2.0, 3 * CDF_CACHE_SIZE):
+        ranking = LinearRanking(random, fitnesses, fitnesses.sum(), max=max_copies)
+        cdf = ranking._cached_cdf()
+        np.testing.assert_array_equal(cdf, ranking._generate_cdf(ranking._generate_pmf()))
+        assert not cdf.flags.writeable
+    assert _rank_cdf.cache_info().currsize <= CDF_CACHE_SIZE
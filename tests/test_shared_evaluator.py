@@ -0,0 +1,34 @@
+# ahester57
+
+import numpy as np
+import pytest
+
+from binary_knapsack.shared_evaluator import SharedMemoryEvaluator
+
+from tests.conftest import simulate
+
+
+def test_shared_evaluator_forwards_delta_evaluation(knapsack, random):
+    with SharedMemoryEvaluator(knapsack, max_workers=2) as evaluator:
+        assert evaluator.supports_delta
+        solns = random.integers(2, size=(10, knapsack.dims), dtype=np.uint8)
+        profits, weights = knapsack.try_with_bitstrings(solns)
+        rows, loci = np.array([0, 0, 3]), np.array([1, 5, 2])
+        alleles = 1 - solns[rows, loci]
+        np.testing.assert_array_equal(
+            evaluator.try_with_flips(profits, weights, rows, loci, alleles),
+            knapsack.try_with_flips(profits, weights, rows, loci, alleles)
+        )
+
+
+@pytest.mark.parametrize('mode', [{'use_matrix': True}, {'packed': True}])
+def test_workers_do_not_change_a_delta_evaluated_run(large_knapsack, mode):
+    runs = [
+        simulate(pop_size=60, t_max=30, rand_seed=1, problem_instance=large_knapsack, evaluation_workers=workers,
+            delta_evaluation=True, **mode)
+        for workers in (0, 2)
+    ]
+    # workers sum each chunk on its own, so scores may differ in the last place
+    here, pooled = (ga.best_of_run_record for ga in runs)
+    assert (here.bitstring, here.generation) == (pooled.bitstring, pooled.generation)
+    np.testing.assert_allclose(runs[0].population.fitness_scores, runs[1].population.fitness_scores, rtol=1e-13)
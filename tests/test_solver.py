@@ -0,0 +1,83 @@
+# ahester57
+
+import numpy as np
+import pytest
+
+from binary_knapsack.test_problem import problem
+from binary_knapsack.test_problem.knapsack import BinaryKnapsack
+from binary_knapsack.test_problem.multidimensional_knapsack import MultiDimensionalKnapsack
+from binary_knapsack.test_problem.solver import quality_summary, solve
+
+from tests.conftest import quietly
+
+
+def every_bitstring(dims:int) -> np.ndarray:
+    """All 2^dims solutions, one per row."""
+    return ((np.arange(2 ** dims)[:, np.newaxis] >> np.arange(dims)) & 1).astype(np.uint8)
+
+
+def brute_force(instance:BinaryKnapsack) -> float:
+    """The optimal profit, by evaluating every solution."""
+    profits, costs = instance.try_with_bitstrings(every_bitstring(instance.dims))
+    capacities = np.atleast_1d(instance.constraints['fitness_cost'])
+    feasible = np.all(costs.reshape(len(profits), -1) <= capacities, axis=1)
+    return profits[feasible].max()
+
+
+def integral_instance(random:np.random.Generator, dims:int, num_constraints:int) -> MultiDimensionalKnapsack:
+    """An instance with integer weights. With one constraint, it is solved by dynamic programming."""
+    weights = random.integers(1, 20, size=(num_constraints, dims)).astype(np.float64)
+    profits = random.integers(0, 30, size=dims).astype(np.float64)
+    instance = MultiDimensionalKnapsack.__new__(MultiDimensionalKnapsack)
+    problem.TestProblem.__init__(instance, dims)
+    instance._set_items(profits, weights, np.floor(0.4 * weights.sum(axis=1)))
+    return instance
+
+
+def assert_solved(instance:BinaryKnapsack, method:str) -> None:
+    reference = solve(instance)
+    assert reference.method == method
+    assert reference.is_optimal
+    assert reference.profit == pytest.approx(brute_force(instance), rel=1e-12)
+    profit, cost = instance.try_with_bitstring(reference.bitstring)
+    assert np.all(cost <= instance.constraints['fitness_cost'])
+    assert profit == reference.profit
+
+
+@pytest.mark.parametrize('capacity', [10.0, 25.0, 40.0])
+def test_single_constraint_matches_brute_force(capacity):
+    assert_solved(quietly(BinaryKnapsack, dims=14, capacity=capacity), 'branch_and_bound')
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+@pytest.mark.parametrize('tightness', [0.25, 0.5])
+def test_multiple_constraints_match_brute_force(seed, tightness):
+    instance = quietly(MultiDimensionalKnapsack, dims=14, num_constraints=3, tightness=tightness, seed=seed)
+    assert_solved(instance, 'branch_and_bound')
+
+
+@pytest.mark.parametrize('num_constraints, method', [(1, 'dp'), (3, 'branch_and_bound')])
+def test_integral_weights_match_brute_force(random, num_constraints, method):
+    for _ in range(5):
+        assert_solved(integral_instance(random, 13, num_constraints), method)
+
+
+@pytest.mark.parametrize('num_constraints', [1, 3])
+def test_out_of_nodes_still_bounds_the_optimum(num_constraints):
+    instance = quietly(MultiDimensionalKnapsack, dims=14, num_constraints=num_constraints, tightness=0.5, seed=4)
+    reference = solve(instance, max_nodes=3)
+    assert reference.method == 'branch_and_bound' and reference.nodes == 3
+    assert not reference.is_optimal
+    optimum = brute_force(instance)
+    assert reference.profit <= optimum <= reference.upper_bound
+
+
+def test_quality_summary_leaves_infeasible_runs_out_of_the_gap(knapsack):
+    reference = solve(knapsack)
+    empty, full = np.zeros(knapsack.dims, dtype=np.uint8), np.ones(knapsack.dims, dtype=np.uint8)
+    quality = quality_summary(reference, knapsack, np.stack([reference.bitstring, full, empty]), [None] * 3, 0.99)
+    assert (quality['feasible_runs'], quality['infeasible_runs']) == (2, 1)
+    assert (quality['min_gap'], quality['mean_gap']) == pytest.approx((0.0, 0.5), abs=1e-12)
+    quality = quality_summary(reference, knapsack, full[np.newaxis], [None], 0.99)
+    assert (quality['feasible_runs'], quality['infeasible_runs']) == (0, 1)
+    assert quality['mean_gap'] is None and quality['min_gap'] is None
@@ -0,0 +1,73 @@
+# ahester57
+
+import numpy as np
+import pytest
+
+from binary_knapsack.penalty_method.dynamic import DynamicPenalty
+from binary_knapsack.penalty_method.logarithmic import LogarithmicPenalty
+from binary_knapsack.selection_mechanism.tournament import StochasticTournament
+from binary_knapsack.sweep import SuccessiveHalving, _init_worker, _simulate
+from binary_knapsack.test_problem.knapsack import BinaryKnapsack
+
+from tests.conftest import quietly, simulate
+
+
+def options(rho:float) -> dict:
+    return {
+        'pop_size': 30,
+        't_max': 20,
+        'Penalty_Method': LogarithmicPenalty,
+        'penalty_parameters': {'rho': rho}
+    }
+
+
+def simulate_in_worker(problem:BinaryKnapsack, options:dict, seed:np.random.SeedSequence) -> tuple:
+    """Run _simulate here, as a worker given problem would."""
+    _init_worker({'problem': problem})
+    return quietly(_simulate, 3, 'problem', options, seed)
+
+
+@pytest.mark.parametrize('rho', [0.5, 1.3, 1000.0])
+def test_runs_score_their_best_feasible_objective(knapsack, rho):
+    key, score, error, generations = simulate_in_worker(knapsack, options(rho), np.random.SeedSequence(7))
+    assert key == 3 and error is None
+    # the same run again, to find the solution behind the score
+    ga = simulate(**options(rho), problem_instance=knapsack, rand_seed=np.random.SeedSequence(7))
+    assert generations == ga.t
+    best = ga.best_of_run
+    profit, weight = knapsack.try_with_bitstring(best.bitstring)
+    assert weight <= knapsack.constraints['fitness_cost']
+    assert score == profit
+
+
+def test_runs_without_a_feasible_solution_fail():
+    # only the empty knapsack fits
+    problem = quietly(BinaryKnapsack, dims=40, capacity=0.0)
+    key, score, error, generations = simulate_in_worker(problem, {**options(1.3), 't_max': 2}, np.random.SeedSequence(7))
+    assert np.isnan(score) and generations == 2
+    assert error == 'no feasible solution in 2 generations'
+
+
+def test_converged_runs_count_the_generations_they_completed(large_knapsack):
+    converging = {'pop_size': 40, 't_max': 40, 'Penalty_Method': DynamicPenalty, 'Select_Mechanism': StochasticTournament}
+    key, score, error, generations = simulate_in_worker(large_knapsack, converging, np.random.SeedSequence(7))
+    assert error is None and 0 < generations < 40
+
+
+def test_sweep_counts_the_generations_its_runs_completed():
+    specs = [
+        {
+            'num_runs': 2,
+            'entropy': 7,
+            'ga': {'pop_size': 40, 't_max': 40, 'p_m': p_m},
+            'problem': {'class': 'BinaryKnapsack', 'dims': 64, 'capacity': 128.0},
+            'penalty': {'class': 'DynamicPenalty'},
+            'selection': {'class': 'StochasticTournament'}
+        }
+        for p_m in (0.0, 0.01, 0.05)
+    ]
+    halving = quietly(SuccessiveHalving, specs, eta=3, min_t_max=10, max_workers=2)
+    ranked = quietly(halving.run)
+    assert len(ranked) == 1 and halving.num_rungs == 2
+    # without mutation, the population converges long before t_max
+    assert 0 < halving.generations < 3 * 2 * 13 + 1 * 2 * 40